@@ -181,14 +181,22 @@ class RiddleFactory:
 
 class BossFactory:
     @staticmethod
-    def default(robot: Robot) -> "BossFactory":
+    def default(robot: Robot, rm: MyRandom = None) -> "BossFactory":
         pool = [gates.CXGate(), gates.SwapGate(), pickup.Coin(30)]
-        return BossFactory(robot, pool)
+        return BossFactory(robot, pool, rm)
 
-    def __init__(self, robot: Robot, reward_pool: [Collectible]):
+    def __init__(self, robot: Robot, reward_pool: [Collectible], rm: MyRandom = None):
+        """
+
+        :param robot: the Robot the Bosses are produced for
+        :param reward_pool: Collectibles a Boss can reward
+        :param rm: seeded randomness for producing Bosses, if None a new one is drawn from the RandomManager
+        """
         self.__robot = robot
         self.__reward_pool = reward_pool
-        self.__rm = RandomManager.create_new()
+        if rm is None:
+            rm = RandomManager.create_new()
+        self.__rm = rm
 
     def produce(self, include_gates: [Instruction]) -> BossActor:
         used_gates = []
@@ -18,6 +18,13 @@ class Riddle(Target):
     def is_active(self) -> bool:
         return super(Riddle, self).is_active and self.attempts > 0
 
+    def _on_reached(self):
+        """
+        Nothing to do here.
+        :return: None
+        """
+        pass
+
     def is_reached(self, state_vector: StateVector) -> Tuple[bool, Collectible]:
         success, reward = super(Riddle, self).is_reached(state_vector)
         if not success:
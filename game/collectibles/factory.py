@@ -2,7 +2,7 @@ from game.collectibles.collectible import Collectible, ShopItem
 from game.collectibles import consumable, pickup
 from game.logic import instruction as gates
 from util.logger import Logger
-from util.my_random import RandomManager, MyRandom
+from util.my_random import MyRandom
 
 
 class CollectibleFactory:
@@ -10,7 +10,6 @@ class CollectibleFactory:
         if pool is None or len(pool) < 1:
             Logger.instance().throw(f"invalid pool for CollectibleFactory: {pool}")
         self.__pool = pool
-        self.__rm = RandomManager.create_new()
         self.__order_index = -1
 
     @property
@@ -75,6 +75,11 @@ class Keys(IntEnum):
 
 class Controls:
     INVALID_KEY = Keys.Invalid.num
+    __KEY_NAMES = {
+        KEY_UP_ARROW: "Arrow Up", KEY_RIGHT_ARROW: "Arrow Right", KEY_DOWN_ARROW: "Arrow Down",
+        KEY_LEFT_ARROW: "Arrow Left", KEY_SPACE: "Space", KEY_ENTER: "Enter", KEY_ESCAPE: "Escape", KEY_TAB: "Tab",
+        KEY_BACKSPACE: "Backspace", KEY_SHIFT_LEFT: "Shift+Left",
+    }
 
     def __init__(self):
         self.__pycui_keys = [
@@ -122,10 +127,16 @@ class Controls:
         :param key_pressed: the key that was pressed
         :return: an element of Key corresponding to the action executed by pressing key_pressed
         """
+        # a key can belong to multiple actions (e.g. Space to Action and PopupClose), so we choose the most specific
+        # one since decoding it again results in a key that triggers the same actions (e.g. Space and not Escape)
+        index = None
         for i in range(len(self.__pycui_keys)):
-            if key_pressed == self.__pycui_keys[i]:
-                return Keys.from_index(i)
-        return Keys.Invalid
+            if key_pressed in self.__pycui_keys[i]:
+                if index is None or len(self.__pycui_keys[i]) < len(self.__pycui_keys[index]):
+                    index = i
+        if index is None:
+            return Keys.Invalid
+        return Keys.from_index(index)
 
     def decode(self, key_code: int) -> int:
         """
@@ -136,11 +147,30 @@ class Controls:
         if key_code == Keys.Invalid.code:
             return None
         key = Keys.from_code(key_code)
+        if key is Keys.Invalid:
+            return None     # not the code of a Keys element
         return self.get_key(key)
 
     def get_keys(self, key: Keys) -> List[int]:
         return self.__pycui_keys[key.num]
 
+    def get_key_names(self, key: Keys) -> List[str]:
+        """
+        :param key: the action we want to tell the player about
+        :return: readable names of the keyboard keys that trigger the action (e.g. for popups)
+        """
+        names = []
+        for key_pressed in self.get_keys(key):
+            if key_pressed in Controls.__KEY_NAMES:
+                names.append(Controls.__KEY_NAMES[key_pressed])
+            elif chr(key_pressed).isupper():
+                names.append(f"Shift+{chr(key_pressed)}")
+            elif chr(key_pressed).isprintable():
+                names.append(chr(key_pressed).upper())
+            else:
+                names.append(f"Ctrl+{chr(key_pressed + ord('A') - 1)}")    # e.g. KEY_CTRL_P is 16
+        return names
+
     def get_key(self, key: Keys, index: int = 0):
         keys = self.get_keys(key)
         if 0 <= index < len(keys):
@@ -1,11 +1,17 @@
+import os
+from typing import Iterable, Tuple
 
 from game.controls import Controls
+from util.config import PathConfig
+from util.game_simulator import GameSimulator
 from util.logger import Logger
 from util.my_random import RandomManager
-from widgets.qrogue_pycui import QrogueCUI
+from util.replay_snapshots import ReplaySnapshots
+from widgets.qrogue_pycui import QrogueCUI, ReplayResult
 
 
 class GameHandler:
+    REPLAY_SIZE = (40, 130)     # (rows, columns) of the simulated terminal for replays
     __instance = None
 
     @staticmethod
@@ -14,7 +20,7 @@ class GameHandler:
             Logger.instance().throw(Exception("This singleton has not been initialized yet!"))
         return GameHandler.__instance
 
-    def __init__(self, seed: int):
+    def __init__(self, seed: int, headless_size: Tuple[int, int] = None):
         if GameHandler.__instance is not None:
             Logger.instance().throw(Exception("This class is a singleton!"))
         else:
@@ -24,7 +30,51 @@ class GameHandler:
             Logger(seed)
             controls = Controls()   # todo load later from file!
 
-            self.__renderer = QrogueCUI(seed, controls)
+            self.__renderer = QrogueCUI(seed, controls, headless_size=headless_size)
+
+    @staticmethod
+    def replay(path: str, in_keylog_folder: bool = True, headless_size: Tuple[int, int] = REPLAY_SIZE,
+               seek: int = None, snapshot_interval: int = 0) -> ReplayResult:
+        """
+        Replays the run recorded in the given .qrkl- or .qrkb-file without a terminal as fast as possible. Since the
+        GameHandler is a singleton, this can only be done once per process.
+
+        :param path: path of the keylog
+        :param in_keylog_folder: whether path is relative to the keylog folder or not
+        :param headless_size: (rows, columns) of the simulated terminal
+        :param seek: if given, the replay stops after this many keys and starts at the last snapshot before them (if
+        the keylog has a snapshot file)
+        :param snapshot_interval: if positive, a snapshot file is written next to the keylog containing a snapshot
+        as soon as possible after every snapshot_interval keys (cannot be combined with seek)
+        :return: the outcome of the replay
+        """
+        if seek is not None and snapshot_interval > 0:
+            raise ValueError("Cannot write snapshots while seeking!")
+        simulator = GameSimulator(Controls(), path, in_keylog_folder, notification_popup=False)
+        if simulator.seed is None:
+            raise ValueError(f"\"{path}\" has no valid header!")
+
+        snapshots_path = PathConfig.replay_snapshots_path(path, in_keylog_folder)
+        snapshot = None
+        if seek is not None and os.path.exists(snapshots_path):
+            snapshot_file = ReplaySnapshots.read(snapshots_path)
+            if snapshot_file.seed == simulator.seed:
+                snapshot = snapshot_file.nearest(seek)
+
+        game = GameHandler(simulator.seed, headless_size)
+        if snapshot_interval > 0:
+            with ReplaySnapshots.create(snapshots_path, simulator.seed, snapshot_interval) as snapshots:
+                return game.__renderer.replay_headless(simulator, snapshots=snapshots)
+        return game.__renderer.replay_headless(simulator, snapshot, stop_at=seek)
 
     def start(self) -> None:
         self.__renderer.start()
+
+    def start_headless(self, keys: Iterable[int]):
+        """
+        Plays the game with the given keys without a terminal (the GameHandler has to be created with a headless_size).
+
+        :param keys: the keys to press one after another
+        :return: the HeadlessScreen containing the last frame
+        """
+        return self.__renderer.start_headless(keys)
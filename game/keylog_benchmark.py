@@ -0,0 +1,167 @@
+import csv
+import multiprocessing
+import os
+import statistics
+from typing import Dict, List, Tuple
+
+from game.game import GameHandler
+from util.background_writer import BackgroundWriter
+from util.config import Config
+
+
+class KeylogBenchmark:
+    """
+    How long it took to replay a keylog several times, split into phases. A phase contains the keys pressed in a
+    certain state of the game (e.g. Explore or Fight), so the benchmark reflects how much the player actually did in
+    each state. TOTAL is the whole replay.
+    """
+    TOTAL = "total"
+    COLUMNS = ["phase", "keys", "seconds"]
+    MIN_DIFFERENCE = 0.01   # seconds, smaller differences are considered noise (e.g. for phases with only a few keys)
+
+    @staticmethod
+    def run(path: str, runs: int) -> "KeylogBenchmark":
+        """
+        Replays the keylog headless the given number of times one after another, each in a fresh process.
+
+        :param path: path of the .qrkl- or .qrkb-file
+        :param runs: how often the keylog is replayed
+        """
+        keys = {}
+        seconds = {}
+        with multiprocessing.Pool(1, initializer=_init_worker, initargs=(Config.debugging(),),
+                                  maxtasksperchild=1) as pool:
+            for timings in pool.imap(_replay_phases, [path] * runs):
+                for phase, (phase_keys, phase_seconds) in timings.items():
+                    keys[phase] = phase_keys
+                    seconds.setdefault(phase, []).append(phase_seconds)
+        return KeylogBenchmark(keys, seconds)
+
+    @staticmethod
+    def read_baseline(path: str) -> "KeylogBenchmark":
+        """
+        :param path: path of a .csv-file written by write_baseline()
+        """
+        keys = {}
+        seconds = {}
+        with open(path, newline="", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                keys[row["phase"]] = int(row["keys"])
+                seconds[row["phase"]] = [float(row["seconds"])]
+        return KeylogBenchmark(keys, seconds)
+
+    def __init__(self, keys: Dict[str, int], seconds: Dict[str, List[float]]):
+        """
+
+        :param keys: phase -> number of keys replayed in it
+        :param seconds: phase -> how many seconds the phase took in every run
+        """
+        self.__keys = keys
+        self.__seconds = seconds
+
+    @property
+    def phases(self) -> List[str]:
+        """
+        :return: the phases sorted by how long they took with TOTAL being the last one
+        """
+        phases = sorted([phase for phase in self.__keys if phase != KeylogBenchmark.TOTAL], key=self.median,
+                        reverse=True)
+        return phases + [KeylogBenchmark.TOTAL]
+
+    def keys(self, phase: str) -> int:
+        return self.__keys.get(phase, 0)
+
+    def median(self, phase: str) -> float:
+        """
+        :return: the median of the phase's durations in seconds since it is robust against single slow runs
+        """
+        if phase not in self.__seconds:
+            return 0.0
+        return statistics.median(self.__seconds[phase])
+
+    def write_baseline(self, path: str):
+        """
+        Stores the median duration of every phase, so later benchmarks can be compared with it.
+
+        :param path: path of the .csv-file, an existing one is overwritten
+        """
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(KeylogBenchmark.COLUMNS)
+            for phase in self.phases:
+                writer.writerow([phase, self.keys(phase), f"{self.median(phase):.6f}"])
+
+    def compare(self, baseline: "KeylogBenchmark", tolerance: float) -> List[Tuple[str, float, float, bool]]:
+        """
+        :param baseline: the benchmark to compare with
+        :param tolerance: how much slower (relative) than the baseline a phase may be, e.g. 0.1 for 10%
+        :return: phase, median in seconds, median of the baseline in seconds and whether the phase is slower than the
+        tolerance (and MIN_DIFFERENCE) allows for every phase
+        """
+        comparison = []
+        for phase in self.phases:
+            median = self.median(phase)
+            baseline_median = baseline.median(phase)
+            slower = baseline_median > 0 and \
+                median - baseline_median > max(baseline_median * tolerance, KeylogBenchmark.MIN_DIFFERENCE)
+            comparison.append((phase, median, baseline_median, slower))
+        return comparison
+
+
+def _init_worker(debugging: bool):
+    # worker processes that are spawned instead of forked start without a loaded config
+    Config.load()
+    if debugging:
+        Config.activate_debugging()
+
+
+def _replay_phases(path: str) -> Dict[str, Tuple[int, float]]:
+    try:
+        result = GameHandler.replay(path, in_keylog_folder=False)
+    finally:
+        # worker processes exit without running the atexit handlers that would write the remaining logs
+        BackgroundWriter.instance().flush()
+    if not result.finished:
+        raise RuntimeError(f"The replay of {path} stopped after {result.num_of_keys} keys in state "
+                           f"{result.state.name}, so it cannot be used as a benchmark!")
+    timings = dict(result.state_timings)
+    timings[KeylogBenchmark.TOTAL] = (result.num_of_keys, result.wall_time)
+    return timings
+
+
+def run_benchmark(path: str, runs: int = 5, baseline: str = None, tolerance: float = 0.1) -> bool:
+    """
+    Uses a recorded run as a benchmark by replaying it several times and prints the median duration of every phase.
+    If a baseline is given, the phases are compared with it. A baseline file that doesn't exist yet is created from
+    this benchmark.
+
+    :param path: path of the .qrkl- or .qrkb-file
+    :param runs: how often the keylog is replayed
+    :param baseline: path of the .csv-file containing the baseline
+    :param tolerance: how much slower (relative) than the baseline a phase may be, e.g. 0.1 for 10%
+    :return: False if a phase was slower than the tolerance allows, True otherwise
+    """
+    print(f"[Qrogue] Benchmarking {path} with {runs} replays")
+    benchmark = KeylogBenchmark.run(path, runs)
+    if baseline is None or not os.path.exists(baseline):
+        for phase in benchmark.phases:
+            print(f"{phase:<12}{benchmark.keys(phase):>8} keys{benchmark.median(phase):>10.3f} s")
+        if baseline is not None:
+            benchmark.write_baseline(baseline)
+            print(f"[Qrogue] Stored the baseline in {baseline}")
+        return True
+
+    reference = KeylogBenchmark.read_baseline(baseline)
+    passed = True
+    for phase, median, baseline_median, slower in benchmark.compare(reference, tolerance):
+        text = f"{phase:<12}{benchmark.keys(phase):>8} keys{median:>10.3f} s (baseline {baseline_median:.3f} s"
+        if baseline_median > 0:
+            text += f", {(median / baseline_median - 1) * 100:+.1f}%"
+        text += ")"
+        if benchmark.keys(phase) != reference.keys(phase):
+            text += f" [the baseline replayed {reference.keys(phase)} keys]"
+        if slower:
+            text += " SLOWER"
+            passed = False
+        print(text)
+    return passed
@@ -0,0 +1,141 @@
+import multiprocessing
+import os
+import time
+import traceback
+from typing import List
+
+from game.game import GameHandler
+from util.background_writer import BackgroundWriter
+from util.config import Config, FileTypes
+
+
+class KeylogReplay:
+    """
+    Picklable summary of replaying a single keylog in a worker process.
+    """
+    PASSED = "passed"
+    DIVERGED = "diverged"               # the game stopped early or its state differed from the recorded one
+    VERSION_MISMATCH = "version mismatch"
+    EXCEPTION = "exception"
+
+    def __init__(self, path: str, status: str, num_of_keys: int = 0, wall_time: float = 0.0, message: str = ""):
+        self.__path = path
+        self.__status = status
+        self.__num_of_keys = num_of_keys
+        self.__wall_time = wall_time
+        self.__message = message
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    @property
+    def status(self) -> str:
+        return self.__status
+
+    @property
+    def num_of_keys(self) -> int:
+        return self.__num_of_keys
+
+    @property
+    def wall_time(self) -> float:
+        return self.__wall_time
+
+    @property
+    def message(self) -> str:
+        return self.__message
+
+    def __str__(self) -> str:
+        text = f"[{self.__status}] {self.__path}"
+        if self.__message:
+            text += f": {self.__message}"
+        return text
+
+
+def _init_worker(debugging: bool):
+    # worker processes that are spawned instead of forked start without a loaded config
+    Config.load()
+    if debugging:
+        Config.activate_debugging()
+
+
+def replay_keylog(path: str) -> KeylogReplay:
+    """
+    Replays the given keylog headless. Has to run in a fresh process since the game consists of singletons.
+
+    :param path: path of the .qrkl- or .qrkb-file
+    :return: summary of the replay
+    """
+    start_time = time.time()
+    try:
+        result = GameHandler.replay(path, in_keylog_folder=False)
+    except Exception as e:
+        return KeylogReplay(path, KeylogReplay.EXCEPTION, wall_time=time.time() - start_time,
+                            message="".join(traceback.format_exception_only(type(e), e)).strip())
+    finally:
+        # worker processes exit without running the atexit handlers that would write the remaining logs
+        BackgroundWriter.instance().flush()
+
+    if result.log_format != Config.KEYLOG_FORMAT:
+        return KeylogReplay(path, KeylogReplay.VERSION_MISMATCH, result.num_of_keys, result.wall_time,
+                            f"keys were logged in format {result.log_format} but replays need format "
+                            f"{Config.KEYLOG_FORMAT}")
+    if result.version != Config.version():
+        return KeylogReplay(path, KeylogReplay.VERSION_MISMATCH, result.num_of_keys, result.wall_time,
+                            f"recorded with {result.version} but this is {Config.version()}")
+    if result.diverged_after is not None:
+        return KeylogReplay(path, KeylogReplay.DIVERGED, result.num_of_keys, result.wall_time,
+                            f"the state differs from the recorded one after key {result.diverged_after} (last match "
+                            f"after key {result.verified_until})")
+    if not result.finished:
+        return KeylogReplay(path, KeylogReplay.DIVERGED, result.num_of_keys, result.wall_time,
+                            f"the game stopped after {result.num_of_keys} keys in state {result.state.name}")
+    return KeylogReplay(path, KeylogReplay.PASSED, result.num_of_keys, result.wall_time)
+
+
+def find_keylogs(folder: str) -> List[str]:
+    """
+    :param folder: the folder to search through (including its sub-folders)
+    :return: paths of all .qrkl- and .qrkb-files in the folder sorted by name
+    """
+    paths = []
+    for dir_path, _, file_names in os.walk(folder):
+        for file_name in file_names:
+            if file_name.endswith(FileTypes.KeyLog.value) or file_name.endswith(FileTypes.BinaryKeyLog.value):
+                paths.append(os.path.join(dir_path, file_name))
+    paths.sort()
+    return paths
+
+
+def run_regression(folder: str, processes: int = None) -> List[KeylogReplay]:
+    """
+    Replays all keylogs in the given folder in parallel and prints every problem as well as a summary.
+
+    :param folder: the folder containing the keylogs
+    :param processes: number of worker processes, by default the number of CPUs
+    :return: the summaries of all replays
+    """
+    paths = find_keylogs(folder)
+    print(f"[Qrogue] Replaying {len(paths)} keylogs from {folder}")
+    start_time = time.time()
+    # every replay needs a fresh process because of the singletons
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(Config.debugging(),),
+                              maxtasksperchild=1) as pool:
+        replays = []
+        for replay in pool.imap_unordered(replay_keylog, paths):
+            if replay.status != KeylogReplay.PASSED:
+                print(replay)
+            replays.append(replay)
+    wall_time = time.time() - start_time
+
+    counts = {status: 0 for status in [KeylogReplay.PASSED, KeylogReplay.DIVERGED, KeylogReplay.VERSION_MISMATCH,
+                                       KeylogReplay.EXCEPTION]}
+    for replay in replays:
+        counts[replay.status] += 1
+    num_of_keys = sum(replay.num_of_keys for replay in replays)
+    print()
+    print(", ".join([f"{count} {status}" for status, count in counts.items()]))
+    if wall_time > 0:
+        print(f"Replayed {num_of_keys} keys in {wall_time:.2f} seconds ({num_of_keys / wall_time:.0f} keys/s, "
+              f"{len(replays) / wall_time:.2f} keylogs/s)")
+    return replays
@@ -1,4 +1,5 @@
 import collections
+import math
 from abc import ABC, abstractmethod
 from typing import List, Tuple
 
@@ -12,9 +13,13 @@ from game.logic.instruction import Instruction
 class StateVector:
     __TOLERANCE = 0.1
     __DECIMALS = 3
+    # most amplitudes have one of a few values (e.g. 0, 1 or 1/sqrt(2)), so we remember how they are formatted
+    __STRING_CACHE = {}
+    __MAX_CACHE_SIZE = 1024
 
     def __init__(self, amplitudes: List[complex]):
         self.__amplitudes = amplitudes
+        self.__string = None    # cached result of to_string()
 
     @staticmethod
     def from_gates(gates: List[Instruction], num_of_qubits: int) -> "StateVector":
@@ -29,6 +34,19 @@ class StateVector:
 
     @staticmethod
     def complex_to_string(val: complex) -> str:
+        key = complex(val)
+        if key.real == 0:
+            key = key, math.copysign(1, key.real)   # 0 and -0 are equal but formatted differently
+        text = StateVector.__STRING_CACHE.get(key)
+        if text is None:
+            text = StateVector.__complex_to_string(val)
+            if len(StateVector.__STRING_CACHE) >= StateVector.__MAX_CACHE_SIZE:
+                StateVector.__STRING_CACHE.clear()
+            StateVector.__STRING_CACHE[key] = text
+        return text
+
+    @staticmethod
+    def __complex_to_string(val: complex) -> str:
         val = np.round(val, StateVector.__DECIMALS)
         if val.imag == 0:
             return f"{val.real:g}"
@@ -78,11 +96,13 @@ class StateVector:
             return None
 
     def to_string(self) -> str:
-        text = ""
-        for val in self.__amplitudes:
-            text += StateVector.complex_to_string(val)
-            text += "\n"
-        return text
+        if self.__string is None:
+            text = ""
+            for val in self.__amplitudes:
+                text += StateVector.complex_to_string(val)
+                text += "\n"
+            self.__string = text
+        return self.__string
 
     def __eq__(self, other) -> bool: # TODO currently not even in use!
         if type(other) is type(self):
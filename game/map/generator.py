@@ -1,20 +1,28 @@
+import bisect
+import functools
 from abc import ABC, abstractmethod
+from collections import deque
 from enum import IntEnum
-from typing import Callable
+from typing import Callable, Dict, List, Set, Tuple
 
 from game.achievements import AchievementManager
+from game.actors.boss import Boss as BossActor
 from game.actors.factory import EnemyFactory, RiddleFactory, TargetDifficulty, BossFactory
+from game.actors.riddle import Riddle
 from game.callbacks import CallbackPack
 from game.collectibles import pickup, consumable
+from game.collectibles.collectible import ShopItem
 from game.collectibles.factory import GateFactory, ShopFactory
+from game.logic.instruction import Instruction
 from game.map import tiles
 from game.map.level_map import LevelMap
-from game.map.map import Map
+from game.map.map import Map, RoomRegions
 from game.map.navigation import Coordinate, Direction
-from game.map.rooms import Hallway, WildRoom, SpawnRoom, ShopRoom, RiddleRoom, GateRoom, BossRoom
+from game.map.rooms import Hallway, WildRoom, SpawnRoom, ShopRoom, RiddleRoom, GateRoom, BossRoom, LazyRoom, Room
 from game.actors.robot import Robot
 from util.logger import Logger
-from util.my_random import MyRandom, RandomManager
+from util.my_random import MyRandom, SeedSequence
+from util.phase_timer import PhaseTimer
 
 
 class _Code(IntEnum):
@@ -95,11 +103,67 @@ class _Code(IntEnum):
         return _Code[enum_string]
 
 
+class _DisjointSet:
+    """
+    Union-find structure over the cells of a layout. Every Hallway unites the components of the two cells it
+    connects, so we can check in (almost) constant time whether two cells are connected.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.__width = width
+        self.__parents = list(range(width * height))
+        self.__sizes = [1] * (width * height)
+
+    def __find(self, index: int) -> int:
+        parents = self.__parents
+        root = index
+        while parents[root] != root:
+            root = parents[root]
+        # path compression
+        while parents[index] != root:
+            parents[index], index = root, parents[index]
+        return root
+
+    def find(self, pos: Coordinate) -> int:
+        """
+        :return: the representative of the component pos belongs to
+        """
+        return self.__find(pos.y * self.__width + pos.x)
+
+    def union(self, pos1: Coordinate, pos2: Coordinate):
+        root1 = self.find(pos1)
+        root2 = self.find(pos2)
+        if root1 == root2:
+            return
+        # union by size
+        if self.__sizes[root1] < self.__sizes[root2]:
+            root1, root2 = root2, root1
+        self.__parents[root2] = root1
+        self.__sizes[root1] += self.__sizes[root2]
+
+    def connected(self, pos1: Coordinate, pos2: Coordinate) -> bool:
+        return self.find(pos1) == self.find(pos2)
+
+
 class RandomLayoutGenerator:
     __MIN_AREA = 10
     __MIN_NORMAL_ROOMS = 4
 
-    def __init__(self, seed: int, width: int, height: int):
+    def __init__(self, seed: int, width: int, height: int, timer: PhaseTimer = None,
+                 reserved: List[Coordinate] = None):
+        """
+
+        :param seed: seed of the layout
+        :param width: number of Rooms per row
+        :param height: number of Room rows
+        :param timer: optional PhaseTimer that records how long the individual phases of the generation take
+        :param reserved: cells that are WildRooms from the start so no SpecialRoom is placed there (e.g. to connect the
+            layout with its surroundings)
+        """
+        if timer is None:
+            timer = PhaseTimer.disabled()
+        self.__timer = timer
+        checkpoint = timer.now()
         self.__seed = seed
         if width * height < RandomLayoutGenerator.__MIN_AREA:
             Logger.instance().throw(ValueError(f"width={width}, height={height} create a too small grid "
@@ -111,13 +175,25 @@ class RandomLayoutGenerator:
         self.__map = [[_Code.Free] * self.__width for y in range(self.__height)]
         self.__normal_rooms = set()
         self.__hallways = {}
+        self.__connectivity = _DisjointSet(width, height)
+        self.__spawn_pos = None
+        self.__special_rooms = []
         self.__prio_sum = self.__width * self.__height
         self.__prio_mean = 1.0
+        if reserved:
+            for pos in reserved:
+                self.__set(pos, _Code.Wild)
+            self.__new_prio()
+        timer.lap("layout.grid_init", checkpoint)
 
     @property
     def seed(self) -> int:
         return self.__seed
 
+    @property
+    def spawn_pos(self) -> Coordinate:
+        return self.__spawn_pos
+
     def __get(self, pos: Coordinate) -> _Code:
         return self.__map[pos.y][pos.x]
 
@@ -266,6 +342,42 @@ class RandomLayoutGenerator:
             self.__hallways[room2][room1] = door
         else:
             self.__hallways[room2] = {room1: door}
+        self.__connectivity.union(room1, room2)
+
+    def __reachable_from(self, start: Coordinate) -> Set[Tuple[int, int]]:
+        """
+        Collects all cells that could still be connected with start, i.e. cells that can be reached by only passing
+        normal Rooms or free cells. SpecialRooms and blocked cells cannot be passed.
+
+        :param start: the cell we start from (typically the SpawnRoom)
+        :return: (x, y) of all cells that could be connected with start
+        """
+        visited = {(start.x, start.y)}
+        stack = [(start.x, start.y)]
+        while stack:
+            x, y = stack.pop()
+            for nx, ny in [(x, y - 1), (x + 1, y), (x, y + 1), (x - 1, y)]:
+                if 0 <= nx < self.__width and 0 <= ny < self.__height and (nx, ny) not in visited:
+                    code = self.__map[ny][nx]
+                    if code < _Code.Blocked or code == _Code.Wild or code == _Code.Spawn:
+                        visited.add((nx, ny))
+                        stack.append((nx, ny))
+        return visited
+
+    def __is_doomed(self) -> bool:
+        """
+        :return: True if one of the already placed SpecialRooms can no longer be connected to the SpawnRoom
+        """
+        reachable = None
+        for room in self.__special_rooms:
+            if self.__connectivity.connected(room, self.__spawn_pos):
+                continue
+            if reachable is None:
+                reachable = self.__reachable_from(self.__spawn_pos)
+            start_pos = list(self.__hallways[room].keys())[0]
+            if (start_pos.x, start_pos.y) not in reachable:
+                return True
+        return False
 
     def __place_wild(self, room: Coordinate, door: tiles.Door):
         pos = room + door.direction
@@ -386,21 +498,25 @@ class RandomLayoutGenerator:
             return self.__get(pos)
         return None
 
+    def in_spawn_chunk(self, pos: Coordinate) -> bool:
+        # the whole layout is a single chunk
+        return self.__is_valid_pos(pos)
+
     def check_special_rooms(self) -> bool:
-        for y in range(self.__height):
-            for x in range(self.__width):
-                pos = Coordinate(x, y)
-                code = self.__get(pos)
-                if code in [_Code.Boss, _Code.Shop, _Code.Riddle, _Code.Gate]:
-                    connections = self.__hallways[pos]
-                    if len(connections) != 1:
-                        return False
+        """
+        :return: True if every SpecialRoom has exactly one Hallway and is connected to the SpawnRoom
+        """
+        for pos in self.__special_rooms:
+            if len(self.__hallways[pos]) != 1 or not self.__connectivity.connected(pos, self.__spawn_pos):
+                return False
         return True
 
     def generate(self, debug: bool = False) -> bool:
+        checkpoint = self.__timer.now()
         # place the spawn room
         spawn_pos = self.__random_coordinate()
         self.__set(spawn_pos, _Code.Spawn)
+        self.__spawn_pos = spawn_pos
 
         # special case if SpawnRoom is in a corner
         corner = self.__is_corner(spawn_pos)
@@ -409,14 +525,18 @@ class RandomLayoutGenerator:
                 self.__place_wild(spawn_pos, tiles.Door(corner[0]))
             if self.__get(spawn_pos + corner[1]) < _Code.Blocked:
                 self.__place_wild(spawn_pos, tiles.Door(corner[1]))
-
-        # place the special rooms
-        special_rooms = [
-            self.__place_special_room(_Code.Shop),
-            self.__place_special_room(_Code.Riddle),
-            self.__place_special_room(_Code.Boss),
-            self.__place_special_room(_Code.Gate),
-        ]
+        checkpoint = self.__timer.lap("layout.spawn", checkpoint)
+
+        # place the special rooms and reject the layout as soon as one of them can no longer reach the SpawnRoom
+        for code in [_Code.Shop, _Code.Riddle, _Code.Boss, _Code.Gate]:
+            self.__special_rooms.append(self.__place_special_room(code))
+            if self.__is_doomed():
+                if debug:
+                    print(f"Rejected layout for seed = {self.seed} because a SpecialRoom cannot reach the SpawnRoom")
+                self.__timer.lap("layout.special_rooms", checkpoint)
+                return False
+        special_rooms = self.__special_rooms
+        checkpoint = self.__timer.lap("layout.special_rooms", checkpoint)
 
         # create a locked hallway to spawn_pos-neighboring WildRooms if they lead to SpecialRooms
         #directions = self.__available_directions(spawn_pos, allow_wildrooms=True)
@@ -451,28 +571,19 @@ class RandomLayoutGenerator:
             if len(neighbors) > 0:
                 direction, _, new_pos = self.__rm.get_element(neighbors)
                 self.__add_hallway(spawn_pos, new_pos, tiles.Door(direction))
+        checkpoint = self.__timer.lap("layout.wild_rooms", checkpoint)
 
-        success = True
         # as last step, add missing Hallways and WildRooms to connect every SpecialRoom with the SpawnRoom
-        rooms = list(special_rooms)
-        while rooms:
-            room = rooms.pop(0)
+        for room in special_rooms:
+            if self.__connectivity.connected(room, spawn_pos):
+                continue    # already connected, e.g. via the Hallways of another SpecialRoom
             visited = set(special_rooms)
             start_pos = list(self.__hallways[room].keys())[0]
             visited.add(start_pos)
             if not self.__call_astar(visited, start_pos, spawn_pos):
-                success = False
                 break
-        if success:
-            return True
-        else:
-            for room in rooms:
-                start_pos = list(self.__hallways[room].keys())[0]
-                visited = set(special_rooms)
-                dead_ends, success = self.__astar(visited, start_pos, spawn_pos)
-                if not success:
-                    return False
-            return True
+        self.__timer.lap("layout.astar", checkpoint)
+        return self.check_special_rooms()
 
     def __str__(self):
         cell_width = 5
@@ -517,6 +628,324 @@ class RandomLayoutGenerator:
         return str_rep
 
 
+class ChunkedLayoutGenerator:
+    """
+    Creates the layout of dungeons that are bigger than Map.MAX_WIDTH x Map.MAX_HEIGHT by splitting the grid into
+    chunks of at least that size. Every chunk is laid out by its own RandomLayoutGenerator, but only once one of its
+    cells is needed (see load_chunk()), so the cost of the layout depends on how much of the dungeon is explored and not
+    on its size.
+    Neighboring chunks are connected by a pair of WildRooms at their common border (gateways) whose positions only
+    depend on the seed. Inside a chunk its former SpawnRoom (hub) is connected with all of the chunk's gateways, so the
+    chunks can be laid out in any order and still form one connected dungeon.
+    Only one chunk keeps its SpawnRoom and only the chunk farthest away from it keeps its Boss, the others are
+    replaced by a WildRoom and a Riddle respectively.
+    """
+    __MAX_CHUNK_ATTEMPTS = 5
+
+    @staticmethod
+    def __split(length: int, min_chunk_length: int) -> [int]:
+        """
+        Chunks smaller than a normal level are too crowded by their SpecialRooms to reliably connect them with their
+        neighbors, so every chunk is at least min_chunk_length long (unless the whole length is smaller).
+
+        :return: borders of evenly sized chunks
+        """
+        num_of_chunks = max(1, length // min_chunk_length)
+        return [i * length // num_of_chunks for i in range(num_of_chunks + 1)]
+
+    @staticmethod
+    def __inner_range(start: int, stop: int) -> range:
+        """
+        :return: the positions between start and stop without the first and last one (if there are enough), so
+            gateways are never placed in the corners of a chunk
+        """
+        if stop - start > 2:
+            return range(start + 1, stop - 1)
+        return range(start, stop)
+
+    def __init__(self, seed: int, width: int, height: int, chunk_width: int = Map.MAX_WIDTH,
+                 chunk_height: int = Map.MAX_HEIGHT, timer: PhaseTimer = None):
+        if timer is None:
+            timer = PhaseTimer.disabled()
+        self.__timer = timer
+        self.__seed = seed
+        self.__seeds = SeedSequence(seed).spawn("layout")
+        self.__width = width
+        self.__height = height
+        self.__x_borders = ChunkedLayoutGenerator.__split(width, chunk_width)
+        self.__y_borders = ChunkedLayoutGenerator.__split(height, chunk_height)
+        # only the cells of loaded chunks are stored
+        self.__codes: Dict[Coordinate, _Code] = {}
+        self.__hallways = {}
+        self.__loaded_chunks = set()
+        self.__spawn_chunk = None
+        self.__boss_chunk = None
+        self.__spawn_pos = None
+
+    @property
+    def seed(self) -> int:
+        return self.__seed
+
+    @property
+    def spawn_pos(self) -> Coordinate:
+        return self.__spawn_pos
+
+    @property
+    def num_of_chunks(self) -> int:
+        return (len(self.__x_borders) - 1) * (len(self.__y_borders) - 1)
+
+    @property
+    def num_of_loaded_chunks(self) -> int:
+        return len(self.__loaded_chunks)
+
+    def __is_valid_pos(self, pos: Coordinate) -> bool:
+        return 0 <= pos.x < self.__width and 0 <= pos.y < self.__height
+
+    def __add_hallway(self, room1: Coordinate, room2: Coordinate, door: tiles.Door, hallways: dict = None):
+        if hallways is None:
+            hallways = self.__hallways
+        if room1 in hallways:
+            hallways[room1][room2] = door
+        else:
+            hallways[room1] = {room2: door}
+        if room2 in hallways:
+            hallways[room2][room1] = door
+        else:
+            hallways[room2] = {room1: door}
+
+    def chunk_of(self, pos: Coordinate) -> (int, int):
+        """
+        :return: the position of the chunk that contains the given cell
+        """
+        cx = bisect.bisect_right(self.__x_borders, pos.x) - 1
+        cy = bisect.bisect_right(self.__y_borders, pos.y) - 1
+        return min(max(cx, 0), len(self.__x_borders) - 2), min(max(cy, 0), len(self.__y_borders) - 2)
+
+    def chunk_rect(self, cx: int, cy: int) -> (int, int, int, int):
+        """
+        :return: left, top, right and bottom border of the given chunk (right and bottom are exclusive)
+        """
+        return self.__x_borders[cx], self.__y_borders[cy], self.__x_borders[cx + 1], self.__y_borders[cy + 1]
+
+    def chunks_in(self, x: int, y: int, width: int, height: int) -> [(int, int)]:
+        """
+        :return: positions of all chunks overlapping the given rectangle of cells
+        """
+        x0, x1 = max(0, x), min(x + width, self.__width)
+        y0, y1 = max(0, y), min(y + height, self.__height)
+        if x1 <= x0 or y1 <= y0:
+            return []
+        first_cx, first_cy = self.chunk_of(Coordinate(x0, y0))
+        last_cx, last_cy = self.chunk_of(Coordinate(x1 - 1, y1 - 1))
+        return [(cx, cy) for cy in range(first_cy, last_cy + 1) for cx in range(first_cx, last_cx + 1)]
+
+    def in_spawn_chunk(self, pos: Coordinate) -> bool:
+        return self.chunk_of(pos) == self.__spawn_chunk
+
+    def __gateways(self, cx: int, cy: int) -> [(Coordinate, Coordinate, Direction)]:
+        """
+        The gateway between two chunks is derived from the seed and the position of the western or northern chunk, so
+        both chunks agree on it no matter which of them is laid out first.
+
+        :return: cell inside the chunk, cell in the neighboring chunk and Direction from the former to the latter for
+            every gateway of the given chunk
+        """
+        num_of_cols = len(self.__x_borders) - 1
+        num_of_rows = len(self.__y_borders) - 1
+        x0, y0, x1, y1 = self.chunk_rect(cx, cy)
+        gateways = []
+        if cx > 0:
+            y = self.__seeds.spawn("gateway", cx - 1, cy, "east").random().get_element(
+                ChunkedLayoutGenerator.__inner_range(y0, y1))
+            gateways.append((Coordinate(x0, y), Coordinate(x0 - 1, y), Direction.West))
+        if cx < num_of_cols - 1:
+            y = self.__seeds.spawn("gateway", cx, cy, "east").random().get_element(
+                ChunkedLayoutGenerator.__inner_range(y0, y1))
+            gateways.append((Coordinate(x1 - 1, y), Coordinate(x1, y), Direction.East))
+        if cy > 0:
+            x = self.__seeds.spawn("gateway", cx, cy - 1, "south").random().get_element(
+                ChunkedLayoutGenerator.__inner_range(x0, x1))
+            gateways.append((Coordinate(x, y0), Coordinate(x, y0 - 1), Direction.North))
+        if cy < num_of_rows - 1:
+            x = self.__seeds.spawn("gateway", cx, cy, "south").random().get_element(
+                ChunkedLayoutGenerator.__inner_range(x0, x1))
+            gateways.append((Coordinate(x, y1 - 1), Coordinate(x, y1), Direction.South))
+        return gateways
+
+    def __connect(self, codes: Dict[Coordinate, _Code], hallways: dict, start: Coordinate, target: Coordinate) -> bool:
+        """
+        Connects start and target via the shortest path of normal Rooms and free cells (which become WildRooms) of the
+        given chunk. SpecialRooms are never passed so they stay dead ends.
+
+        :param codes: codes of the chunk's cells
+        :param hallways: Hallways of the chunk's cells
+        :return: True if a path was found, False otherwise
+        """
+        predecessors = {start: None}
+        queue = deque([start])
+        while queue:
+            pos = queue.popleft()
+            if pos == target:
+                break
+            for direction in Direction.values():
+                new_pos = pos + direction
+                if new_pos not in predecessors and new_pos in codes:
+                    code = codes[new_pos]
+                    if code < _Code.Blocked or code in _Code.normal_rooms():
+                        predecessors[new_pos] = pos
+                        queue.append(new_pos)
+        if target not in predecessors:
+            return False
+
+        pos = target
+        while predecessors[pos] is not None:
+            prev = predecessors[pos]
+            if codes[pos] < _Code.Blocked:
+                codes[pos] = _Code.Wild
+            if prev not in hallways or pos not in hallways[prev]:
+                self.__add_hallway(prev, pos, tiles.Door(Direction.from_coordinates(prev, pos)), hallways)
+            pos = prev
+        return True
+
+    def __layout_chunk(self, cx: int, cy: int, gateways: [Coordinate]) -> (Dict[Coordinate, _Code], dict, Coordinate):
+        """
+        :return: codes and Hallways of the chunk's cells and its hub or None if no attempt led to a valid layout
+        """
+        x0, y0, x1, y1 = self.chunk_rect(cx, cy)
+        reserved = [Coordinate(pos.x - x0, pos.y - y0) for pos in gateways]
+        for attempt in range(ChunkedLayoutGenerator.__MAX_CHUNK_ATTEMPTS):
+            layout = RandomLayoutGenerator(self.__seeds.spawn(cx, cy, attempt).seed, x1 - x0, y1 - y0, self.__timer,
+                                           reserved)
+            if not layout.generate():
+                continue
+            codes = {}
+            hallways = {}
+            for y in range(y0, y1):
+                for x in range(x0, x1):
+                    local_pos = Coordinate(x - x0, y - y0)
+                    pos = Coordinate(x, y)
+                    codes[pos] = layout.get_room(local_pos)
+                    local_hallways = layout.get_hallway(local_pos)
+                    if local_hallways:
+                        hallways[pos] = {Coordinate(neighbor.x + x0, neighbor.y + y0): door
+                                         for neighbor, door in local_hallways.items()}
+            hub = Coordinate(layout.spawn_pos.x + x0, layout.spawn_pos.y + y0)
+            if all([self.__connect(codes, hallways, hub, gateway) for gateway in gateways]):
+                return codes, hallways, hub
+        return None
+
+    def __comb_chunk(self, cx: int, cy: int) -> (Dict[Coordinate, _Code], dict, Coordinate):
+        """
+        Fallback if no attempt to lay out a chunk succeeded: every cell becomes a WildRoom, the Rooms of a row are
+        connected with each other and the rows are connected via the middle column. The only SpecialRoom is the Boss
+        in the top right corner.
+
+        :return: codes and Hallways of the chunk's cells and its hub
+        """
+        x0, y0, x1, y1 = self.chunk_rect(cx, cy)
+        hub = Coordinate((x0 + x1) // 2, (y0 + y1) // 2)
+        codes = {}
+        hallways = {}
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                pos = Coordinate(x, y)
+                codes[pos] = _Code.Wild
+                if x + 1 < x1:
+                    self.__add_hallway(pos, pos + Direction.East, tiles.Door(Direction.East), hallways)
+                if x == hub.x and y + 1 < y1:
+                    self.__add_hallway(pos, pos + Direction.South, tiles.Door(Direction.South), hallways)
+        codes[hub] = _Code.Spawn
+        codes[Coordinate(x1 - 1, y0)] = _Code.Boss
+        return codes, hallways, hub
+
+    def load_chunk(self, cx: int, cy: int) -> (int, int, int, int):
+        """
+        Lays out the given chunk if this didn't happen yet.
+
+        :return: left, top, right and bottom border of the chunk (see chunk_rect())
+        """
+        if (cx, cy) in self.__loaded_chunks:
+            return self.chunk_rect(cx, cy)
+        checkpoint = self.__timer.now()
+        gateways = self.__gateways(cx, cy)
+        chunk = self.__layout_chunk(cx, cy, [gateway[0] for gateway in gateways])
+        if chunk is None:
+            Logger.instance().error(f"Failed to lay out chunk ({cx}, {cy}) for seed = {self.seed}, falling back to a "
+                                    f"chunk of only WildRooms.")
+            chunk = self.__comb_chunk(cx, cy)
+        codes, hallways, hub = chunk
+        for pos, code in codes.items():
+            if code == _Code.Spawn:
+                if (cx, cy) == self.__spawn_chunk:
+                    self.__spawn_pos = pos
+                else:
+                    code = _Code.Wild
+            elif code == _Code.Boss and (cx, cy) != self.__boss_chunk:
+                code = _Code.Riddle
+            self.__codes[pos] = code
+        for pos, neighbors in hallways.items():
+            if pos in self.__hallways:
+                self.__hallways[pos].update(neighbors)  # the gateway Hallway of an already loaded neighbor
+            else:
+                self.__hallways[pos] = neighbors
+        for pos, neighbor, direction in gateways:
+            if neighbor not in self.__hallways or pos not in self.__hallways[neighbor]:
+                self.__add_hallway(pos, neighbor, tiles.Door(direction))
+        self.__loaded_chunks.add((cx, cy))
+        self.__timer.lap("layout.chunk", checkpoint)
+        return self.chunk_rect(cx, cy)
+
+    def get_hallway(self, pos: Coordinate) -> "dict of Coordinate and tiles.Door":
+        if self.__is_valid_pos(pos):
+            self.load_chunk(*self.chunk_of(pos))
+            if pos in self.__hallways:
+                return self.__hallways[pos]
+        return None
+
+    def get_room(self, pos: Coordinate) -> _Code:
+        if self.__is_valid_pos(pos):
+            self.load_chunk(*self.chunk_of(pos))
+            return self.__codes[pos]
+        return None
+
+    def check_special_rooms(self) -> bool:
+        """
+        Only checks the loaded chunks. They are connected with the SpawnRoom by construction since every hub is
+        connected with the gateways of its chunk.
+
+        :return: True if every SpecialRoom of the loaded chunks has exactly one Hallway
+        """
+        for pos, code in self.__codes.items():
+            if code in _Code.special_rooms():
+                if pos not in self.__hallways or len(self.__hallways[pos]) != 1:
+                    return False
+        return True
+
+    def generate(self, debug: bool = False) -> bool:
+        """
+        Only decides which chunks keep their SpawnRoom and Boss and lays out the chunk of the SpawnRoom. All the other
+        chunks are laid out once they are needed.
+        """
+        rm = self.__seeds.random()
+        num_of_cols = len(self.__x_borders) - 1
+        num_of_rows = len(self.__y_borders) - 1
+        chunks = [(cx, cy) for cy in range(num_of_rows) for cx in range(num_of_cols)]
+        self.__spawn_chunk = rm.get_element(chunks)
+        self.__boss_chunk = max(chunks, key=lambda c: abs(c[0] - self.__spawn_chunk[0]) +
+                                                      abs(c[1] - self.__spawn_chunk[1]))
+        self.load_chunk(*self.__spawn_chunk)
+        if debug:
+            print(self)
+        return self.check_special_rooms()
+
+    def __str__(self):
+        rows = []
+        for y in range(self.__height):
+            rows.append("".join([_Code.to_string(self.__codes.get(Coordinate(x, y), _Code.Free), justify=True)
+                                 for x in range(self.__width)]))
+        return "\n".join(rows)
+
+
 class DungeonGenerator(ABC):
     WIDTH = Map.MAX_WIDTH
     HEIGHT = Map.MAX_HEIGHT
@@ -543,33 +972,120 @@ class DungeonGenerator(ABC):
         pass
 
 
-class RandomDungeonGenerator(DungeonGenerator):
+# the builders of LazyRooms are module-level functions bound with functools.partial instead of closures, so dungeons
+# with unbuilt rooms can still be pickled (e.g. for replay snapshots)
+def _build_wild_room(factory: EnemyFactory, chance: float, seeds: SeedSequence, hallways: Dict[Direction, Hallway]) \
+        -> Room:
+    return WildRoom(factory, chance,
+                    north_hallway=hallways[Direction.North],
+                    east_hallway=hallways[Direction.East],
+                    south_hallway=hallways[Direction.South],
+                    west_hallway=hallways[Direction.West],
+                    seeds=seeds)
+
+
+def _build_special_room(code: _Code, direction: Direction, gate: Instruction, riddle: Riddle,
+                        shop_items: List[ShopItem], boss: BossActor, cbp: CallbackPack,
+                        hallways: Dict[Direction, Hallway]) -> Room:
+    hw = hallways[direction]
+    if code == _Code.Shop:
+        return ShopRoom(hw, direction, shop_items, cbp.visit_shop)
+    elif code == _Code.Riddle:
+        return RiddleRoom(hw, direction, riddle, cbp.open_riddle)
+    elif code == _Code.Gate:
+        return GateRoom(gate, hw, direction)
+    elif code == _Code.Boss:
+        return BossRoom(hw, direction, tiles.Boss(boss, cbp.start_boss_fight))
+
+
+def _produce_special_room(code: _Code, direction: Direction, rm: MyRandom, gate: Instruction, cbp: CallbackPack,
+                          shop_factory: ShopFactory, riddle_factory: RiddleFactory, boss_factory: BossFactory,
+                          hallways: Dict[Direction, Hallway]) -> Room:
+    # unlike _build_special_room() the content of the SpecialRoom is only produced now
+    riddle, shop_items, boss = None, None, None
+    if code == _Code.Shop:
+        shop_items = shop_factory.produce(rm, num_of_items=3)
+    elif code == _Code.Riddle:
+        riddle = riddle_factory.produce(rm)
+    elif code == _Code.Boss:
+        # todo based on chance also add gates from riddle or shop_items?
+        boss = boss_factory.produce([gate])
+    return _build_special_room(code, direction, gate, riddle, shop_items, boss, cbp, hallways)
+
+
+class _RoomBuilder:
+    """
+    Builds the Rooms of a dungeon from its layout one position at a time. Hence, dungeons whose layout is only created
+    piece by piece (see ChunkedLayoutGenerator) can build the Rooms of a piece once it is needed.
+    """
     __MIN_ENEMY_FACTORY_CHANCE = 0.45
     __MAX_ENEMY_FACTORY_CHANCE = 0.7
 
-    def __init__(self, seed: int, load_map_callback: Callable[[str], None], achievement_manager: AchievementManager,
-                 width: int = DungeonGenerator.WIDTH, height: int = DungeonGenerator.HEIGHT):
-        super(RandomDungeonGenerator, self).__init__(seed, width, height)
-        self.__load_map = load_map_callback
-        self.__achievement_manager = achievement_manager
-        self.__layout = RandomLayoutGenerator(self.seed, width, height)
+    @staticmethod
+    def __wild_room_builder(factory: EnemyFactory, chance: float, seeds: SeedSequence) \
+            -> Callable[[Dict[Direction, Hallway]], Room]:
+        """
+        Describes a WildRoom without creating it. The returned function builds the actual WildRoom once it is needed.
 
-    def generate(self, cbp: CallbackPack, data: Robot) -> (LevelMap, bool):
-        # Testing: seeds from 0 to 500_000 were successful
-        robot = data
+        :param factory: EnemyFactory of the WildRoom
+        :param chance: chance for every individual Tile of the WildRoom to be an EnemyTile
+        :param seeds: randomness of the WildRoom so it looks the same no matter when it is built
+        :return: function that creates the WildRoom for the given Hallways
+        """
+        return functools.partial(_build_wild_room, factory, chance, seeds)
 
-        rm = RandomManager.create_new()     # needed for WildRooms
-        gate_factory = GateFactory.default()
-        shop_factory = ShopFactory.default()
-        riddle_factory = RiddleFactory.default(robot)
-        boss_factory = BossFactory.default(robot)
+    @staticmethod
+    def __special_room_builder(code: _Code, direction: Direction, rm: MyRandom, gate: Instruction,
+                               cbp: CallbackPack, shop_factory: ShopFactory, riddle_factory: RiddleFactory,
+                               boss_factory: BossFactory) -> Callable[[Dict[Direction, Hallway]], Room]:
+        """
+        Describes a SpecialRoom without creating it. Its content (e.g. the Riddle) is only produced when the returned
+        function builds the room.
+
+        :param code: which kind of SpecialRoom to build
+        :param direction: Direction of the SpecialRoom's only Hallway
+        :param rm: randomness of the SpecialRoom's content
+        :param gate: gate rewarded in GateRooms and by the Boss
+        :return: function that creates the SpecialRoom for the given Hallways
+        """
+        return functools.partial(_produce_special_room, code, direction, rm, gate, cbp, shop_factory,
+                                 riddle_factory, boss_factory)
 
-        gate = gate_factory.produce(rm)
-        riddle = riddle_factory.produce(rm)
-        shop_items = shop_factory.produce(rm, num_of_items=3)
-        dungeon_boss = boss_factory.produce([gate])  # todo based on chance also add gates from riddle or shop_items?
+    def __init__(self, seed: int, layout: "RandomLayoutGenerator or ChunkedLayoutGenerator", cbp: CallbackPack,
+                 robot: Robot, load_map_callback: Callable[[str, Coordinate], None], lazy_special_rooms: bool):
+        """
 
-        enemy_factories = [
+        :param seed: seed of the dungeon
+        :param layout: layout of the dungeon
+        :param lazy_special_rooms: whether SpecialRooms should only be built once they come into sight and produce
+            their own content or share the content produced right away
+        """
+        self.__seed = seed
+        self.__layout = layout
+        self.__cbp = cbp
+        self.__load_map = load_map_callback
+        self.__lazy_special_rooms = lazy_special_rooms
+
+        # every part of the dungeon derives its own stream from the dungeon's seed so the result neither depends on
+        # the global RandomManager nor on the order in which the rooms are built
+        self.__seeds = SeedSequence(seed)
+        rm = self.__seeds.spawn("special_rooms").random()
+        self.__gate_factory = GateFactory.default()
+        self.__shop_factory = ShopFactory.default()
+        self.__riddle_factory = RiddleFactory.default(robot)
+        self.__boss_factory = BossFactory.default(robot, self.__seeds.spawn("boss").random())
+
+        self.__gate = self.__gate_factory.produce(rm)
+        if lazy_special_rooms:
+            # every SpecialRoom produces its own content once it is built
+            self.__riddle, self.__shop_items, self.__boss = None, None, None
+        else:
+            self.__riddle = self.__riddle_factory.produce(rm)
+            self.__shop_items = self.__shop_factory.produce(rm, num_of_items=3)
+            # todo based on chance also add gates from riddle or shop_items?
+            self.__boss = self.__boss_factory.produce([self.__gate])
+
+        self.__enemy_factories = [
             EnemyFactory(cbp.start_fight, TargetDifficulty(
                 2, [pickup.Coin(2), pickup.Heart()]
             )),
@@ -583,85 +1099,170 @@ class RandomDungeonGenerator(DungeonGenerator):
                 3, [pickup.Coin(1), pickup.Coin(1), consumable.HealthPotion(3)]
             )),
         ]
-        enemy_factory_priorities = [0.25, 0.35, 0.3, 0.1]
-
-        rooms = [[None for _ in range(self.width)] for _ in range(self.height)]
-        spawn_room = None
-        created_hallways = {}
-        if self.__layout.generate():
-            for y in range(self.height):
-                for x in range(self.width):
-                    pos = Coordinate(x, y)
-                    code = self.__layout.get_room(pos)
-                    if code and code > _Code.Blocked:
-                        room_hallways = {
-                            Direction.North: None, Direction.East: None, Direction.South: None, Direction.West: None,
-                        }
-                        hallways = self.__layout.get_hallway(pos)
-                        if hallways is None:
-                            if code == _Code.Wild:
-                                # it is completely fine if it happens that an isolated WildRoom was generated
-                                continue
-                            else:
-                                Logger.instance().throw(NotImplementedError(
-                                    f"Found a SpecialRoom ({code}) without connecting Hallways for seed = "
-                                    f"{self.seed}. Please do report this error as this should not be "
-                                    "possible to occur! :("))
-                        for neighbor in hallways:
-                            direction = Direction.from_coordinates(pos, neighbor)
-                            opposite = direction.opposite()
-                            # get hallway from neighbor if it exists, otherwise create it
-                            if neighbor in created_hallways and opposite in created_hallways[neighbor]:
-                                hallway = created_hallways[neighbor][opposite]
-                            else:
-                                hallway = Hallway(hallways[neighbor])   # todo create door here and only check if it should be locked or not?
-                                if neighbor in created_hallways:
-                                    created_hallways[neighbor][opposite] = hallway
-                                else:
-                                    created_hallways[neighbor] = {opposite: hallway}
-
-                            # store the hallway so the neighbors can find it if necessary
-                            if pos not in created_hallways:
-                                created_hallways[pos] = {}
-                            created_hallways[pos][direction] = hallway
-                            room_hallways[direction] = hallway
-
-                        room = None
-                        if code == _Code.Spawn:
-                            spawn_room = pos
-                            room = SpawnRoom(self.__load_map,
-                                north_hallway=room_hallways[Direction.North],
-                                east_hallway=room_hallways[Direction.East],
-                                south_hallway=room_hallways[Direction.South],
-                                west_hallway=room_hallways[Direction.West],
-                                )
-                        elif code == _Code.Wild:
-                            enemy_factory = rm.get_element_prioritized(enemy_factories, enemy_factory_priorities)
-                            room = WildRoom(
-                                enemy_factory,
-                                chance=rm.get(RandomDungeonGenerator.__MIN_ENEMY_FACTORY_CHANCE,
-                                              RandomDungeonGenerator.__MAX_ENEMY_FACTORY_CHANCE),
-                                north_hallway=room_hallways[Direction.North],
-                                east_hallway=room_hallways[Direction.East],
-                                south_hallway=room_hallways[Direction.South],
-                                west_hallway=room_hallways[Direction.West],
-                            )
-                        else:
-                            # special rooms have exactly 1 neighbor which is already stroed in direction
-                            hw = room_hallways[direction]
-                            if code == _Code.Shop:
-                                room = ShopRoom(hw, direction, shop_items, cbp.visit_shop)
-                            elif code == _Code.Riddle:
-                                room = RiddleRoom(hw, direction, riddle, cbp.open_riddle)
-                            elif code == _Code.Gate:
-                                room = GateRoom(gate, hw, direction)
-                            elif code == _Code.Boss:
-                                room = BossRoom(hw, direction, tiles.Boss(dungeon_boss, cbp.start_boss_fight))
-                        if room:
-                            rooms[y][x] = room
+        self.__enemy_factory_priorities = [0.25, 0.35, 0.3, 0.1]
+        self.__created_hallways = {}
+
+    @property
+    def layout(self) -> "RandomLayoutGenerator or ChunkedLayoutGenerator":
+        return self.__layout
+
+    def __hallways_of(self, pos: Coordinate, hallways: "dict of Coordinate and tiles.Door") \
+            -> Dict[Direction, Hallway]:
+        room_hallways = {
+            Direction.North: None, Direction.East: None, Direction.South: None, Direction.West: None,
+        }
+        for neighbor in hallways:
+            direction = Direction.from_coordinates(pos, neighbor)
+            opposite = direction.opposite()
+            # get hallway from neighbor if it exists, otherwise create it
+            if neighbor in self.__created_hallways and opposite in self.__created_hallways[neighbor]:
+                hallway = self.__created_hallways[neighbor][opposite]
+            else:
+                hallway = Hallway(hallways[neighbor])   # todo create door here and only check if it should be locked or not?
+                if neighbor in self.__created_hallways:
+                    self.__created_hallways[neighbor][opposite] = hallway
+                else:
+                    self.__created_hallways[neighbor] = {opposite: hallway}
+
+            # store the hallway so the neighbors can find it if necessary
+            if pos not in self.__created_hallways:
+                self.__created_hallways[pos] = {}
+            self.__created_hallways[pos][direction] = hallway
+            room_hallways[direction] = hallway
+        return room_hallways
+
+    def build(self, pos: Coordinate) -> Room:
+        """
+        :param pos: position of the Room in the layout
+        :return: the Room (WildRooms are only described by a LazyRoom) or None if there is no Room at the position
+        """
+        code = self.__layout.get_room(pos)
+        if not code or code <= _Code.Blocked:
+            return None
+        hallways = self.__layout.get_hallway(pos)
+        if hallways is None:
+            if code == _Code.Wild:
+                # it is completely fine if it happens that an isolated WildRoom was generated
+                return None
+            else:
+                Logger.instance().throw(NotImplementedError(
+                    f"Found a SpecialRoom ({code}) without connecting Hallways for seed = "
+                    f"{self.__seed}. Please do report this error as this should not be "
+                    "possible to occur! :("))
+        room_hallways = self.__hallways_of(pos, hallways)
+
+        room_seeds = self.__seeds.spawn(pos.x, pos.y)
+        if code == _Code.Spawn:
+            return SpawnRoom(self.__load_map,
+                             north_hallway=room_hallways[Direction.North],
+                             east_hallway=room_hallways[Direction.East],
+                             south_hallway=room_hallways[Direction.South],
+                             west_hallway=room_hallways[Direction.West],
+                             )
+        elif code == _Code.Wild:
+            # WildRooms are only described here and built once the Map brings them into sight
+            room_rm = room_seeds.random()
+            enemy_factory = room_rm.get_element_prioritized(self.__enemy_factories,
+                                                            self.__enemy_factory_priorities)
+            chance = room_rm.get(_RoomBuilder.__MIN_ENEMY_FACTORY_CHANCE, _RoomBuilder.__MAX_ENEMY_FACTORY_CHANCE)
+            builder = _RoomBuilder.__wild_room_builder(enemy_factory, chance, room_seeds.spawn("enemies"))
+            return LazyRoom(builder, room_hallways)
+        else:
+            # special rooms have exactly 1 neighbor
+            direction = Direction.from_coordinates(pos, list(hallways.keys())[0])
+            if self.__lazy_special_rooms:
+                room_gate = self.__gate
+                if code == _Code.Gate and not self.__layout.in_spawn_chunk(pos):
+                    # only the GateRoom next to the SpawnRoom provides the Boss's gate, every other one gets its own
+                    room_gate = self.__gate_factory.produce(room_seeds.spawn("gate").random())
+                builder = _RoomBuilder.__special_room_builder(code, direction, room_seeds.random(), room_gate,
+                                                              self.__cbp, self.__shop_factory, self.__riddle_factory,
+                                                              self.__boss_factory)
+                return LazyRoom(builder, room_hallways)
+            else:
+                # the SpecialRooms of a level share their content
+                return _build_special_room(code, direction, self.__gate, self.__riddle, self.__shop_items,
+                                           self.__boss, self.__cbp, room_hallways)
+
+
+class _ChunkedRoomRegions(RoomRegions):
+    """
+    RoomRegions that only lay out and build the Rooms of a chunk (see ChunkedLayoutGenerator) once the Map loads a
+    rectangle overlapping it.
+    """
+
+    def __init__(self, width: int, height: int, builder: _RoomBuilder):
+        super(_ChunkedRoomRegions, self).__init__(width, height)
+        self.__builder = builder
+        self.__built_chunks = set()
+
+    def load(self, x: int, y: int, width: int = 1, height: int = 1) -> List[Tuple[int, int, Room]]:
+        layout = self.__builder.layout
+        new_rooms = []
+        for chunk in layout.chunks_in(x, y, width, height):
+            if chunk in self.__built_chunks:
+                continue
+            self.__built_chunks.add(chunk)
+            x0, y0, x1, y1 = layout.load_chunk(*chunk)
+            for room_y in range(y0, y1):
+                for room_x in range(x0, x1):
+                    room = self.__builder.build(Coordinate(room_x, room_y))
+                    if room:
+                        self.set(room_x, room_y, room)
+                        new_rooms.append((room_x, room_y, room))
+        return new_rooms
+
+
+class RandomDungeonGenerator(DungeonGenerator):
+    def __init__(self, seed: int, load_map_callback: Callable[[str], None], achievement_manager: AchievementManager,
+                 width: int = DungeonGenerator.WIDTH, height: int = DungeonGenerator.HEIGHT, timer: PhaseTimer = None):
+        super(RandomDungeonGenerator, self).__init__(seed, width, height)
+        if timer is None:
+            timer = PhaseTimer.disabled()
+        self.__timer = timer
+        self.__load_map = load_map_callback
+        self.__achievement_manager = achievement_manager
+        self.__layout = self._create_layout(self.seed, width, height, timer)
+
+    def _create_layout(self, seed: int, width: int, height: int, timer: PhaseTimer) -> RandomLayoutGenerator:
+        return RandomLayoutGenerator(seed, width, height, timer)
+
+    def _build_special_rooms_lazily(self) -> bool:
+        """
+        :return: whether SpecialRooms should only be built once they come into sight, like WildRooms are
+        """
+        return False
+
+    def _create_rooms(self, builder: _RoomBuilder) -> RoomRegions:
+        """
+        :return: the Rooms of the dungeon, by default all of them are built right away
+        """
+        rooms = RoomRegions(self.width, self.height)
+        for y in range(self.height):
+            for x in range(self.width):
+                room = builder.build(Coordinate(x, y))
+                if room:
+                    rooms.set(x, y, room)
+        return rooms
+
+    def generate(self, cbp: CallbackPack, data: Robot) -> (LevelMap, bool):
+        # Testing: seeds from 0 to 500_000 were successful
+        robot = data
+        checkpoint = self.__timer.now()
+        builder = _RoomBuilder(self.seed, self.__layout, cbp, robot, self.__load_map,
+                               self._build_special_rooms_lazily())
+        checkpoint = self.__timer.lap("dungeon.factories", checkpoint)
+
+        layout_success = self.__layout.generate()
+        checkpoint = self.__timer.lap("dungeon.layout", checkpoint)
+        if layout_success:
+            rooms = self._create_rooms(builder)
+            checkpoint = self.__timer.lap("dungeon.rooms", checkpoint)
+            spawn_room = self.__layout.spawn_pos
             if spawn_room:
                 my_map = LevelMap(f"Expedition {self.seed}", self.seed, rooms, robot, spawn_room,
                                   self.__achievement_manager)
+                self.__timer.lap("dungeon.map", checkpoint)
                 return my_map, True
             else:
                 return None, False
@@ -670,3 +1271,29 @@ class RandomDungeonGenerator(DungeonGenerator):
 
     def __str__(self) -> str:
         return str(self.__layout)
+
+
+class LargeDungeonGenerator(RandomDungeonGenerator):
+    """
+    Generates dungeons that are bigger than Map.MAX_WIDTH x Map.MAX_HEIGHT. The layout is created chunk by chunk (see
+    ChunkedLayoutGenerator) and the Rooms of a chunk are only created once the Map loads the chunk because the
+    Robot gets close to it. Except for the SpawnRoom they are also only built once they come into sight, so the cost
+    of a large dungeon depends on how much of it is actually explored and not on its size.
+    """
+    WIDTH = 64
+    HEIGHT = 64
+
+    def __init__(self, seed: int, load_map_callback: Callable[[str], None], achievement_manager: AchievementManager,
+                 width: int = WIDTH, height: int = HEIGHT, timer: PhaseTimer = None):
+        super(LargeDungeonGenerator, self).__init__(seed, load_map_callback, achievement_manager, width, height,
+                                                    timer)
+
+    def _create_layout(self, seed: int, width: int, height: int, timer: PhaseTimer) -> ChunkedLayoutGenerator:
+        return ChunkedLayoutGenerator(seed, width, height, timer=timer)
+
+    def _build_special_rooms_lazily(self) -> bool:
+        return True
+
+    def _create_rooms(self, builder: _RoomBuilder) -> RoomRegions:
+        # the Map loads the chunks around the SpawnRoom right away and all the others once the Robot gets close
+        return _ChunkedRoomRegions(self.width, self.height, builder)
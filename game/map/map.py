@@ -1,19 +1,137 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Union, Iterator, Tuple, Dict
 
 import game.map.tiles as tiles
 from game.achievements import AchievementManager
 from game.actors.controllable import Controllable
 from game.map.navigation import Coordinate, Direction
-from game.map.rooms import Room, Area, Placeholder, SpawnRoom, MetaRoom
-from util.config import Config
+from game.map.rooms import Room, Area, Placeholder, SpawnRoom, MetaRoom, LazyRoom, Hallway
+from game.map.visibility import VisibilityMap
+from util.config import CheatConfig, Config
 from util.logger import Logger
 
 
+class RoomRegions:
+    """
+    Stores the Rooms of a Map in square regions. A region is only allocated once a Room is placed in it, so large
+    and sparse Maps don't need a full matrix and can be traversed region by region.
+    """
+    REGION_SIZE = 8
+
+    @staticmethod
+    def from_matrix(rooms: List[List[Room]]) -> "RoomRegions":
+        """
+        :param rooms: matrix of Rooms (rows first) as it is created by the parsers
+        :return: RoomRegions containing the same Rooms at the same positions
+        """
+        regions = RoomRegions(len(rooms[0]), len(rooms))
+        for y, room_row in enumerate(rooms):
+            for x, room in enumerate(room_row):
+                if room:
+                    regions.set(x, y, room)
+        return regions
+
+    def __init__(self, width: int, height: int):
+        self.__width = width
+        self.__height = height
+        self.__regions: Dict[Tuple[int, int], List[List[Room]]] = {}
+
+    @property
+    def width(self) -> int:
+        return self.__width
+
+    @property
+    def height(self) -> int:
+        return self.__height
+
+    @property
+    def num_of_regions(self) -> int:
+        return len(self.__regions)
+
+    def __region_key(self, x: int, y: int) -> Tuple[int, int]:
+        return x // RoomRegions.REGION_SIZE, y // RoomRegions.REGION_SIZE
+
+    def get(self, x: int, y: int) -> Room:
+        """
+        :param x: horizontal position of the Room
+        :param y: vertical position of the Room
+        :return: the stored Room (can be an unmaterialized LazyRoom) or None if there is no Room at the position
+        """
+        region = self.__regions.get(self.__region_key(x, y))
+        if region is None:
+            return None
+        return region[y % RoomRegions.REGION_SIZE][x % RoomRegions.REGION_SIZE]
+
+    def set(self, x: int, y: int, room: Room):
+        if not (0 <= x < self.__width and 0 <= y < self.__height):
+            Logger.instance().throw(IndexError(f"Position {x}|{y} is outside of the map ({self.__width}x"
+                                               f"{self.__height})!"))
+        key = self.__region_key(x, y)
+        if key not in self.__regions:
+            self.__regions[key] = [[None] * RoomRegions.REGION_SIZE for _ in range(RoomRegions.REGION_SIZE)]
+        self.__regions[key][y % RoomRegions.REGION_SIZE][x % RoomRegions.REGION_SIZE] = room
+
+    def load(self, x: int, y: int, width: int = 1, height: int = 1) -> List[Tuple[int, int, Room]]:
+        """
+        Makes sure the Rooms in the given rectangle exist. RoomRegions that only create their Rooms on demand (e.g. for
+        large dungeons) override this, by default all Rooms are already stored.
+
+        :return: (x, y, room) of the Rooms that were added by this call
+        """
+        return []
+
+    def __iter__(self) -> Iterator[Tuple[int, int, Room]]:
+        """
+        :return: iterator over all stored Rooms as (x, y, room) without visiting unallocated regions
+        """
+        size = RoomRegions.REGION_SIZE
+        for (rx, ry), region in self.__regions.items():
+            for y, room_row in enumerate(region):
+                for x, room in enumerate(room_row):
+                    if room is not None:
+                        yield rx * size + x, ry * size + y, room
+
+
+class _Cell:
+    """
+    Describes to which Area the cells of a unit (i.e. a Room together with the Hallways to its east and south)
+    belong. Since all units look the same, this only has to be calculated once.
+    """
+    InRoom = 0
+    InEastHallway = 1
+    InSouthHallway = 2
+    Outside = 3     # surrounded by Hallways but not part of any Area
+
+    @staticmethod
+    def unit_table() -> List[List[Tuple[int, int, int]]]:
+        """
+        :return: (kind, x, y) for every cell of a unit where x and y are the local coordinates in the Area
+        """
+        table = []
+        for y in range(Area.UNIT_HEIGHT + 1):
+            row = []
+            for x in range(Area.UNIT_WIDTH + 1):
+                if x == Area.UNIT_WIDTH:
+                    if y == Area.UNIT_HEIGHT:
+                        row.append((_Cell.Outside, 0, 0))
+                    else:
+                        row.append((_Cell.InEastHallway, 0, y))     # vertical Hallway
+                elif y == Area.UNIT_HEIGHT:
+                    row.append((_Cell.InSouthHallway, x, 0))        # horizontal Hallway
+                else:
+                    row.append((_Cell.InRoom, x, y))
+            table.append(row)
+        return table
+
+
 class Map(ABC):
     DONE_EVENT_ID = "Done".lower()
     MAX_WIDTH = 7
     MAX_HEIGHT = 3
+    # Rooms up to this many Rooms away from the controllable are loaded since entering a Hallway brings Rooms up to 2
+    # Rooms away into sight
+    LOAD_RADIUS = 2
+    __UNIT_TABLE = _Cell.unit_table()
 
     @staticmethod
     def __calculate_pos(pos_of_room: Coordinate, pos_in_room: Coordinate) -> Coordinate:
@@ -29,18 +147,30 @@ class Map(ABC):
         y = pos_of_room.y * (Area.UNIT_HEIGHT + 1) + pos_in_room.y
         return Coordinate(x, y)
 
-    def __init__(self, name: str, seed: int, rooms: List[List[Room]], controllable: Controllable,
+    def __init__(self, name: str, seed: int, rooms: Union[List[List[Room]], RoomRegions], controllable: Controllable,
                  spawn_room: Coordinate, achievement_manager: AchievementManager):
         self.__name = name
         self.__seed = seed
+        if not isinstance(rooms, RoomRegions):
+            rooms = RoomRegions.from_matrix(rooms)
         self.__rooms = rooms
         self.__controllable_tile = tiles.ControllableTile(controllable)
         self.__achievement_manager = achievement_manager
 
-        self.__dimensions = Coordinate(len(rooms[0]), len(rooms))
+        self.__dimensions = Coordinate(rooms.width, rooms.height)
+        self.__full_width = self.width * (Area.UNIT_WIDTH + 1) - 1
+        self.__full_height = self.height * (Area.UNIT_HEIGHT + 1) - 1
+        # (Room, east Hallway, south Hallway) for every Room so Map.move() doesn't have to resolve them on every step
+        # LazyRooms are only indexed once they are needed since indexing materializes them
+        self.__units = [None] * (self.width * self.height)
+        self.__visibility = VisibilityMap(self.width, self.height)
 
         self.__controllable_pos = Map.__calculate_pos(spawn_room, Coordinate(Area.MID_X, Area.MID_Y))
-        self.__cur_area = self.__rooms[spawn_room.y][spawn_room.x]
+        self.__loaded_around = spawn_room
+        # the Rooms loaded now are attached together with all the others below
+        rooms.load(spawn_room.x - Map.LOAD_RADIUS, spawn_room.y - Map.LOAD_RADIUS, 2 * Map.LOAD_RADIUS + 1,
+                   2 * Map.LOAD_RADIUS + 1)
+        self.__cur_area = self.room_at(spawn_room.x, spawn_room.y)
         self.__cur_area.enter(Direction.Center)
         self.__cur_area.make_visible()
 
@@ -49,18 +179,12 @@ class Map(ABC):
         elif not isinstance(self.__cur_area, MetaRoom):
             Logger.instance().error(f"{name} starts in area that is not a SpawnRoom! cur_area = {self.__cur_area}")
 
-        # todo better solution would be nice, but since our sizes are fixed it doesn't make sense performance-wise
-        # e.g. maximal WIDTH * HEIGHT * 4 = 7 * 3 * 4 = 84 iterations
-        # set the check event callback for all doors
-        for room_row in rooms:
-            for room in room_row:
-                if room:
-                    for direction in Direction.values():
-                        hw = room.get_hallway(direction, throw_error=False)
-                        if hw:
-                            hw.set_check_event_callback(self.check_event)
+        for x, y, room in rooms:
+            self.__attach(x, y, room)
 
         self.__events = {}
+        self.__triggered_area = None
+        self.__block_cache = {}
 
     @property
     def seed(self) -> int:
@@ -76,11 +200,19 @@ class Map(ABC):
 
     @property
     def full_width(self) -> int:
-        return self.width * (Area.UNIT_WIDTH + 1) - 1
+        return self.__full_width
 
     @property
     def full_height(self) -> int:
-        return self.height * (Area.UNIT_HEIGHT + 1) - 1
+        return self.__full_height
+
+    @property
+    def visibility(self) -> VisibilityMap:
+        return self.__visibility
+
+    @property
+    def name(self) -> str:
+        return self.__name
 
     @property
     def controllable_tile(self) -> tiles.ControllableTile:
@@ -94,55 +226,130 @@ class Map(ABC):
     def is_world(self) -> bool:
         pass
 
+    def __attach(self, x: int, y: int, room: Union[Room, LazyRoom]):
+        """
+        Connects a stored Room and its Hallways with the Map.
+        """
+        # set the check event callback for all doors (LazyRooms already know their Hallways)
+        for direction in Direction.values():
+            hw = room.get_hallway(direction, throw_error=False)
+            if hw:
+                hw.set_check_event_callback(self.check_event)
+        # every Room stores its visibility and the one of its Hallways to the east and south in the Map's bitmap
+        room.attach_visibility(self.__visibility, self.__visibility.slot(x, y, VisibilityMap.ROOM))
+        for direction, part in [(Direction.East, VisibilityMap.EAST_HALLWAY),
+                                (Direction.South, VisibilityMap.SOUTH_HALLWAY)]:
+            hw = room.get_hallway(direction, throw_error=False)
+            if hw:
+                hw.attach_visibility(self.__visibility, self.__visibility.slot(x, y, part))
+        if not isinstance(room, LazyRoom):
+            self.__index_unit(x, y)
+
+    def __load(self, room_x: int, room_y: int, width: int = 1, height: int = 1):
+        """
+        Makes sure the Rooms in the given rectangle exist and attaches the ones that were only created now.
+        """
+        for x, y, room in self.__rooms.load(room_x, room_y, width, height):
+            self.__attach(x, y, room)
+
+    def __index_unit(self, room_x: int, room_y: int) -> (Room, Hallway, Hallway):
+        """
+        Stores the Room at the given position together with its Hallways to the east and south in the index.
+
+        :return: the indexed (Room, east Hallway, south Hallway) or None if there is no Room
+        """
+        room = self.room_at(room_x, room_y)
+        if room is None:
+            return None
+        unit = room, room.get_hallway(Direction.East, throw_error=False), \
+            room.get_hallway(Direction.South, throw_error=False)
+        self.__units[room_y * self.width + room_x] = unit
+        return unit
+
     def __get_area(self, x: int, y: int) -> (Area, tiles.Tile):
         """
-        Calculates and returns the Room and in-room Coordinates of the given Map position.
+        Returns the Room or Hallway and the Tile at the given Map position by looking them up in the index.
         :param x: x position on the Map
         :param y: y position on the Map
         :return: Room or Hallway and their Tile at the given position
         """
-        in_hallway = None
-        width = Area.UNIT_WIDTH + 1
-        height = Area.UNIT_HEIGHT + 1
-        x_mod = x % width
-        y_mod = y % height
-        # position is in Hallway
-        if x_mod == Area.UNIT_WIDTH:
-            if y_mod == Area.UNIT_HEIGHT:
-                # there are a few points on the map that are surrounded by Hallways and don't belong to any Room
-                Logger.instance().error(f"Error! You should not be able to move outside of Hallways: {x}|{y}")
-                return None, tiles.Invalid()
-            x -= 1
-            x_mod -= 1
-            in_hallway = Direction.East
-        elif y_mod == Area.UNIT_HEIGHT:
-            y -= 1
-            y_mod -= 1
-            in_hallway = Direction.South
-
-        room_x = int(x / width)
-        room_y = int(y / height)
-        room = self.__rooms[room_y][room_x]
-        if room is None:
-            Logger.instance().error(f"Error! Invalid position: {x}|{y}")
+        room_x, x_mod = divmod(x, Area.UNIT_WIDTH + 1)
+        room_y, y_mod = divmod(y, Area.UNIT_HEIGHT + 1)
+        kind, local_x, local_y = Map.__UNIT_TABLE[y_mod][x_mod]
+        if kind == _Cell.Outside:
+            # there are a few points on the map that are surrounded by Hallways and don't belong to any Room
+            Logger.instance().error(f"Error! You should not be able to move outside of Hallways: {x}|{y}")
             return None, tiles.Invalid()
 
-        if in_hallway:
-            hallway = room.get_hallway(in_hallway)
-            if hallway is None:
+        unit = self.__units[room_y * self.width + room_x]
+        if unit is None:
+            unit = self.__index_unit(room_x, room_y)
+            if unit is None:
+                Logger.instance().error(f"Error! Invalid position: {x}|{y}")
                 return None, tiles.Invalid()
-            if hallway.is_horizontal():
-                return hallway, hallway.at(x_mod, 0)
-            else:
-                return hallway, hallway.at(0, y_mod)
+
+        room, east_hallway, south_hallway = unit
+        if kind == _Cell.InRoom:
+            return room, room.at(local_x, local_y)
+        if kind == _Cell.InEastHallway:
+            hallway, direction = east_hallway, Direction.East
         else:
-            return room, room.at(x_mod, y_mod)
+            hallway, direction = south_hallway, Direction.South
+        if hallway is None:
+            room.get_hallway(direction)     # logs the invalid access
+            return None, tiles.Invalid()
+        return hallway, hallway.at(local_x, local_y)
 
     def room_at(self, x: int, y: int) -> Room:
+        """
+        Returns the Room at the given position and materializes it if it was only lazily described so far.
+
+        :param x: horizontal position of the Room
+        :param y: vertical position of the Room
+        :return: the Room at the given position or None if there is no Room
+        """
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.__rooms[y][x]
+            self.__load(x, y)
+            room = self.__rooms.get(x, y)
+            if isinstance(room, LazyRoom):
+                return room.materialize()
+            return room
         return None
 
+    @property
+    def num_of_rooms(self) -> int:
+        """
+        :return: number of Rooms created so far (i.e. without the ones that are not loaded yet)
+        """
+        return sum(1 for _ in self.__rooms)
+
+    @property
+    def num_of_materialized_rooms(self) -> int:
+        count = 0
+        for _, _, room in self.__rooms:
+            if not isinstance(room, LazyRoom) or room.is_materialized:
+                count += 1
+        return count
+
+    def reveal(self, room_x: int = 0, room_y: int = 0, width: int = None, height: int = None):
+        """
+        Makes the Rooms in the given rectangle and their Hallways visible at once. By default the whole Map is revealed.
+
+        :param room_x: horizontal position of the top left Room of the rectangle
+        :param room_y: vertical position of the top left Room of the rectangle
+        :param width: number of Rooms per row of the rectangle, None means until the end of the Map
+        :param height: number of Room rows of the rectangle, None means until the end of the Map
+        """
+        if width is None:
+            width = self.width - room_x
+        if height is None:
+            height = self.height - room_y
+        # LazyRooms are only rendered once they are materialized
+        for y in range(max(0, room_y), min(room_y + height, self.height)):
+            for x in range(max(0, room_x), min(room_x + width, self.width)):
+                self.room_at(x, y)
+        self.__visibility.reveal(room_x, room_y, width, height)
+
     def move(self, direction: Direction) -> bool:
         """
         Tries to move the robot into the given Direction.
@@ -150,8 +357,8 @@ class Map(ABC):
         :return: True if the robot was able to move, False otherwise
         """
         new_pos = self.__controllable_pos + direction
-        if new_pos.y < 0 or self.full_height <= new_pos.y or \
-                new_pos.x < 0 or self.full_width <= new_pos.x:
+        if new_pos.y < 0 or self.__full_height <= new_pos.y or \
+                new_pos.x < 0 or self.__full_width <= new_pos.x:
             return False
 
         area, tile = self.__get_area(new_pos.x, new_pos.y)
@@ -163,12 +370,28 @@ class Map(ABC):
 
             if isinstance(tile, tiles.WalkTriggerTile):
                 tile.trigger(direction, self.controllable_tile.controllable, self.__trigger_event)
+                area.mark_dirty()
+                self.__triggered_area = area
 
             self.__controllable_pos = new_pos
+            room_pos = Coordinate(new_pos.x // (Area.UNIT_WIDTH + 1), new_pos.y // (Area.UNIT_HEIGHT + 1))
+            if room_pos != self.__loaded_around:
+                self.__loaded_around = room_pos
+                self.__load(room_pos.x - Map.LOAD_RADIUS, room_pos.y - Map.LOAD_RADIUS, 2 * Map.LOAD_RADIUS + 1,
+                            2 * Map.LOAD_RADIUS + 1)
             return True
         else:
             return False
 
+    def resolve_trigger(self):
+        """
+        Has to be called once the outcome of the last triggered Tile is known (e.g. after the fight, Riddle or Shop it
+        started) since the outcome can change how the Tile looks, e.g. a solved Riddle disappears.
+        """
+        if self.__triggered_area is not None:
+            self.__triggered_area.mark_dirty()
+            self.__triggered_area = None
+
     def check_event(self, event_id: str) -> bool:
         return event_id in self.__events
 
@@ -184,48 +407,147 @@ class Map(ABC):
         if Config.debugging():
             print("triggered event: " + event_id)
         self.__events[event_id] = True
-
-    def row_strings(self) -> List[str]:
+        self.__mark_all_dirty()     # events can unlock doors anywhere on the Map
+
+    def __mark_all_dirty(self):
+        for _, _, room in self.__rooms:
+            if isinstance(room, LazyRoom):
+                if not room.is_materialized:
+                    continue
+                room = room.room
+            room.mark_dirty()
+            for direction in Direction.values():
+                hallway = room.get_hallway(direction, throw_error=False)
+                if hallway:
+                    hallway.mark_dirty()
+
+    def stream_rows(self, room_x: int = 0, room_y: int = 0, width: int = None, height: int = None) -> Iterator[str]:
+        """
+        Renders the given window of Rooms (including the Hallways between them) row by row. Hence, large Maps can be
+        rendered piece by piece without building the whole Map at once.
+
+        :param room_x: horizontal position of the top left Room of the window
+        :param room_y: vertical position of the top left Room of the window
+        :param width: number of Rooms per row of the window, None means until the end of the Map
+        :param height: number of Room rows of the window, None means until the end of the Map
+        :return: iterator over the rendered rows of the window
+        """
+        if width is None:
+            width = self.width - room_x
+        if height is None:
+            height = self.height - room_y
+        revealed = CheatConfig.revealed_map()   # checked once for the whole window instead of for every Tile
+        for y in range(room_y, room_y + height):
+            last_row = y == room_y + height - 1  # there are no more Hallways after the last row of Rooms
+            yield from self.__render_block(y, room_x, width, revealed, east_border=False, south_border=not last_row)
+
+    def render_section(self, x: int, y: int, width: int, height: int) -> List[str]:
+        """
+        Renders only the given rectangle of the Map. Only the Rooms overlapping the rectangle are rendered, so the work
+        depends on the size of the rectangle and not on the size of the Map.
+
+        :param x: horizontal position of the rectangle's top left corner in characters
+        :param y: vertical position of the rectangle's top left corner in characters
+        :param width: width of the rectangle in characters
+        :param height: height of the rectangle in characters
+        :return: the rendered rows of the rectangle (fewer and shorter ones if the rectangle exceeds the Map)
+        """
+        unit_width = Area.UNIT_WIDTH + 1
+        unit_height = Area.UNIT_HEIGHT + 1
+        stop_x = min(x + width, self.__full_width)
+        stop_y = min(y + height, self.__full_height)
+        x, y = max(0, x), max(0, y)
+        if stop_x <= x or stop_y <= y:
+            return []
+
+        first_room_x, last_room_x = x // unit_width, (stop_x - 1) // unit_width
+        first_room_y, last_room_y = y // unit_height, (stop_y - 1) // unit_height
+        offset_x = x - first_room_x * unit_width
+        revealed = CheatConfig.revealed_map()
         rows = []
-        offset = 0
-        # iterate through every row of Rooms
-        for y in range(self.height):
-            last_row = y == self.height - 1  # there are no more Hallways after the last row of Rooms
-            areas = []
-            south_hallways = []
-
-            for x in range(self.width):
-                last_col = x == self.width - 1  # there are no more Hallways after the last Room in a row
-                room = self.room_at(x, y)
-                if room is None:
-                    areas.append(Placeholder.pseudo_room())
-                    if not last_col:
-                        areas.append(Placeholder.vertical())
-                    if not last_row:
-                        south_hallways.append(Placeholder.horizontal().get_row_str(0))
+        for room_y in range(first_room_y, last_room_y + 1):
+            block = self.__render_block(room_y, first_room_x, last_room_x - first_room_x + 1, revealed,
+                                        east_border=last_room_x < self.width - 1,
+                                        south_border=room_y < self.height - 1)
+            block_start = room_y * unit_height
+            for row in block[max(0, y - block_start):stop_y - block_start]:
+                rows.append(row[offset_x:offset_x + stop_x - x])
+        return rows
+
+    def __render_block(self, y: int, room_x: int, width: int, revealed: bool, east_border: bool,
+                       south_border: bool) -> List[str]:
+        """
+        Renders one row of Rooms including the Hallways to the south of them. The block is only assembled anew if at
+        least one of its Areas was rendered anew since the last call, otherwise the cached rows are returned.
+
+        :param y: vertical position of the Rooms
+        :param room_x: horizontal position of the first Room
+        :param width: number of Rooms
+        :param revealed: whether the Areas should be rendered as visible regardless of their visibility or not
+        :param east_border: whether the Hallways to the east of the last Room should be rendered or not
+        :param south_border: whether the Hallways to the south should be rendered or not
+        :return: UNIT_HEIGHT + 1 rendered rows (the last one is empty without south_border)
+        """
+        areas = []
+        south_hallways = []
+        last_row = not south_border
+        for x in range(room_x, room_x + width):
+            # there are no more Hallways after the last Room in a row
+            last_col = x == room_x + width - 1 and not east_border
+            if revealed:
+                room = self.room_at(x, y)   # the whole Map is visible, so LazyRooms have to be materialized
+            else:
+                # don't use room_at() since we don't want to materialize LazyRooms that are not in sight yet
+                room = self.__rooms.get(x, y)
+            if room is None:
+                areas.append(Placeholder.pseudo_room())
+                if not last_col:
+                    areas.append(Placeholder.vertical())
+                if not last_row:
+                    south_hallways.append(Placeholder.horizontal())
 
+            else:
+                if isinstance(room, LazyRoom):
+                    # a LazyRoom cannot be in sight yet, otherwise it would have been materialized
+                    if room.is_materialized:
+                        areas.append(room.room)
+                    else:
+                        areas.append(Placeholder.pseudo_room())
                 else:
                     areas.append(room)
-                    if not last_col:
-                        hallway = room.get_hallway(Direction.East, throw_error=False)
-                        if hallway is None:
-                            areas.append(Placeholder.vertical())
-                        else:
-                            areas.append(hallway)
-                    if not last_row:
-                        hallway = room.get_hallway(Direction.South, throw_error=False)
-                        if hallway is None:
-                            south_hallways.append(Placeholder.horizontal().get_row_str(0))
-                        else:
-                            south_hallways.append(hallway.get_row_str(0))
-
-            rows += ([""] * Area.UNIT_HEIGHT)  # initialize the new "block" of rows with empty strings
-            for area in areas:
-                for ry in range(Area.UNIT_HEIGHT):
-                    rows[offset + ry] += area.get_row_str(ry)
-            rows.append(Area.void().get_img().join(south_hallways))
-            offset += Area.UNIT_HEIGHT + 1
+                if not last_col:
+                    hallway = room.get_hallway(Direction.East, throw_error=False)
+                    if hallway is None:
+                        areas.append(Placeholder.vertical())
+                    else:
+                        areas.append(hallway)
+                if not last_row:
+                    hallway = room.get_hallway(Direction.South, throw_error=False)
+                    if hallway is None:
+                        south_hallways.append(Placeholder.horizontal())
+                    else:
+                        south_hallways.append(hallway)
+
+        area_rows = [area.get_rows(revealed) for area in areas]
+        south_rows = [hallway.get_rows(revealed)[0] for hallway in south_hallways]
+        # get_rows() re-rendered the dirty Areas, so their versions tell us whether the block changed
+        signature = (room_x, width, east_border, south_border) + tuple([(area.area_id, area.render_version)
+                                                                        for area in areas + south_hallways])
+        cached = self.__block_cache.get(y)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        rows = ["".join([rows[ry] for rows in area_rows]) for ry in range(Area.UNIT_HEIGHT)]
+        corner = Area.void().get_img()
+        rows.append(corner.join(south_rows) + (corner if east_border and not last_row else ""))
+        self.__block_cache[y] = (signature, rows)
         return rows
 
+    def row_strings(self, room_x: int = 0, room_y: int = 0, width: int = None, height: int = None) -> List[str]:
+        """
+        :return: the rendered rows of the given window of Rooms, by default the whole Map (see stream_rows())
+        """
+        return list(self.stream_rows(room_x, room_y, width, height))
+
     def __str__(self):
         return "\n".join(self.row_strings())
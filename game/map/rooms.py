@@ -1,12 +1,13 @@
 import math
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from game.logic.instruction import Instruction
 from game.map.navigation import Coordinate
 from game.map.tiles import *
 from game.map.tiles import Enemy as EnemyTile
+from game.map.visibility import VisibilityMap
 from util.config import Config
-from util.my_random import RandomManager as RM
+from util.my_random import RandomManager as RM, SeedSequence
 from widgets.my_popups import CommonQuestions
 
 
@@ -29,6 +30,7 @@ class Area(ABC):
     __ID = 1
     __FOG = FogOfWar()
     __VOID = Void()
+    __INVALID = Invalid()
     UNIT_WIDTH = 7
     UNIT_HEIGHT = 7
     MID_X = int(UNIT_WIDTH / 2)
@@ -47,25 +49,54 @@ class Area(ABC):
         self.__width = len(tile_matrix[0])
         self.__height = len(tile_matrix)
 
-        self.__is_in_sight = False
-        self.__is_visible = False
-        self.__was_visited = False
+        # the Area's own state is only created once it changes before the Area is attached to the VisibilityMap of a Map
+        self.__visibility = None
+        self.__slot = 0
+
+        self.__rows = None  # cached result of get_rows()
+        self.__rows_key = None
+        self.__render_version = 0
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Areas restored from a snapshot keep their id, so new Areas must not get it again
+        Area.__ID = max(Area.__ID, self.__id + 1)
 
     @property
     def _id(self) -> int:
         return self.__id
 
     @property
-    def _is_visible(self) -> bool:
-        return self.__is_visible or CheatConfig.revealed_map()
+    def area_id(self) -> int:
+        """
+        :return: number that identifies the Area, unlike id() it is never reused for another Area
+        """
+        return self.__id
 
     @property
-    def _is_visible_value(self) -> bool:
-        return self.__is_visible
+    def _is_visible(self) -> bool:
+        return self.__visibility is not None and self.__visibility.is_visible(self.__slot)
 
     @property
     def _is_in_sight(self) -> bool:
-        return self.__is_in_sight
+        return self.__visibility is not None and self.__visibility.is_in_sight(self.__slot)
+
+    def attach_visibility(self, visibility: VisibilityMap, slot: int):
+        """
+        Moves the Area's visibility state into the given VisibilityMap (e.g. the one of the Map the Area belongs to).
+
+        :param visibility: the VisibilityMap to store the state in from now on
+        :param slot: the Area's slot in visibility
+        """
+        if self.__visibility is not None:
+            visibility.add(slot, self.__visibility.get(self.__slot))
+        self.__visibility = visibility
+        self.__slot = slot
+
+    def __add_visibility(self, flags: int):
+        if self.__visibility is None:
+            self.__visibility = VisibilityMap()
+        self.__visibility.add(self.__slot, flags)
 
     @property
     def type(self) -> AreaType:
@@ -81,6 +112,7 @@ class Area(ABC):
         """
         if 0 <= x < Area.UNIT_WIDTH and 0 <= y < Area.UNIT_HEIGHT:
             self.__tiles[y][x] = tile
+            self.mark_dirty()
             return True
         return False
 
@@ -101,32 +133,68 @@ class Area(ABC):
                 else:
                     return Area.void()
         else:
-            return Invalid()
+            return Area.__INVALID
 
-    def get_row_str(self, row: int) -> str:
-        if row >= len(self.__tiles):
-            return "".join([Invalid().get_img()] * Area.UNIT_WIDTH)
+    @property
+    def render_version(self) -> int:
+        """
+        :return: a number that changes every time the Area's rows are rendered anew
+        """
+        return self.__render_version
 
-        if self._is_visible:
-            tiles = [t.get_img() for t in self.__tiles[row]]
-            return "".join(tiles)
+    def mark_dirty(self):
+        """
+        Drops the cached rows so they are rendered anew the next time they are needed. Has to be called whenever one of
+        the Area's Tiles changes its image (e.g. a defeated Enemy or a picked up Collectible).
+        """
+        self.__rows = None
+
+    def _render_key(self, revealed: bool):
+        """
+        :param revealed: whether the whole Map is revealed (e.g. by a cheat) or not
+        :return: the state besides the Tiles the rendered rows depend on, if it changes the rows are rendered anew
+        """
+        if revealed or self._is_visible:
+            return 2
+        elif self._is_in_sight:
+            return 1
+        return 0
+
+    def _render_rows(self, revealed: bool) -> List[str]:
+        if revealed or self._is_visible:
+            return ["".join([t.get_img() for t in row]) for row in self.__tiles]
         elif self._is_in_sight:
-            fog_str = Area.__FOG.get_img()
-            return fog_str * self.__width
+            return [Area.__FOG.get_img() * self.__width] * self.__height
         else:
-            void_str = Area.__VOID.get_img()
-            return void_str * self.__width
+            return [Area.__VOID.get_img() * self.__width] * self.__height
+
+    def get_rows(self, revealed: bool = False) -> List[str]:
+        """
+        Renders the Area row by row. The result is cached until the Area is marked dirty or its visibility changes.
+
+        :param revealed: whether the Area should be rendered as visible regardless of its own visibility or not
+        :return: the rendered rows of the Area
+        """
+        key = self._render_key(revealed)
+        if self.__rows is None or key != self.__rows_key:
+            self.__rows = self._render_rows(revealed)
+            self.__rows_key = key
+            self.__render_version += 1
+        return self.__rows
+
+    def get_row_str(self, row: int) -> str:
+        if row >= len(self.__tiles):
+            return Area.__INVALID.get_img() * Area.UNIT_WIDTH
+        return self.get_rows()[row]
 
     def make_visible(self):
-        self.__is_in_sight = True
-        self.__is_visible = True
+        self.__add_visibility(VisibilityMap.IN_SIGHT | VisibilityMap.VISIBLE)
 
     def in_sight(self):
-        self.__is_in_sight = True
+        self.__add_visibility(VisibilityMap.IN_SIGHT)
 
     def enter(self, direction: Direction):
-        self.__is_visible = True
-        self.__was_visited = True
+        self.__add_visibility(VisibilityMap.VISIBLE | VisibilityMap.VISITED)
 
     def leave(self, direction: Direction):
         pass
@@ -151,12 +219,18 @@ class AreaPlaceholder(Area):
     def at(self, x: int, y: int, force: bool = False) -> Tile:
         return Area.void()
 
-    def get_row_str(self, row: int) -> str:
+    def _render_key(self, revealed: bool):
+        return 0
+
+    def _render_rows(self, revealed: bool) -> List[str]:
         void_str = Area.void().get_img()
         if self.__has_full_row:
-            return void_str * Area.UNIT_WIDTH
+            return [void_str * Area.UNIT_WIDTH] * Area.UNIT_HEIGHT
         else:
-            return void_str
+            return [void_str] * Area.UNIT_HEIGHT
+
+    def get_row_str(self, row: int) -> str:
+        return self.get_rows()[row]
 
     def in_sight(self):
         pass
@@ -253,12 +327,16 @@ class Hallway(Area):
         else:
             Popup.message("Debug", "room2 is None!")
 
-    def get_row_str(self, row: int) -> str:
+    def _render_key(self, revealed: bool):
+        # the door can be opened lazily by checking its event, so its state is part of the key
+        return super(Hallway, self)._render_key(revealed), self.__door.is_open
+
+    def get_rows(self, revealed: bool = False) -> List[str]:
         if self.__hide:
             if self.__door.check_event():
                 self.make_visible()
                 self.__hide = False
-        return super(Hallway, self).get_row_str(row)
+        return super(Hallway, self).get_rows(revealed)
 
     def in_sight(self):
         if not self.__hide:
@@ -409,6 +487,74 @@ class Room(Area):
         return self.abbreviation() + str(self._id)
 
 
+class LazyRoom:
+    """
+    Cheap stand-in for a Room that is only materialized (i.e. its tiles are created) once the Map brings it into sight.
+    Until then it only knows its Hallways and how to build the real Room.
+    """
+
+    def __init__(self, build_callback: Callable[[Dict[Direction, Hallway]], Room],
+                 hallways: Dict[Direction, Hallway]):
+        """
+
+        :param build_callback: creates the real Room for the given Hallways
+        :param hallways: the Hallways of the Room, None for Directions without Hallway
+        """
+        self.__build = build_callback
+        self.__hallways = hallways
+        self.__room = None
+        self.__visibility = None    # VisibilityMap and slot to pass on to the real Room
+        self.__slot = 0
+        # register at the Hallways so bringing them into sight also materializes us
+        for direction in hallways:
+            if hallways[direction] is not None:
+                hallways[direction].set_room(self, direction)
+
+    @property
+    def room(self) -> Optional[Room]:
+        """
+
+        :return: the real Room or None if it was not materialized yet
+        """
+        return self.__room
+
+    @property
+    def is_materialized(self) -> bool:
+        return self.__room is not None
+
+    def materialize(self) -> Room:
+        if self.__room is None:
+            # the Room's constructor registers the real Room at its Hallways and therefore replaces us there
+            self.__room = self.__build(self.__hallways)
+            self.__build = None
+            if self.__visibility is not None:
+                self.__room.attach_visibility(self.__visibility, self.__slot)
+        return self.__room
+
+    def attach_visibility(self, visibility: VisibilityMap, slot: int):
+        if self.__room is None:
+            self.__visibility = visibility
+            self.__slot = slot
+        else:
+            self.__room.attach_visibility(visibility, slot)
+
+    def get_hallway(self, direction: Direction, throw_error: bool = True) -> Hallway:
+        if self.__room is not None:
+            return self.__room.get_hallway(direction, throw_error)
+        return self.__hallways.get(direction, None)
+
+    def in_sight(self):
+        self.materialize().in_sight()
+
+    def make_visible(self):
+        self.materialize().make_visible()
+
+    def __str__(self) -> str:
+        if self.__room is None:
+            return "LR?"
+        return str(self.__room)
+
+
 class CopyAbleRoom(Room, ABC):
     @abstractmethod
     def copy(self, hw_dic: Dict[Direction, Hallway]) -> "CopyAbleRoom":
@@ -503,7 +649,7 @@ class MetaRoom(CopyAbleRoom):
         else:
             raise SyntaxError("Room without hallway!")
 
-        if self._is_visible_value:
+        if self._is_visible:
             # don't use Room's implementation but Area's
             super(CopyAbleRoom, new_room).make_visible()
         elif self._is_in_sight:
@@ -533,7 +679,7 @@ class CustomRoom(CopyAbleRoom):
         else:
             new_room = CustomRoom(self.type, self.__tile_matrix)   # todo not sure if rooms without hallways should be legal
 
-        if self._is_visible_value:
+        if self._is_visible:
             # don't use Room's implementation but Area's
             super(Room, new_room).make_visible()
         elif self._is_in_sight:
@@ -630,7 +776,8 @@ class WildRoom(BaseWildRoom):
     __NUM_OF_ENEMY_GROUPS = 4
 
     def __init__(self, factory: EnemyFactory, chance: float = 0.6, north_hallway: Hallway = None,
-                 east_hallway: Hallway = None, south_hallway: Hallway = None, west_hallway: Hallway = None):
+                 east_hallway: Hallway = None, south_hallway: Hallway = None, west_hallway: Hallway = None,
+                 seeds: SeedSequence = None):
         """
 
         :param factory:
@@ -639,9 +786,15 @@ class WildRoom(BaseWildRoom):
         :param south_door: the Door connecting to the Room to the South of this one
         :param west_door: whether the Room to the West is having an east_door or not
         :param north_door:  whether the Room to the North is having a south_door or not
+        :param seeds: randomness of the Room and its EnemyTiles, if None the Room and every EnemyTile draw a new seed
+        from the RandomManager. Given seeds make the Room independent of when it is created (e.g. when it is
+        materialized lazily).
         """
         self.__dictionary = { 1: [], 2: [], 3: [], 4: [], 5: [], 6: [], 7: [], 8: [], 9: [] }
-        rm = RM.create_new()
+        if seeds is None:
+            rm = RM.create_new()
+        else:
+            rm = seeds.random()
 
         available_positions = []
         for y in range(Room.INNER_HEIGHT):
@@ -657,10 +810,15 @@ class WildRoom(BaseWildRoom):
         tile_list = Room.get_empty_room_tile_list()
         for i in range(num_of_enemies):
             id = rm.get_int(min=0, max=WildRoom.__NUM_OF_ENEMY_GROUPS + 1)
-            enemy = EnemyTile(factory, self.__get_tiles_by_id, id)
+            if seeds is None:
+                # the EnemyTile draws its seed before the position is drawn, like it always did
+                enemy = EnemyTile(factory, self.__get_tiles_by_id, id)
+                pos = rm.get_element(available_positions, remove=True)
+            else:
+                pos = rm.get_element(available_positions, remove=True)
+                enemy = EnemyTile(factory, self.__get_tiles_by_id, id, rm=seeds.spawn(pos.x, pos.y).random())
             if id > 0:
                 self.__dictionary[id].append(enemy)
-            pos = rm.get_element(available_positions, remove=True)
             tile_list[Room.coordinate_to_index(pos)] = enemy
 
         super().__init__(tile_list, self.__get_tiles_by_id, north_hallway, east_hallway, south_hallway, west_hallway)
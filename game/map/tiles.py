@@ -13,7 +13,7 @@ from game.collectibles.pickup import Energy as LogicalEnergy
 from game.map.navigation import Direction, Coordinate
 from util.config import CheatConfig
 from util.logger import Logger
-from util.my_random import RandomManager
+from util.my_random import RandomManager, MyRandom
 from widgets.my_popups import Popup, CommonPopups
 
 
@@ -50,6 +50,8 @@ class TileCode(Enum):
 
 
 class Tile(ABC):
+    __slots__ = ("__code",)
+
     @staticmethod
     def _invisible_tile():
         return " "
@@ -77,7 +79,25 @@ class Tile(ABC):
         return self.get_img()
 
 
+class StaticTile(Tile, ABC):
+    """
+    Tile without any state of its own (e.g. Floor or Wall). All instances of such a class would be identical, so the
+    constructor always returns the one shared instance of the class instead of allocating a new one.
+    """
+    __slots__ = ()
+    __instances = {}
+
+    def __new__(cls):
+        instance = StaticTile.__instances.get(cls)
+        if instance is None:
+            instance = super().__new__(cls)
+            StaticTile.__instances[cls] = instance
+        return instance
+
+
 class WalkTriggerTile(Tile):
+    __slots__ = ("__event_id",)
+
     def __init__(self, code: TileCode):
         super().__init__(code)
         self.__event_id = None
@@ -106,7 +126,9 @@ class WalkTriggerTile(Tile):
         pass
 
 
-class Invalid(Tile):
+class Invalid(StaticTile):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(TileCode.Invalid)
 
@@ -118,6 +140,8 @@ class Invalid(Tile):
 
 
 class Debug(Tile):
+    __slots__ = ("__num",)
+
     def __init__(self, num: int):
         super(Debug, self).__init__(TileCode.Debug)
         self.__num = str(num)[0]
@@ -129,7 +153,9 @@ class Debug(Tile):
         return False
 
 
-class Void(Tile):
+class Void(StaticTile):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(TileCode.Floor)
 
@@ -140,7 +166,9 @@ class Void(Tile):
         return False
 
 
-class Floor(Tile):
+class Floor(StaticTile):
+    __slots__ = ()
+
     @staticmethod
     def img():
         return Tile._invisible_tile()
@@ -155,7 +183,9 @@ class Floor(Tile):
         return True
 
 
-class Wall(Tile):
+class Wall(StaticTile):
+    __slots__ = ()
+
     @staticmethod
     def img():
         return "#"
@@ -170,7 +200,9 @@ class Wall(Tile):
         return False
 
 
-class Obstacle(Tile):
+class Obstacle(StaticTile):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(TileCode.Obstacle)
 
@@ -181,7 +213,9 @@ class Obstacle(Tile):
         return False
 
 
-class FogOfWar(Tile):
+class FogOfWar(StaticTile):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(TileCode.Obstacle)
 
@@ -193,6 +227,8 @@ class FogOfWar(Tile):
 
 
 class Decoration(Tile):
+    __slots__ = ("__decoration", "__blocking")
+
     def __init__(self, decoration: str, blocking: bool = False):
         super(Decoration, self).__init__(TileCode.Decoration)
         self.__decoration = decoration
@@ -206,6 +242,8 @@ class Decoration(Tile):
 
 
 class Trigger(WalkTriggerTile):
+    __slots__ = ("__callback",)
+
     def __init__(self, callback: Callable[[Direction, Controllable], None]):
         super().__init__(TileCode.Trigger)
         self.__callback = callback
@@ -218,6 +256,8 @@ class Trigger(WalkTriggerTile):
 
 
 class Teleport(WalkTriggerTile):
+    __slots__ = ("__callback", "__target_map", "__room")
+
     def __init__(self, callback: Callable[[str, Coordinate], None], target_map: str, room: Coordinate):
         super().__init__(TileCode.Teleport)
         self.__callback = callback
@@ -232,6 +272,8 @@ class Teleport(WalkTriggerTile):
 
 
 class Message(WalkTriggerTile):
+    __slots__ = ("__popup", "__times")
+
     @staticmethod
     def create(msg: str, title: str = "Message", popup_times: int = 1) -> "Message":
         popup = Popup(title, msg, show=False)
@@ -260,6 +302,8 @@ class Message(WalkTriggerTile):
 
 
 class Riddler(WalkTriggerTile):
+    __slots__ = ("__open_riddle", "__riddle")
+
     def __init__(self, open_riddle_callback: "void(Player, Riddle)", riddle: Riddle):
         super().__init__(TileCode.Riddler)
         self.__open_riddle = open_riddle_callback
@@ -277,6 +321,8 @@ class Riddler(WalkTriggerTile):
 
 
 class ShopKeeper(WalkTriggerTile):
+    __slots__ = ("__visit_shop", "__inventory")
+
     def __init__(self, visit_shop_callback, inventory: "List[ShopItem]"):
         super().__init__(TileCode.ShopKeeper)
         self.__visit_shop = visit_shop_callback
@@ -299,6 +345,8 @@ class DoorOneWayState(Enum):
     Temporary = 1
     Permanent = 2
 class Door(WalkTriggerTile):
+    __slots__ = ("__direction", "__open_state", "__one_way_state", "__event_id", "__check_event")
+
     def __init__(self, direction: Direction, open_state: DoorOpenState = DoorOpenState.Closed,
                  one_way_state: DoorOneWayState = DoorOneWayState.NoOneWay, event_id: str = None):
         super().__init__(TileCode.Door)
@@ -422,6 +470,8 @@ class Door(WalkTriggerTile):
 
 
 class EntangledDoor(Door):
+    __slots__ = ("__entangled_doors", "__entanglement_locked")
+
     @staticmethod
     def entangle(door1: "EntangledDoor", door2: "EntangledDoor"):
         door1.__entangled_doors.append(door2)
@@ -448,6 +498,8 @@ class EntangledDoor(Door):
 
 
 class HallwayEntrance(Tile):
+    __slots__ = ("__door_ref",)
+
     def __init__(self, door_ref: Door):
         super().__init__(TileCode.HallwayEntrance)
         self.__door_ref = door_ref
@@ -462,6 +514,8 @@ class HallwayEntrance(Tile):
 
 
 class Collectible(WalkTriggerTile):
+    __slots__ = ("__collectible", "__active")
+
     def __init__(self, collectible: LogicalCollectible):
         super().__init__(TileCode.Collectible)
         self.__collectible = collectible
@@ -486,6 +540,8 @@ class Collectible(WalkTriggerTile):
 
 
 class Energy(WalkTriggerTile):
+    __slots__ = ("__amount", "__active")
+
     def __init__(self, amount: int):
         super().__init__(TileCode.Energy)
         self.__amount = amount
@@ -507,6 +563,8 @@ class Energy(WalkTriggerTile):
 
 
 class ControllableTile(Tile):
+    __slots__ = ("__controllable",)
+
     def __init__(self, controllable: Controllable):
         super().__init__(TileCode.Controllable)
         self.__controllable = controllable
@@ -529,14 +587,27 @@ class _EnemyState(Enum):
     DEAD = 3
     FLED = 4
 class Enemy(WalkTriggerTile):
-    def __init__(self, factory: EnemyFactory, get_entangled_tiles, id: int = 0, amplitude: float = 0.5):
+    __slots__ = ("__factory", "__state", "__get_entangled_tiles", "__id", "__amplitude", "__rm")
+
+    def __init__(self, factory: EnemyFactory, get_entangled_tiles, id: int = 0, amplitude: float = 0.5,
+                 rm: MyRandom = None):
+        """
+
+        :param factory: produces the actual enemy when a fight is started
+        :param get_entangled_tiles: returns all Enemy tiles entangled with the given id
+        :param id: entanglement id of this tile (0 means not entangled)
+        :param amplitude: probability of the enemy to fight instead of flee
+        :param rm: seeded randomness of this tile, if None a new one is drawn from the RandomManager
+        """
         super().__init__(TileCode.Enemy)
         self.__factory = factory
         self.__state = _EnemyState.UNDECIDED
         self.__get_entangled_tiles = get_entangled_tiles
         self.__id = id
         self.__amplitude = amplitude
-        self.__rm = RandomManager.create_new()
+        if rm is None:
+            rm = RandomManager.create_new()
+        self.__rm = rm
 
     def is_walkable(self, direction: Direction, controllable: Controllable) -> bool:
         if isinstance(controllable, Robot):
@@ -626,6 +697,8 @@ class Enemy(WalkTriggerTile):
 
 
 class Boss(WalkTriggerTile):
+    __slots__ = ("__boss", "__on_walk_callback")
+
     def __init__(self, boss: BossActor, on_walk_callback: Callable[[Robot, BossActor, Direction], None]):
         super().__init__(TileCode.Boss)
         self.__boss = boss
@@ -81,6 +81,8 @@ class TutorialEnemyFactory(EnemyFactory):
 
 
 class TutorialTile(tiles.Message):
+    __slots__ = ("__id", "__is_active", "__progress", "__blocks")
+
     def __init__(self, popup: Popup, tid: int, is_active_callback: "bool(int)", progress_callback: "()" = None,
                  blocks: bool = False):
         super().__init__(popup, popup_times=1)
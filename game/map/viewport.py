@@ -0,0 +1,92 @@
+from typing import List
+
+from game.map.map import Map
+from game.map.navigation import Coordinate
+from game.map.rooms import Area
+
+
+class Viewport:
+    """
+    Camera over a Map that only renders the rectangle (in characters) that fits into the widget showing the Map. The
+    rectangle follows a position (e.g. the controllable's) and only scrolls if the position leaves the inner part of
+    the Viewport, so the Map doesn't jump around on every step.
+    """
+    # the size of a normal level which is also used until the Viewport is resized to the widget's size
+    DEFAULT_WIDTH = Map.MAX_WIDTH * (Area.UNIT_WIDTH + 1) - 1
+    DEFAULT_HEIGHT = Map.MAX_HEIGHT * (Area.UNIT_HEIGHT + 1) - 1
+
+    def __init__(self, width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT):
+        self.__x = 0
+        self.__y = 0
+        self.__width = width
+        self.__height = height
+
+    @property
+    def x(self) -> int:
+        return self.__x
+
+    @property
+    def y(self) -> int:
+        return self.__y
+
+    @property
+    def width(self) -> int:
+        return self.__width
+
+    @property
+    def height(self) -> int:
+        return self.__height
+
+    def resize(self, width: int, height: int):
+        """
+        Changes the size of the Viewport. Non-positive sizes (e.g. of a widget that wasn't laid out yet) are ignored.
+
+        :param width: number of characters that fit into one row
+        :param height: number of rows that fit into the widget
+        """
+        if width > 0:
+            self.__width = width
+        if height > 0:
+            self.__height = height
+
+    def reset(self):
+        self.__x = 0
+        self.__y = 0
+
+    @staticmethod
+    def __scroll(start: int, size: int, pos: int, full_size: int) -> int:
+        """
+        :param start: current start of the Viewport along one axis
+        :param size: size of the Viewport along the axis
+        :param pos: position to follow along the axis
+        :param full_size: size of the Map along the axis
+        :return: new start of the Viewport so pos lies within its inner part and the Viewport doesn't exceed the Map
+        """
+        if full_size <= size:
+            return 0
+        margin = size // 4
+        if pos < start + margin:
+            start = pos - margin
+        elif start + size - 1 - margin < pos:
+            start = pos - size + 1 + margin
+        return max(0, min(start, full_size - size))
+
+    def follow(self, pos: Coordinate, full_width: int, full_height: int):
+        self.__x = Viewport.__scroll(self.__x, self.__width, pos.x, full_width)
+        self.__y = Viewport.__scroll(self.__y, self.__height, pos.y, full_height)
+
+    def render(self, map: Map) -> List[str]:
+        """
+        Lets the Viewport follow the controllable and renders the visible part of the Map with the controllable on top.
+
+        :param map: the Map to render
+        :return: the rendered rows of the visible part of the Map
+        """
+        pos = map.controllable_pos
+        self.follow(pos, map.full_width, map.full_height)
+        rows = map.render_section(self.__x, self.__y, self.__width, self.__height)
+        x = pos.x - self.__x
+        y = pos.y - self.__y
+        if 0 <= y < len(rows) and 0 <= x < len(rows[y]):
+            rows[y] = rows[y][0:x] + map.controllable_tile.get_img() + rows[y][x + 1:]
+        return rows
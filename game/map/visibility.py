@@ -0,0 +1,105 @@
+class VisibilityMap:
+    """
+    Compact storage of the visibility state (fog of war) of all Areas of a Map. Every position of a Room has three
+    slots: one for the Room itself, one for its Hallway to the east and one for its Hallway to the south. The state of
+    a slot is a combination of the flags below stored in a single byte.
+
+    Areas that don't belong to a Map yet only create a VisibilityMap of their own once their state changes and move it
+    into the Map's once it is created (see Area.attach_visibility()).
+    """
+    IN_SIGHT = 1
+    VISIBLE = 2
+    VISITED = 4
+
+    ROOM = 0
+    EAST_HALLWAY = 1
+    SOUTH_HALLWAY = 2
+    __SLOTS_PER_ROOM = 3
+
+    # translation tables for the bulk operations that add or remove IN_SIGHT and VISIBLE (= 3)
+    __REVEAL = bytes([state | 3 for state in range(256)])
+    __HIDE = bytes([state & ~3 for state in range(256)])
+
+    def __init__(self, width: int = 1, height: int = 1):
+        """
+
+        :param width: number of Rooms in a row
+        :param height: number of Rooms in a column
+        """
+        self.__width = width
+        self.__height = height
+        self.__flags = bytearray(width * height * VisibilityMap.__SLOTS_PER_ROOM)
+
+    @property
+    def width(self) -> int:
+        return self.__width
+
+    @property
+    def height(self) -> int:
+        return self.__height
+
+    def slot(self, x: int, y: int, part: int = ROOM) -> int:
+        """
+        :param x: horizontal position of the Room
+        :param y: vertical position of the Room
+        :param part: ROOM, EAST_HALLWAY or SOUTH_HALLWAY
+        :return: the slot of the given part of the Room
+        """
+        return (y * self.__width + x) * VisibilityMap.__SLOTS_PER_ROOM + part
+
+    def get(self, slot: int) -> int:
+        return self.__flags[slot]
+
+    def add(self, slot: int, flags: int):
+        self.__flags[slot] |= flags
+
+    def is_in_sight(self, slot: int) -> bool:
+        return self.__flags[slot] & VisibilityMap.IN_SIGHT != 0
+
+    def is_visible(self, slot: int) -> bool:
+        return self.__flags[slot] & VisibilityMap.VISIBLE != 0
+
+    def was_visited(self, slot: int) -> bool:
+        return self.__flags[slot] & VisibilityMap.VISITED != 0
+
+    def is_room_visible(self, x: int, y: int) -> bool:
+        return self.is_visible(self.slot(x, y))
+
+    def is_room_in_sight(self, x: int, y: int) -> bool:
+        return self.is_in_sight(self.slot(x, y))
+
+    def __rect_slices(self, x: int, y: int, width: int, height: int):
+        # the end of the rectangle has to be computed before its origin is clipped to the Map
+        stop_x, stop_y = min(x + width, self.__width), min(y + height, self.__height)
+        x, y = max(0, x), max(0, y)
+        for row in range(y, stop_y):
+            if x < stop_x:
+                yield slice(self.slot(x, row), self.slot(stop_x, row))
+
+    def reveal(self, x: int = 0, y: int = 0, width: int = None, height: int = None):
+        """
+        Makes the Rooms in the given rectangle and their Hallways to the east and south visible. By default the whole
+        Map is revealed.
+        """
+        if width is None:
+            width = self.__width
+        if height is None:
+            height = self.__height
+        for rect_slice in self.__rect_slices(x, y, width, height):
+            self.__flags[rect_slice] = self.__flags[rect_slice].translate(VisibilityMap.__REVEAL)
+
+    def hide(self, x: int = 0, y: int = 0, width: int = None, height: int = None):
+        """
+        Covers the Rooms in the given rectangle and their Hallways to the east and south with fog again. Visited Areas
+        stay marked as visited. By default the whole Map is hidden.
+        """
+        if width is None:
+            width = self.__width
+        if height is None:
+            height = self.__height
+        for rect_slice in self.__rect_slices(x, y, width, height):
+            self.__flags[rect_slice] = self.__flags[rect_slice].translate(VisibilityMap.__HIDE)
+
+    def count_visible_rooms(self) -> int:
+        return sum(1 for i in range(0, len(self.__flags), VisibilityMap.__SLOTS_PER_ROOM)
+                   if self.__flags[i] & VisibilityMap.VISIBLE)
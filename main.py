@@ -1,15 +1,31 @@
 #D:\Programs\anaconda3\envs\Qrogue
 # This is a sample Python script.
+import os
 import random
 import sys
 
 from game.game import GameHandler
-from util.config import Config
+from game.keylog_benchmark import run_benchmark
+from game.keylog_regression import run_regression
+from util.binary_keylog import BinaryKeyLog
+from util.config import Config, GameplayConfig
+from util.log_analysis import analyze_archive
 from util.logger import Logger
 
 
 __CONSOLE_ARGUMENT = "--from-console"
 __DEBUG_ARGUMENT = "--debug"
+__REPLAY_ARGUMENT = "--replay"     # followed by the path of the .qrkl- or .qrkb-file to replay headless
+__REGRESSION_ARGUMENT = "--regression"     # followed by a folder whose .qrkl-files are replayed in parallel
+__SEEK_ARGUMENT = "--seek"     # (optional with --replay) followed by the number of keys after which the replay stops
+__SNAPSHOTS_ARGUMENT = "--snapshots"   # (optional with --replay) followed by the min. keys between two snapshots
+__CONVERT_ARGUMENT = "--convert"   # followed by the path of a .qrkl-file to convert into a binary .qrkb-file
+__BENCHMARK_ARGUMENT = "--benchmark"   # followed by the path of a .qrkl- or .qrkb-file to replay as a benchmark
+__RUNS_ARGUMENT = "--runs"     # (optional with --benchmark) followed by how often the keylog is replayed
+__BASELINE_ARGUMENT = "--baseline"     # (optional with --benchmark) followed by the .csv-file to compare with
+__ANALYZE_ARGUMENT = "--analyze"   # followed by a folder whose keylogs and logs are summarized and the output .csv-file
+__LARGE_DUNGEON_ARGUMENT = "--large-dungeon"   # followed by the number of Rooms per row and column of the random
+                                               # dungeons that replace the levels (overrides the GameplayConfig)
 
 note = """
 Climate Crisis Narrative? E.g. the game plays on earth in 2070, most places have been destroyed 
@@ -18,25 +34,65 @@ The goal is to find parts of a Quantum Computer (inspiration from Entanglion) so
 turn back time so we can "stop" the climate crisis and live on a healthy planet?
 """
 
-return_code = Config.load()     # NEEDS TO BE THE FIRST THING WE DO!
-if return_code == 0:
-    if __DEBUG_ARGUMENT in sys.argv:
-        Config.activate_debugging()
-    seed = random.randint(0, Config.MAX_SEED)
-    print(f"[Qrogue] Starting game with seed = {seed}")
-    game = GameHandler(seed)
-    game.start()
+# guarded since the worker processes of the regression runner may import this module again
+if __name__ == "__main__":
+    return_code = Config.load()     # NEEDS TO BE THE FIRST THING WE DO!
+    if return_code == 0:
+        if __DEBUG_ARGUMENT in sys.argv:
+            Config.activate_debugging()
+        if __LARGE_DUNGEON_ARGUMENT in sys.argv:
+            GameplayConfig.set_large_dungeon_size(int(sys.argv[sys.argv.index(__LARGE_DUNGEON_ARGUMENT) + 1]))
+        if __REGRESSION_ARGUMENT in sys.argv:
+            run_regression(sys.argv[sys.argv.index(__REGRESSION_ARGUMENT) + 1])
+        elif __BENCHMARK_ARGUMENT in sys.argv:
+            runs = 5
+            if __RUNS_ARGUMENT in sys.argv:
+                runs = int(sys.argv[sys.argv.index(__RUNS_ARGUMENT) + 1])
+            baseline = None
+            if __BASELINE_ARGUMENT in sys.argv:
+                baseline = sys.argv[sys.argv.index(__BASELINE_ARGUMENT) + 1]
+            if not run_benchmark(sys.argv[sys.argv.index(__BENCHMARK_ARGUMENT) + 1], runs, baseline):
+                print("[Qrogue] At least one phase is slower than the baseline!")
+        elif __ANALYZE_ARGUMENT in sys.argv:
+            index = sys.argv.index(__ANALYZE_ARGUMENT)
+            if len(sys.argv) <= index + 2 or sys.argv[index + 1].startswith("--") or \
+                    sys.argv[index + 2].startswith("--"):
+                print(f"[Qrogue] Usage: main.py {__ANALYZE_ARGUMENT} <folder with keylogs and logs> <output .csv-file>")
+            elif not os.path.isdir(sys.argv[index + 1]):
+                print(f"[Qrogue] \"{sys.argv[index + 1]}\" is not a folder!")
+            else:
+                analyze_archive(sys.argv[index + 1], sys.argv[index + 2])
+        elif __CONVERT_ARGUMENT in sys.argv:
+            path = BinaryKeyLog.convert(sys.argv[sys.argv.index(__CONVERT_ARGUMENT) + 1], in_keylog_folder=False)
+            print(f"[Qrogue] Converted the keylog to {path}")
+        else:
+            if __REPLAY_ARGUMENT in sys.argv:
+                path = sys.argv[sys.argv.index(__REPLAY_ARGUMENT) + 1]
+                seek = None
+                if __SEEK_ARGUMENT in sys.argv:
+                    seek = int(sys.argv[sys.argv.index(__SEEK_ARGUMENT) + 1])
+                snapshot_interval = 0
+                if __SNAPSHOTS_ARGUMENT in sys.argv:
+                    snapshot_interval = int(sys.argv[sys.argv.index(__SNAPSHOTS_ARGUMENT) + 1])
+                print(f"[Qrogue] Replaying {path}")
+                print(GameHandler.replay(path, in_keylog_folder=False, seek=seek, snapshot_interval=snapshot_interval))
+            else:
+                seed = random.randint(0, Config.MAX_SEED)
+                print(f"[Qrogue] Starting game with seed = {seed}")
+                game = GameHandler(seed)
+                game.start()
 
-    # flush after the player stopped playing
-    Logger.instance().flush()
-    print("[Qrogue] Successfully flushed all logs and shut down the game without any problems. See you next time!")
-else:
-    print(f"[Qrogue] Error #{return_code}:")
-    if return_code == 1:
-        print("qrogue.config is invalid. Please check if the second line describes a valid path (the path "
-          "to your save files). Using special characters in the path could also cause this error so if the path is "
-          "valid please consider using another one without special characters.")
+            # flush after the player stopped playing
+            Logger.instance().flush(wait=True)
+            print("[Qrogue] Successfully flushed all logs and shut down the game without any problems. See you next "
+                  "time!")
+    else:
+        print(f"[Qrogue] Error #{return_code}:")
+        if return_code == 1:
+            print("qrogue.config is invalid. Please check if the second line describes a valid path (the path "
+              "to your save files). Using special characters in the path could also cause this error so if the path is "
+              "valid please consider using another one without special characters.")
 
-if __CONSOLE_ARGUMENT not in sys.argv:
-    print()
-    input("[Qrogue] Press ENTER to close the application")
+    if __CONSOLE_ARGUMENT not in sys.argv:
+        print()
+        input("[Qrogue] Press ENTER to close the application")
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import threading
+
+from util.background_writer import BackgroundWriter
+from util.config import PathConfig
+
+file_write = PathConfig.write
+writes = []                     # the writes that actually reached PathConfig
+busy = threading.Event()        # set as soon as the writer thread is in its first write
+release = threading.Event()     # the writer thread waits for it in its first write
+fail_for = set()                # file names whose next write fails
+
+
+def write(file_name: str, text: str, may_exist: bool = True, append: bool = False, newline: str = None):
+    if len(writes) == 0:
+        busy.set()
+        release.wait()
+    writes.append((os.path.basename(file_name), text))
+    if file_name in fail_for:
+        fail_for.remove(file_name)
+        raise OSError("disk full")
+    file_write(file_name, text, may_exist, append, newline)
+
+
+def read(path: str) -> str:
+    with open(path, newline="") as file:
+        return file.read()
+
+
+PathConfig.write = write
+with tempfile.TemporaryDirectory() as folder:
+    # absolute paths are not joined with the base path
+    log, trace = os.path.join(folder, "run.qrlog"), os.path.join(folder, "run.qrft")
+    writer = BackgroundWriter.instance()
+    assert BackgroundWriter.instance() is writer
+
+    # while the thread is busy with the first write, the following ones are queued
+    writer.write(log, "a")
+    busy.wait()
+    for text in ["b", "c", "d"]:
+        writer.write(log, text)
+    writer.write(trace, "1\r\n", newline="")
+    writer.write(log, "e\n")
+    writer.write(log, "f\n", newline="")    # cannot be combined because its line endings are translated differently
+    release.set()
+    writer.flush()
+    # consecutive writes to the same file are combined into one, otherwise the order is kept
+    assert writes == [("run.qrlog", "a"), ("run.qrlog", "bcd"), ("run.qrft", "1\r\n"), ("run.qrlog", "e\n"),
+                      ("run.qrlog", "f\n")], writes
+    assert read(log) == "abcde" + os.linesep + "f\n"
+    assert read(trace) == "1\r\n"
+
+    # a failing write doesn't stop the thread, so flushing still returns
+    fail_for.add(trace)
+    writer.write(trace, "2\r\n", newline="")
+    writer.flush()
+    writer.write(trace, "3\r\n", newline="")
+    writer.flush()
+    assert read(trace) == "1\r\n3\r\n"
+
+    # stop() writes everything that is still queued, afterwards writes happen right away
+    writes.clear()
+    busy.clear()
+    release.clear()
+    writer.write(log, "g")
+    busy.wait()
+    writer.write(log, "h")
+    release.set()
+    writer.stop()
+    assert writes == [("run.qrlog", "g"), ("run.qrlog", "h")], writes
+    writer.write(log, "i")
+    assert read(log).endswith("ghi")
+    writer.flush()
+PathConfig.write = file_write
+print("the background writer keeps the order of writes and combines consecutive ones")
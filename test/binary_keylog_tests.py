@@ -0,0 +1,29 @@
+import random
+
+from util.binary_keylog import BinaryKeyLog
+from util.config import Config
+
+random.seed(7)
+keys = ""
+for _ in range(2000):
+    # mostly short runs like a real player produces, sometimes very long ones
+    keys += chr(random.choice([1, 2, 3, 4, 13, 15, 16, 17])) * random.choice([1, 1, 2, 3, 5, 300])
+keys += "ü\r\n"     # not a valid key but still has to survive the conversion
+text = Config.format_log_head("v0.2", 12345, "19102026_120000", "Auto reset Circuit=True\nLog Keys=True") + keys
+
+data = BinaryKeyLog.from_text(text)
+keylog = BinaryKeyLog(data)
+assert keylog.to_text() == text
+assert keylog.seed == 12345 and keylog.version == "v0.2" and keylog.log_format == Config.KEYLOG_FORMAT
+encoded_keys = keys.encode("utf-8")
+assert keylog.num_of_keys == len(encoded_keys)
+for start in [0, 1, 1023, 1024, 1025, len(encoded_keys) // 2, len(encoded_keys) - 1, len(encoded_keys)]:
+    assert bytes(keylog.codes(start)) == encoded_keys[start:], start
+
+# keylogs recorded before the keylog format was added to the head keep their format
+old_text = Config.format_log_head("v0.2", 12345, "19102026_120000", "Log Keys=True", log_format=1) + keys
+assert "Format=" not in old_text
+assert Config.parse_log_head(old_text)[4] == 1
+old_keylog = BinaryKeyLog(BinaryKeyLog.from_text(old_text))
+assert old_keylog.log_format == 1 and old_keylog.to_text() == old_text
+print(f"{len(text)} characters -> {len(data)} bytes")
@@ -0,0 +1,40 @@
+from game.map.generator import ChunkedLayoutGenerator
+from game.map.navigation import Coordinate
+
+
+def cells(layout: ChunkedLayoutGenerator, positions) -> dict:
+    result = {}
+    for x, y in positions:
+        pos = Coordinate(x, y)
+        hallways = layout.get_hallway(pos) or {}
+        result[(x, y)] = layout.get_room(pos), sorted([(neighbor.x, neighbor.y) for neighbor in hallways])
+    return result
+
+
+width, height = 40, 24
+positions = [(x, y) for y in range(height) for x in range(width)]
+for seed in range(5):
+    layout = ChunkedLayoutGenerator(seed, width, height)
+    assert layout.generate()
+    # only the chunk of the SpawnRoom is laid out right away
+    assert layout.num_of_loaded_chunks == 1 < layout.num_of_chunks
+    assert layout.in_spawn_chunk(layout.spawn_pos)
+
+    # the chunks don't depend on the order in which they are laid out
+    other = ChunkedLayoutGenerator(seed, width, height)
+    assert other.generate()
+    assert cells(layout, positions) == cells(other, reversed(positions)), seed
+    assert layout.num_of_loaded_chunks == layout.num_of_chunks
+    assert layout.check_special_rooms()
+
+    # every Room can be reached from the SpawnRoom
+    reachable = {layout.spawn_pos}
+    stack = [layout.spawn_pos]
+    while stack:
+        for neighbor in layout.get_hallway(stack.pop()) or {}:
+            if neighbor not in reachable:
+                reachable.add(neighbor)
+                stack.append(neighbor)
+    rooms = {Coordinate(x, y) for x, y in positions if layout.get_hallway(Coordinate(x, y))}
+    assert rooms == reachable, seed
+print("chunks are laid out lazily and independent of their order")
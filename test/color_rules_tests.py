@@ -0,0 +1,90 @@
+import random
+
+import py_cui
+from py_cui.colors import ColorRule
+from py_cui.debug import PyCUILogger
+
+from game.actors.controllable import ControllableType
+from game.map.tiles import TileCode
+from widgets.color_rules import CompiledColorRules, Fragment, FragmentStorage, get_color
+
+
+class Element:
+    def __init__(self, color: int, selected_color: int):
+        self.__color = color
+        self.__selected_color = selected_color
+
+    def get_color(self) -> int:
+        return self.__color
+
+    def get_selected_color(self) -> int:
+        return self.__selected_color
+
+
+def rule(regex: str, color: int, selected_color: int = None) -> ColorRule:
+    if selected_color is None:
+        selected_color = color
+    return ColorRule(regex, color, selected_color, 'contains', 'regex', None, False, logger)
+
+
+def per_rule_fragments(color_rules, element: Element, text: str, selected: bool) -> "list of [str, int]":
+    # how py_cui applies the rules: one after another, collecting the fragments of every rule that matched
+    og_color = element.get_selected_color() if selected else element.get_color()
+    meta_fragments = FragmentStorage(text, og_color)
+    for color_rule in color_rules:
+        fragments, match = color_rule.generate_fragments(element, text, text, selected)
+        if match:
+            cur_pos = 0
+            for text_fragment, color in fragments:
+                meta_fragments.append(Fragment(cur_pos, text_fragment, color))
+                cur_pos += len(text_fragment)
+    meta_fragments.sort()
+    return meta_fragments.fill_blanks()
+
+
+logger = PyCUILogger("color rules test")
+element = Element(py_cui.WHITE_ON_BLACK, py_cui.BLACK_ON_WHITE)
+
+# the rules of the MapWidget never overlap, so both ways have to produce the same fragments
+map_rules = [rule(ct.name, get_color(TileCode.Controllable)) for ct in ControllableType.values()]
+map_rules += [rule('B', get_color(TileCode.Boss)), rule(r'\d', get_color(TileCode.Enemy)),
+              rule('#', get_color(TileCode.Wall))]
+assert CompiledColorRules.can_combine(map_rules)
+compiled = CompiledColorRules(map_rules)
+rm = random.Random(7)
+lines = ["", "      ", "#####  #####", "#  M   0  #", "B", "123#TL"]
+lines += ["".join([rm.choice("# .|-_0123456789BMLTc$?!gx") for _ in range(rm.randint(1, 60))]) for _ in range(500)]
+for line in lines:
+    for selected in [False, True]:
+        og_color = element.get_selected_color() if selected else element.get_color()
+        expected = per_rule_fragments(map_rules, element, line, selected)
+        assert compiled.generate_fragments(line, selected, og_color) == expected, line
+        assert compiled.generate_fragments(line, selected, og_color) == expected, line    # from the cache
+
+# selected widgets use the selected colors of the rules
+highlight = [rule('x', py_cui.RED_ON_BLACK, py_cui.BLACK_ON_RED)]
+compiled = CompiledColorRules(highlight)
+assert compiled.generate_fragments("axb", False, py_cui.WHITE_ON_BLACK) == \
+       [["a", py_cui.WHITE_ON_BLACK], ["x", py_cui.RED_ON_BLACK], ["b", py_cui.WHITE_ON_BLACK]]
+assert compiled.generate_fragments("axb", True, py_cui.BLACK_ON_WHITE) == \
+       [["a", py_cui.BLACK_ON_WHITE], ["x", py_cui.BLACK_ON_RED], ["b", py_cui.BLACK_ON_WHITE]]
+
+# if rules overlap the one added first wins instead of both fragments being written over each other
+overlapping = [rule('ab', py_cui.RED_ON_BLACK), rule('b', py_cui.GREEN_ON_BLACK), rule('bc', py_cui.CYAN_ON_BLACK)]
+compiled = CompiledColorRules(overlapping)
+assert compiled.generate_fragments("xabcb", False, py_cui.WHITE_ON_BLACK) == \
+       [["x", py_cui.WHITE_ON_BLACK], ["ab", py_cui.RED_ON_BLACK], ["c", py_cui.WHITE_ON_BLACK],
+        ["b", py_cui.GREEN_ON_BLACK]]
+assert compiled.generate_fragments("bcab", False, py_cui.WHITE_ON_BLACK) == \
+       [["b", py_cui.GREEN_ON_BLACK], ["c", py_cui.WHITE_ON_BLACK], ["ab", py_cui.RED_ON_BLACK]]
+# py_cui on the other hand writes "b" a second time
+assert "".join([text for text, _ in per_rule_fragments(overlapping, element, "xabcb", False)]) != "xabcb"
+
+# rules that match the text's color or nothing at all don't split the text
+compiled = CompiledColorRules([rule('a', py_cui.WHITE_ON_BLACK), rule('z*', py_cui.RED_ON_BLACK)])
+assert compiled.generate_fragments("banana", False, py_cui.WHITE_ON_BLACK) == [["banana", py_cui.WHITE_ON_BLACK]]
+
+# other rule types are left to py_cui
+assert not CompiledColorRules.can_combine(map_rules + [ColorRule('#', py_cui.RED_ON_BLACK, py_cui.RED_ON_BLACK,
+                                                                 'startswith', 'line', None, False, logger)])
+print("compiled color rules produce the same fragments as the rules applied one by one")
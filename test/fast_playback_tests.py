@@ -0,0 +1,65 @@
+import os
+import tempfile
+
+import py_cui
+
+from game.controls import Controls, Keys
+from game.game import GameHandler
+from util.config import Config, GameplayConfig
+from util.game_simulator import GameSimulator
+from widgets.qrogue_pycui import State
+
+
+def press(key: Keys, long_ago: bool = True):
+    if long_ago:
+        # as if the last batch was long ago, so a batch simulates as many keys as the speed allows
+        cui._QrogueCUI__last_input = 0
+    cui._handle_key_presses(controls.get_key(key))
+
+
+return_code = Config.load()
+if return_code != 0:
+    print(f"Error #{return_code}")
+GameplayConfig.from_log_text("Simulation speed=1000")
+controls = Controls()
+# in the Spaceship, open the pause menu after 3 keys and continue the game with the last key
+recorded_keys = [Keys.MoveRight] * 3 + [Keys.Pause] + [Keys.MoveDown] * 2 + [Keys.Cancel] + [Keys.MoveLeft] * 3 + \
+                [Keys.Pause, Keys.Action, Keys.Action]
+
+with tempfile.TemporaryDirectory() as folder:
+    path = os.path.join(folder, "run.qrkl")
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        file.write(Config.get_log_head(7) + "".join([key.to_char() for key in recorded_keys]))
+    simulator = GameSimulator(controls, path, in_keylog_folder=False, notification_popup=False)
+
+game = GameHandler(7, headless_size=GameHandler.REPLAY_SIZE)
+cui = game._GameHandler__renderer
+state_machine = cui._QrogueCUI__state_machine
+cui._QrogueCUI__simulator = simulator
+py_cui.PyCUI._handle_key_presses(cui, controls.get_key(Keys.Action))     # PLAY like at the start of a simulation
+assert state_machine.cur_state == State.Spaceship
+
+press(Keys.Pause)   # fast-forward
+press(Keys.Action)
+assert simulator.num_of_keys == 4 and state_machine.cur_state == State.Pause  # the batch stopped at the new state
+
+press(Keys.Pause)   # back to step by step
+press(Keys.Action)
+assert simulator.num_of_keys == 5
+
+GameplayConfig.from_log_text("Simulation speed=3")
+press(Keys.Pause)
+press(Keys.Action)
+assert simulator.num_of_keys == 8    # no more keys than the speed allows
+
+GameplayConfig.from_log_text("Simulation speed=1000")
+press(Keys.Action)
+assert simulator.num_of_keys == 13 and state_machine.cur_state == State.Spaceship
+assert cui.simulating
+press(Keys.Action)
+assert not cui.simulating   # all keys were simulated
+
+# once the simulation finished the pause key pauses the game again instead of toggling fast-forwarding
+press(Keys.Pause)
+assert state_machine.cur_state == State.Pause
+print("fast-forwarding a simulation stops every batch at a new state")
@@ -0,0 +1,101 @@
+import types
+
+from util import frame_profiler
+from util.frame_profiler import FrameProfiler
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def perf_counter(self) -> float:
+        return self.now
+
+    def advance(self, ms: float):
+        self.now += ms / 1000
+
+
+def assert_ms(value: float, expected: float):
+    assert abs(value - expected) < 1e-6, (value, expected)
+
+
+# the profiler reads the time from our clock so the durations are exact
+clock = Clock()
+frame_profiler.time = types.SimpleNamespace(perf_counter=clock.perf_counter)
+
+# without a created FrameProfiler everything is ignored
+disabled = FrameProfiler.instance()
+assert not disabled.enabled
+disabled.begin_frame()
+disabled.begin(FrameProfiler.INPUT)
+disabled.end(FrameProfiler.INPUT)
+disabled.end_frame()
+assert disabled.frames == 0
+
+profiler = FrameProfiler(7)
+assert FrameProfiler.instance() is profiler
+
+# nested phases: the map is rendered while the input is handled and the input phase only gets the remaining time
+profiler.begin_frame()
+profiler.begin(FrameProfiler.INPUT)
+clock.advance(2)
+profiler.begin(FrameProfiler.SIMULATION)
+clock.advance(3)
+profiler.begin(FrameProfiler.MAP)
+clock.advance(5)
+profiler.end(FrameProfiler.MAP)
+clock.advance(1)
+profiler.end(FrameProfiler.SIMULATION)
+clock.advance(4)
+profiler.end(FrameProfiler.INPUT)
+profiler.begin(FrameProfiler.DRAW)
+clock.advance(7)
+profiler.end(FrameProfiler.DRAW)
+profiler.end_frame()
+assert profiler.frames == 1
+assert_ms(profiler.stats(FrameProfiler.INPUT)[0], 2 + 4)
+assert_ms(profiler.stats(FrameProfiler.SIMULATION)[0], 3 + 1)
+assert_ms(profiler.stats(FrameProfiler.MAP)[0], 5)
+assert_ms(profiler.stats(FrameProfiler.DRAW)[0], 7)
+
+# a phase that happens several times per frame is summed up
+profiler.begin_frame()
+for _ in range(3):
+    profiler.begin(FrameProfiler.MAP)
+    clock.advance(2)
+    profiler.end(FrameProfiler.MAP)
+profiler.end_frame()
+assert_ms(profiler.stats(FrameProfiler.MAP)[2], 6)     # maximum over both frames
+assert_ms(profiler.stats(FrameProfiler.INPUT)[0], 0)   # p50 of 0 and 6
+
+# mismatching begin() and end() (e.g. due to an exception) discard the open phases instead of measuring garbage
+profiler.begin_frame()
+profiler.begin(FrameProfiler.INPUT)
+profiler.begin(FrameProfiler.MAP)
+clock.advance(100)
+profiler.end(FrameProfiler.INPUT)
+profiler.end(FrameProfiler.INPUT)
+profiler.end_frame()
+assert_ms(profiler.stats(FrameProfiler.INPUT)[2], 6)
+assert_ms(profiler.stats(FrameProfiler.MAP)[2], 6)
+
+# phases outside of a frame are ignored
+profiler.begin(FrameProfiler.DRAW)
+clock.advance(100)
+profiler.end(FrameProfiler.DRAW)
+assert profiler.frames == 3
+assert_ms(profiler.stats(FrameProfiler.DRAW)[2], 7)
+
+# the statistics only cover the last WINDOW_SIZE frames
+for i in range(FrameProfiler.WINDOW_SIZE):
+    profiler.begin_frame()
+    profiler.begin(FrameProfiler.DRAW)
+    clock.advance(1 + i % 2)
+    profiler.end(FrameProfiler.DRAW)
+    profiler.end_frame()
+p50, p95, max_ = profiler.stats(FrameProfiler.DRAW)
+assert_ms(p50, 1)
+assert_ms(p95, 2)
+assert_ms(max_, 2)
+assert profiler.summary().startswith("input 0.00/0.00/0.00  simulation")
+print("frame profiler only accounts the time of a phase that isn't spent in its nested phases")
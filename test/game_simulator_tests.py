@@ -0,0 +1,40 @@
+import os
+import tempfile
+
+from game.controls import Controls, Keys
+from util.config import Config
+from util.game_simulator import GameSimulator
+
+first_hash = "0123456789abcdef"
+second_hash = "FEDCBA9876543210"
+keys = Keys.MoveUp.to_char() * 3 + "#" + first_hash + Keys.Action.to_char() * 2 + \
+       "#abc" + Keys.MoveDown.to_char() + Keys.MoveRight.to_char() + "#" + second_hash     # "#abc" was cut off
+keylog = Config.format_log_head("v0.2", 7, "19102026_235950", "Log Keys=True") + keys
+
+controls = Controls()
+with tempfile.TemporaryDirectory() as folder:
+    path = os.path.join(folder, "run.qrkl")
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        file.write(keylog)
+
+    simulator = GameSimulator(controls, path, in_keylog_folder=False, notification_popup=False)
+    assert simulator.seed == 7 and simulator.version == "v0.2"
+    pressed_keys = []
+    state_hashes = []
+    while True:
+        key = simulator.next()
+        state_hash = simulator.pop_state_hash()
+        if state_hash is not None:
+            state_hashes.append(state_hash)
+        assert simulator.pop_state_hash() is None   # a state hash is only returned once
+        if key is None:
+            break
+        pressed_keys.append(key)
+
+    expected_keys = [Keys.MoveUp] * 3 + [Keys.Action] * 2 + [Keys.MoveDown, Keys.MoveRight]
+    assert pressed_keys == [controls.get_key(key) for key in expected_keys], pressed_keys
+    # the state hashes belong to the state after the keys pressed before them
+    assert state_hashes == [(3, first_hash), (7, second_hash)], state_hashes
+    assert simulator.num_of_keys == len(expected_keys)
+    assert simulator.position == len(keys)
+print("state hashes are read from keylogs")
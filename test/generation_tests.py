@@ -1,11 +1,17 @@
+import json
+import os
+import sys
+import tempfile
 import time
 
 from game.achievements import AchievementManager
 from game.actors.robot import TestBot
 from game.callbacks import CallbackPack
+from game.logic.instruction import HGate, XGate, YGate, ZGate
 from game.map.generator import RandomLayoutGenerator, RandomDungeonGenerator
 from game.map.tiles import *
 from util.config import Config
+from util.phase_timer import PhaseTimer
 
 
 def start_gp(args):
@@ -24,7 +30,41 @@ def load_map(map_name: str):
     print(f"Load map: {map_name}")
 
 
-def layout_test():
+def check_timings(path: str, phase: str, num_of_runs: int):
+    """
+    Checks that the timings stored by PhaseTimer.save() are valid histograms and that the given phase was recorded
+    once per run.
+    """
+    with open(path) as file:
+        timings = json.load(file)
+    assert timings[phase]["count"] == num_of_runs, (phase, timings[phase]["count"])
+    for name, histogram in timings.items():
+        buckets = histogram["buckets"]
+        assert len(buckets) == len(PhaseTimer.DEFAULT_BOUNDS) + 1, name
+        assert [bucket["le"] for bucket in buckets] == PhaseTimer.DEFAULT_BOUNDS + [None], name
+        assert sum([bucket["count"] for bucket in buckets]) == histogram["count"] > 0, name
+        assert 0 <= histogram["min"] <= histogram["mean"] <= histogram["max"], name
+        assert abs(histogram["mean"] * histogram["count"] - histogram["sum"]) < 1e-6, name
+    print(f"{path} contains valid timings of {len(timings)} phases")
+
+
+def doomed_layout_test():
+    # on such a narrow grid the RiddleRoom of seed 1 ends up behind the GateRoom and the BossRoom, so it can no longer
+    # be connected with the SpawnRoom and the layout has to be rejected before any WildRooms are placed
+    timer = PhaseTimer()
+    mapgen = RandomLayoutGenerator(1, 5, 2, timer)
+    assert not mapgen.generate(debug=False)
+    assert not mapgen.check_special_rooms()
+    assert timer.phases == ["layout.grid_init", "layout.spawn", "layout.special_rooms"], timer.phases
+
+    timer = PhaseTimer()
+    mapgen = RandomLayoutGenerator(0, RandomDungeonGenerator.WIDTH, RandomDungeonGenerator.HEIGHT, timer)
+    assert mapgen.generate(debug=False)
+    assert "layout.astar" in timer.phases, timer.phases
+    print("doomed layouts are rejected early")
+
+
+def layout_test(timings_folder: str):
     min_duration = (1, -1)
     duration_sum = 0
     max_duration = (0, -1)
@@ -36,11 +76,12 @@ def layout_test():
     # [47765, 58456, 65084, 74241, 85971]
     seeds = list(range(start_seed, end_seed))       #[629, 774, 991, 3280, 5326, 6062, 7289, 8588, 8604, ]
     num_of_seeds = len(seeds)
+    timer = PhaseTimer()
     i = 0
     for seed in seeds:
         if i % 50000 == 0:
             print(f"Run {i + 1}): seed = {seed}")
-        mapgen = RandomLayoutGenerator(seed, RandomDungeonGenerator.WIDTH, RandomDungeonGenerator.HEIGHT)
+        mapgen = RandomLayoutGenerator(seed, RandomDungeonGenerator.WIDTH, RandomDungeonGenerator.HEIGHT, timer)
         now_time = time.time()
         if not mapgen.generate(debug=False):
             failing_seeds.append(mapgen)
@@ -57,6 +98,10 @@ def layout_test():
     print(f"Average time needed for generating a map: {duration_sum / num_of_seeds} seconds")
     print(f"Fastest generation time = {min_duration[0]} for seed = {min_duration[1]}")
     print(f"Longest generation time = {max_duration[0]} for seed = {max_duration[1]}")
+    print(timer)
+    timings_path = os.path.join(timings_folder, "layout_timings.json")
+    timer.save(timings_path)
+    check_timings(timings_path, "layout.grid_init", num_of_seeds)
     print()
     print("Failing Seeds:")
     seeds = []
@@ -72,7 +117,7 @@ def layout_test():
         mapgen.generate(debug=True)
 
 
-def dungeon_test(robot: Robot, cbp: CallbackPack):
+def dungeon_test(robot: Robot, cbp: CallbackPack, timings_folder: str):
     min_duration = (1, -1)
     duration_sum = 0
     max_duration = (0, -1)
@@ -81,12 +126,13 @@ def dungeon_test(robot: Robot, cbp: CallbackPack):
     failing_seeds = []
     seeds = list(range(start_seed, end_seed))
     num_of_seeds = len(seeds)
+    timer = PhaseTimer()
     i = -1
     for seed in seeds:
         i += 1
         if i % 5000 == 0:
             print(f"Run {i + 1}): seed = {seed}")
-        generator = RandomDungeonGenerator(seed, load_map, AchievementManager())
+        generator = RandomDungeonGenerator(seed, load_map, AchievementManager(), timer=timer)
         start_time = time.time()
         map, success = generator.generate(cbp, robot)
         if not success:
@@ -101,6 +147,10 @@ def dungeon_test(robot: Robot, cbp: CallbackPack):
     print(f"Average time needed for generating a map: {duration_sum / num_of_seeds} seconds")
     print(f"Fastest generation time = {min_duration[0]} for seed = {min_duration[1]}")
     print(f"Longest generation time = {max_duration[0]} for seed = {max_duration[1]}")
+    print(timer)
+    timings_path = os.path.join(timings_folder, "dungeon_timings.json")
+    timer.save(timings_path)
+    check_timings(timings_path, "dungeon.factories", num_of_seeds)
     print()
     print("Failing Seeds:")
     seeds = []
@@ -116,8 +166,17 @@ if return_code != 0:
     print(f"Error #{return_code}")
 
 RandomManager(7)    # initialize RandomManager
-p = TestBot()
+# the generated Riddles and Bosses need a Robot with gates
+p = TestBot(3, gates=[HGate(), XGate(), YGate(), ZGate()])
 c = CallbackPack(start_gp, start_fight, start_boss_fight, start_fight, start_fight)
 
-layout_test()
-dungeon_test(p, c)
+doomed_layout_test()
+# the phase timings are only kept if a folder for them is passed with --timings <folder>
+if "--timings" in sys.argv:
+    timings_folder = sys.argv[sys.argv.index("--timings") + 1]
+    layout_test(timings_folder)
+    dungeon_test(p, c, timings_folder)
+else:
+    with tempfile.TemporaryDirectory() as timings_folder:
+        layout_test(timings_folder)
+        dungeon_test(p, c, timings_folder)
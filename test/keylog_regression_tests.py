@@ -0,0 +1,54 @@
+import os
+import tempfile
+
+from game.controls import Keys
+from game.keylog_regression import KeylogReplay, find_keylogs, run_regression
+from util.binary_keylog import BinaryKeyLog
+from util.config import Config, FileTypes
+
+return_code = Config.load()
+if return_code != 0:
+    print(f"Error #{return_code}")
+
+keys = Keys.Action.to_char() + Keys.MoveRight.to_char() * 3 + Keys.MoveDown.to_char() * 2
+head = Config.get_log_head(7)
+keylogs = {
+    "passed": head + keys,
+    "diverged": head + keys + "#0123456789abcdef",     # no real state has this hash
+    "format": Config.format_log_head(Config.version(), 7, "19102026_120000", "Log Keys=True", log_format=1) + keys,
+    "version": Config.format_log_head("v0.0.1", 7, "19102026_120000", "Log Keys=True") + keys,
+    "broken": "this is not a keylog",
+}
+expected = {
+    "passed": KeylogReplay.PASSED,
+    "binary": KeylogReplay.PASSED,
+    "diverged": KeylogReplay.DIVERGED,
+    "format": KeylogReplay.VERSION_MISMATCH,
+    "version": KeylogReplay.VERSION_MISMATCH,
+    "broken": KeylogReplay.EXCEPTION,
+}
+
+with tempfile.TemporaryDirectory() as folder:
+    os.mkdir(os.path.join(folder, "sub"))
+    for name, text in keylogs.items():
+        with open(os.path.join(folder, "sub", name + FileTypes.KeyLog.value), "w", encoding="utf-8",
+                  newline="") as file:
+            file.write(text)
+    with open(os.path.join(folder, "binary" + FileTypes.BinaryKeyLog.value), "wb") as file:
+        file.write(BinaryKeyLog.from_text(keylogs["passed"]))
+    with open(os.path.join(folder, "notes.txt"), "w") as file:
+        file.write("not replayed")
+
+    paths = find_keylogs(folder)
+    assert [os.path.relpath(path, folder) for path in paths] == \
+           ["binary.qrkb"] + [os.path.join("sub", name + ".qrkl") for name in sorted(keylogs.keys())], paths
+
+    replays = run_regression(folder, processes=2)
+    statuses = {os.path.basename(replay.path).split(".")[0]: replay.status for replay in replays}
+    assert statuses == expected, statuses
+    for replay in replays:
+        if replay.status in [KeylogReplay.PASSED, KeylogReplay.DIVERGED]:
+            assert replay.num_of_keys == len(keys), replay
+        else:
+            assert replay.message, replay
+print("the regression runner tells passed, diverged, outdated and broken keylogs apart")
@@ -0,0 +1,91 @@
+import time
+
+from game.achievements import AchievementManager
+from game.actors.robot import TestBot
+from game.callbacks import CallbackPack
+from game.logic.instruction import HGate, XGate, YGate, ZGate
+from game.map.generator import LargeDungeonGenerator
+from game.map.map import Map
+from game.map.viewport import Viewport
+from game.map.tiles import *
+from util.config import Config
+from util.logger import Logger
+from util.my_random import MyRandom
+from widgets.my_popups import Popup, ConfirmationPopup
+
+
+def start_gp(args):
+    print("started game")
+
+
+def start_fight(robot: Robot, enemy: Enemy, direction: Direction):
+    pass
+
+
+def start_boss_fight(robot: Robot, boss: Boss, direction: Direction):
+    pass
+
+
+def load_map(map_name: str):
+    print(f"Load map: {map_name}")
+
+
+def ignore_popup(*args):
+    pass
+
+
+def large_dungeon_benchmark(robot: Robot, cbp: CallbackPack):
+    sizes = [(Map.MAX_WIDTH, Map.MAX_HEIGHT), (16, 16), (32, 32), (64, 64)]
+    seeds = list(range(10))
+    num_of_moves = 2000
+    for width, height in sizes:
+        duration_sum = 0
+        move_duration_sum = 0
+        materialized_sum = 0
+        num_of_rooms_sum = 0
+        failing_seeds = []
+        for seed in seeds:
+            generator = LargeDungeonGenerator(seed, load_map, AchievementManager(), width, height)
+            start_time = time.time()
+            map, success = generator.generate(cbp, robot)
+            duration_sum += time.time() - start_time
+            if not success:
+                failing_seeds.append(seed)
+                continue
+
+            # random walk that renders the part of the Map the MapWidget shows after every step
+            rm = MyRandom(seed)
+            viewport = Viewport()
+            start_time = time.time()
+            for _ in range(num_of_moves):
+                map.move(rm.get_element(Direction.values()))
+                viewport.render(map)
+            move_duration_sum += time.time() - start_time
+            materialized_sum += map.num_of_materialized_rooms
+            num_of_rooms_sum += map.num_of_rooms
+
+        num_of_maps = len(seeds) - len(failing_seeds)
+        print(f"Dungeon size {width}x{height}:")
+        print(f"Average time needed for generating a dungeon: {duration_sum / len(seeds)} seconds")
+        if num_of_maps > 0:
+            print(f"Average time needed per move and render: {move_duration_sum / (num_of_maps * num_of_moves)} "
+                  f"seconds")
+            print(f"Average number of materialized Rooms after {num_of_moves} moves: "
+                  f"{materialized_sum / num_of_maps} of {num_of_rooms_sum / num_of_maps}")
+        print(f"Failing Seeds: {failing_seeds}")
+        print()
+
+
+return_code = Config.load()
+if return_code != 0:
+    print(f"Error #{return_code}")
+
+RandomManager(7)    # initialize RandomManager
+Logger(7)
+Logger.instance().set_popup(ignore_popup, ignore_popup)
+Popup.update_popup_functions(ignore_popup)
+ConfirmationPopup.update_popup_function(ignore_popup)
+p = TestBot(3, gates=[HGate(), XGate(), YGate(), ZGate()])
+c = CallbackPack(start_gp, start_fight, start_boss_fight, start_fight, start_fight)
+
+large_dungeon_benchmark(p, c)
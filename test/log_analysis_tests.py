@@ -0,0 +1,87 @@
+import os
+import tempfile
+
+from game.controls import Keys
+from util.config import Config
+from util.log_analysis import ArchiveStatistics, analyze_files, analyze_keylog, analyze_log, pair_runs
+
+head = Config.format_log_head("v0.2", 7, "19102026_235950", "Log Keys=True")
+log = head + """23-59-50: {EVENT} |State|keys=0|state=Spaceship
+23-59-52: {EVENT} |World|keys=4|world=w1
+23-59-52: {EVENT} |State|keys=4|state=Explore
+23-59-55: {EVENT} |Level|keys=10|level=l1v1
+23-59-55: {EVENT} |State|keys=10|state=Explore
+23-59-58: {EVENT} |Fight|keys=20|enemy=DummyEnemy
+23-59-58: {EVENT} |State|keys=20|state=Fight
+00-00-05: {EVENT} |State|keys=30|state=Explore
+00-00-05: 
+----------------------------------
+ERROR |something went wrong
+----------------------------------
+
+00-00-10: {EVENT} |State|keys=45|state=Spaceship
+00-00-12: {EVENT} |Level|keys=50|level=l1v2
+00-00-20: {EVENT} |End|keys=60
+"""
+keylog = head + Keys.MoveUp.to_char() * 5 + "#0123456789abcdef" + Keys.Action.to_char() * 2
+
+with tempfile.TemporaryDirectory() as folder:
+    log_path = os.path.join(folder, "run.qrlog")
+    keylog_path = os.path.join(folder, "run.qrkl")
+    with open(log_path, "w", encoding="utf-8") as file:
+        file.write(log)
+    with open(keylog_path, "w", encoding="utf-8", newline="") as file:
+        file.write(keylog)
+
+    statistics = analyze_log(log_path)
+    assert statistics.get(ArchiveStatistics.LEVEL, "l1v1") == (1, 35, 15)     # crosses midnight
+    assert statistics.get(ArchiveStatistics.ABORTED_LEVEL, "l1v2") == (1, 10, 8)
+    assert statistics.get(ArchiveStatistics.STATE, "Explore") == (3, 31, 11)
+    assert statistics.get(ArchiveStatistics.STATE, "Fight") == (1, 10, 7)
+    assert statistics.get(ArchiveStatistics.FIGHT, "DummyEnemy")[0] == 1
+    assert statistics.get(ArchiveStatistics.ERROR, "something went wrong")[0] == 1
+
+    statistics.merge(analyze_keylog(keylog_path))
+    assert statistics.get(ArchiveStatistics.KEY, Keys.MoveUp.name)[0] == 5
+    assert statistics.get(ArchiveStatistics.KEY, Keys.Action.name)[0] == 2
+    assert statistics.get(ArchiveStatistics.STATE_HASH, "")[0] == 1
+    statistics.write_csv(os.path.join(folder, "analysis.csv"))
+
+    # the keys of a run whose log and keylog are both available are attributed to the states they were pressed in
+    run_log = Config.format_log_head("v0.2", 9, "20102026_100000", "Log Keys=True") + """\
+10-00-00: {EVENT} |State|keys=0|state=Spaceship
+10-00-05: {EVENT} |State|keys=3|state=Explore
+10-00-09: {EVENT} |State|keys=5|state=Fight
+10-00-12: {EVENT} |End|keys=7
+"""
+    run_keys = Keys.MoveUp.to_char() * 3 + "#0123456789abcdef" + Keys.MoveRight.to_char() * 2 + "#abc" + \
+        Keys.Action.to_char() + Keys.HotKey1.to_char()     # "#abc" was cut off
+    run_log_path = os.path.join(folder, "run9.qrlog")
+    run_keylog_path = os.path.join(folder, "run9.qrkl")
+    old_keylog_path = os.path.join(folder, "old9.qrkl")
+    with open(run_log_path, "w", encoding="utf-8") as file:
+        file.write(run_log)
+    with open(run_keylog_path, "w", encoding="utf-8", newline="") as file:
+        file.write(Config.format_log_head("v0.2", 9, "20102026_100001", "Log Keys=True") + run_keys)
+    with open(old_keylog_path, "w", encoding="utf-8", newline="") as file:     # recorded before the log was created
+        file.write(Config.format_log_head("v0.2", 9, "20102026_095959", "Log Keys=True") + run_keys)
+
+    runs = pair_runs([keylog_path, old_keylog_path, run_log_path, run_keylog_path])
+    assert sorted(runs, key=str) == sorted([(run_log_path, run_keylog_path), (None, old_keylog_path),
+                                            (None, keylog_path)], key=str), runs
+    statistics = analyze_files((run_log_path, run_keylog_path))
+    assert statistics.get(ArchiveStatistics.STATE_KEY, "Spaceship/MoveUp")[0] == 3
+    assert statistics.get(ArchiveStatistics.STATE_KEY, "Explore/MoveRight")[0] == 2
+    assert statistics.get(ArchiveStatistics.STATE_KEY, "Fight/Action")[0] == 1
+    assert statistics.get(ArchiveStatistics.STATE_KEY, "Fight/HotKey1")[0] == 1
+    assert statistics.get(ArchiveStatistics.STATE_KEY, "Explore/MoveUp")[0] == 0
+    assert statistics.get(ArchiveStatistics.KEY, Keys.MoveUp.name)[0] == 3
+    assert statistics.get(ArchiveStatistics.STATE, "Explore") == (1, 2, 4)
+
+    # keylogs of the old format don't start with the first key counted by the log
+    with open(run_keylog_path, "w", encoding="utf-8", newline="") as file:
+        file.write(Config.format_log_head("v0.2", 9, "20102026_100001", "Log Keys=True", log_format=1) + run_keys)
+    statistics = analyze_files((run_log_path, run_keylog_path))
+    assert statistics.get(ArchiveStatistics.STATE_KEY, "Spaceship/MoveUp")[0] == 0
+    assert statistics.get(ArchiveStatistics.KEY, Keys.MoveUp.name)[0] == 3
+print("log analysis is correct")
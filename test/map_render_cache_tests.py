@@ -0,0 +1,58 @@
+import pickle
+
+from game.achievements import AchievementManager
+from game.actors.riddle import Riddle
+from game.actors.robot import TestBot
+from game.collectibles import pickup
+from game.logic.instruction import HGate, XGate
+from game.logic.qubit import StateVector
+from game.map.level_map import LevelMap
+from game.map.navigation import Coordinate, Direction
+from game.map.rooms import Area, Hallway, RiddleRoom, SpawnRoom
+from game.map.tiles import Door
+
+
+def load_map(map_name: str, room: Coordinate):
+    pass
+
+
+opened_riddles = []
+
+
+def open_riddle(robot, riddle: Riddle):
+    opened_riddles.append(riddle)
+
+
+hallway = Hallway(Door(Direction.East))
+spawn_room = SpawnRoom(load_map, east_hallway=hallway)
+riddle = Riddle(StateVector([1, 0]), pickup.Coin(1))
+riddle_room = RiddleRoom(hallway, Direction.West, riddle, open_riddle)
+robot = TestBot(1, gates=[HGate(), XGate()])
+level = LevelMap("cache test", 7, [[spawn_room, riddle_room]], robot, Coordinate(0, 0), AchievementManager())
+
+# rendering an unchanged Map again uses the cached rows of the Areas
+rows = level.row_strings()
+version = spawn_room.render_version
+assert level.row_strings() == rows
+assert spawn_room.render_version == version
+assert not any(["?" in row for row in rows])     # the RiddleRoom is only in sight
+
+# walk from the middle of the SpawnRoom onto the Riddler in the middle of the RiddleRoom
+for _ in range(Area.UNIT_WIDTH + 1):
+    assert level.move(Direction.East)
+assert opened_riddles == [riddle]
+assert any(["?" in row for row in level.row_strings()])
+
+# the Riddle is failed while we are not on the Map, so the Map only knows once the Riddle was resolved
+riddle.is_reached(StateVector([0, 1]))
+assert not riddle.is_active
+assert any(["?" in row for row in level.row_strings()])
+level.resolve_trigger()
+assert not any(["?" in row for row in level.row_strings()])
+
+# the block cache is keyed by Area ids that are not reused by Areas created after restoring a snapshot
+snapshot = pickle.dumps(Hallway(Door(Direction.South)))
+Area._Area__ID = 1  # like in a new process
+restored = pickle.loads(snapshot)
+assert Hallway(Door(Direction.South)).area_id > restored.area_id
+print("rendered rows are cached until their Area changes")
@@ -0,0 +1,69 @@
+import os
+import struct
+import tempfile
+
+from game.achievements import AchievementManager
+from game.actors.robot import TestBot
+from game.callbacks import CallbackPack
+from game.logic.instruction import HGate, XGate, YGate, ZGate
+from game.map.generator import RandomDungeonGenerator
+from util.config import Config
+from util.my_random import RandomManager
+from util.replay_snapshots import ReplaySnapshot, ReplaySnapshots, dump_state, load_state
+
+
+def ignore(*args):
+    pass
+
+
+return_code = Config.load()
+if return_code != 0:
+    print(f"Error #{return_code}")
+
+RandomManager(7)    # initialize RandomManager
+cbp = CallbackPack(ignore, ignore, ignore, ignore, ignore)
+for seed in [3, 7, 42]:
+    generator = RandomDungeonGenerator(seed, ignore, AchievementManager())
+    map, success = generator.generate(cbp, TestBot(3, gates=[HGate(), XGate(), YGate(), ZGate()]))
+    assert success, seed
+    # the snapshot has to contain the builders of the LazyRooms that were not built yet
+    assert map.num_of_materialized_rooms < map.num_of_rooms, seed
+    # callbacks belong to the running process and are therefore only referenced by name
+    environment = {"ignore": ignore}
+    restored = load_state(dump_state(map, environment), environment)
+    assert restored.num_of_materialized_rooms == map.num_of_materialized_rooms, seed
+
+    map.reveal()
+    restored.reveal()
+    assert restored.num_of_materialized_rooms == restored.num_of_rooms, seed
+    assert str(restored) == str(map), seed
+
+with tempfile.TemporaryDirectory() as folder:
+    path = os.path.join(folder, "run.qrsnap")
+    with ReplaySnapshots.create(path, 7, 100) as snapshots:
+        snapshots.add(ReplaySnapshot(101, 230, b"first"))
+        snapshots.add(ReplaySnapshot(250, 512, b"second"))
+    # the file is closed when the with statement ends
+    try:
+        snapshots.add(ReplaySnapshot(300, 600, b"third"))
+        assert False, "snapshots were added to a closed file"
+    except ValueError:
+        pass
+
+    snapshots = ReplaySnapshots.read(path)
+    assert snapshots.seed == 7 and snapshots.interval == 100 and snapshots.num_of_snapshots == 2
+    assert snapshots.nearest(100) is None
+    snapshot = snapshots.nearest(249)
+    assert (snapshot.num_of_keys, snapshot.position, snapshot.data) == (101, 230, b"first")
+    assert snapshots.nearest(1000).data == b"second"
+
+    # snapshots of another format version would restore an incompatible state
+    with open(path, "r+b") as file:
+        file.seek(4)
+        file.write(struct.pack("<H", ReplaySnapshots.FORMAT_VERSION - 1))
+    try:
+        ReplaySnapshots.read(path)
+        assert False, "a snapshot file of another version was read"
+    except ValueError:
+        pass
+print("dungeons and replays survive a snapshot")
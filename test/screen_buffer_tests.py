@@ -0,0 +1,44 @@
+from widgets.headless import HeadlessScreen
+from widgets.screen_buffer import ScreenBuffer
+
+
+def draw(buffer: ScreenBuffer, lines: dict):
+    buffer.erase()
+    for y, line in lines.items():
+        buffer.addstr(y, 0, line)
+    buffer.refresh()
+
+
+screen = HeadlessScreen(4, 6)
+buffer = ScreenBuffer(screen)
+draw(buffer, {0: "#####", 1: "# R #", 2: "#####"})
+assert buffer.written_rows == 3
+assert screen.rows() == ["##### ", "# R # ", "##### ", "      "]
+
+# the robot moved by one cell, so only its row is written anew
+draw(buffer, {0: "#####", 1: "#  R#", 2: "#####"})
+assert buffer.written_rows == 1
+assert screen.rows() == ["##### ", "#  R# ", "##### ", "      "]
+
+# an unchanged frame doesn't write anything
+draw(buffer, {0: "#####", 1: "#  R#", 2: "#####"})
+assert buffer.written_rows == 0
+
+# rows that became empty are cleared
+draw(buffer, {0: "#####", 3: "ab"})
+assert buffer.written_rows == 3
+assert screen.rows() == ["##### ", "      ", "      ", "ab    "]
+
+# writing into a row again replaces its old content instead of drawing over it
+draw(buffer, {0: "#####", 3: "c"})
+assert buffer.written_rows == 1
+assert screen.rows() == ["##### ", "      ", "      ", "c     "]
+
+# clear() forces every row to be written anew
+buffer.clear()
+assert screen.rows() == ["      "] * 4
+draw(buffer, {0: "#####", 3: "c"})
+assert buffer.written_rows == 2
+assert screen.rows() == ["##### ", "      ", "      ", "c     "]
+assert screen.frames == 6
+print("only changed rows are written")
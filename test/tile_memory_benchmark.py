@@ -0,0 +1,114 @@
+import gc
+import sys
+import tracemalloc
+
+from game.achievements import AchievementManager
+from game.actors.robot import TestBot
+from game.callbacks import CallbackPack
+from game.logic.instruction import HGate, XGate, YGate, ZGate
+from game.map.generator import LargeDungeonGenerator, RandomDungeonGenerator
+from game.map.map import Map
+from game.map.rooms import Room, DefinedWildRoom
+from game.map.tiles import *
+from util.config import Config
+from util.logger import Logger
+from widgets.my_popups import Popup, ConfirmationPopup
+
+
+def start_gp(args):
+    print("started game")
+
+
+def start_fight(robot: Robot, enemy: Enemy, direction: Direction):
+    pass
+
+
+def start_boss_fight(robot: Robot, boss: Boss, direction: Direction):
+    pass
+
+
+def load_map(map_name: str):
+    print(f"Load map: {map_name}")
+
+
+def ignore_popup(*args):
+    pass
+
+
+def measure(function) -> (int, int, object):
+    """
+    :param function: the allocations of this function are measured
+    :return: the memory (in bytes) still allocated after the function returned, the peak memory while it ran and its
+    return value (which keeps the allocated memory alive)
+    """
+    gc.collect()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    result = function()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, peak, result
+
+
+def materialize_all(map: Map):
+    for y in range(map.height):
+        for x in range(map.width):
+            map.room_at(x, y)
+    return map
+
+
+def tile_benchmark():
+    num_of_rooms = 1000
+    current, peak, rooms = measure(lambda: [DefinedWildRoom(Room.get_empty_room_tile_list())
+                                            for _ in range(num_of_rooms)])
+    print(f"Memory per empty Room: {current / num_of_rooms:.0f} bytes (peak {peak / num_of_rooms:.0f} bytes)")
+
+    tile_list = Room.dic_to_tile_list({Coordinate(1, 1): Obstacle(), Coordinate(2, 3): Wall()})
+    current, peak, lists = measure(lambda: [Room.dic_to_tile_list({Coordinate(1, 1): Obstacle(),
+                                                                   Coordinate(2, 3): Wall()})
+                                            for _ in range(num_of_rooms)])
+    print(f"Memory per tile list: {current / num_of_rooms:.0f} bytes")
+    print(f"Size of a Floor: {sys.getsizeof(Floor())} bytes, distinct Floors in a tile list: "
+          f"{len(set(id(tile) for tile in tile_list if isinstance(tile, Floor)))}")
+    print()
+
+
+def level_benchmark(robot: Robot, cbp: CallbackPack):
+    seeds = list(range(10))
+    for name, create_generator in [
+        ("normal level", lambda seed: RandomDungeonGenerator(seed, load_map, AchievementManager())),
+        ("16x16 dungeon", lambda seed: LargeDungeonGenerator(seed, load_map, AchievementManager(), 16, 16)),
+    ]:
+        current_sum = 0
+        peak_sum = 0
+        num_of_maps = 0
+        for seed in seeds:
+            generator = create_generator(seed)
+            map, success = generator.generate(cbp, robot)
+            if not success:
+                continue
+            current, peak, _ = measure(lambda: materialize_all(map))
+            current_sum += current
+            peak_sum += peak
+            num_of_maps += 1
+        print(f"{name}:")
+        if num_of_maps > 0:
+            print(f"Average memory for materializing all Rooms: {current_sum / num_of_maps / 1024:.1f} KiB "
+                  f"(peak {peak_sum / num_of_maps / 1024:.1f} KiB)")
+        print()
+
+
+return_code = Config.load()
+if return_code != 0:
+    print(f"Error #{return_code}")
+
+RandomManager(7)    # initialize RandomManager
+Logger(7)
+Logger.instance().set_popup(ignore_popup, ignore_popup)
+Popup.update_popup_functions(ignore_popup)
+ConfirmationPopup.update_popup_function(ignore_popup)
+p = TestBot(3, gates=[HGate(), XGate(), YGate(), ZGate()])
+c = CallbackPack(start_gp, start_fight, start_boss_fight, start_fight, start_fight)
+
+tile_benchmark()
+level_benchmark(p, c)
@@ -0,0 +1,77 @@
+import random
+
+from game.achievements import AchievementManager
+from game.actors.robot import TestBot
+from game.callbacks import CallbackPack
+from game.logic.instruction import HGate, XGate, YGate, ZGate
+from game.map.generator import RandomDungeonGenerator
+from game.map.navigation import Coordinate, Direction
+from game.map.viewport import Viewport
+from util.config import Config
+from util.logger import Logger
+from util.my_random import RandomManager
+from widgets.my_popups import Popup, ConfirmationPopup
+
+
+def ignore(*args):
+    pass
+
+
+# scrolling along the axes: a margin of a quarter of the Viewport's size and clamped to the Map
+viewport = Viewport(12, 8)
+viewport.follow(Coordinate(5, 3), 40, 20)
+assert (viewport.x, viewport.y) == (0, 0)       # still in the inner part
+viewport.follow(Coordinate(8, 5), 40, 20)
+assert (viewport.x, viewport.y) == (0, 0)       # on the last column and row of the inner part
+viewport.follow(Coordinate(9, 6), 40, 20)
+assert (viewport.x, viewport.y) == (1, 1)
+viewport.follow(Coordinate(39, 19), 40, 20)
+assert (viewport.x, viewport.y) == (28, 12)     # clamped to the bottom right corner of the Map
+viewport.follow(Coordinate(30, 14), 40, 20)
+assert (viewport.x, viewport.y) == (27, 12)
+viewport.follow(Coordinate(0, 0), 40, 20)
+assert (viewport.x, viewport.y) == (0, 0)       # clamped to the top left corner of the Map
+viewport.follow(Coordinate(30, 5), 10, 30)
+assert (viewport.x, viewport.y) == (0, 0)       # Maps narrower than the Viewport are never scrolled horizontally
+viewport.reset()
+viewport.resize(0, -1)      # ignored like the size of a widget that wasn't laid out yet
+assert (viewport.width, viewport.height) == (12, 8)
+
+# the rendered rows are the visible part of the whole Map with the controllable on top
+return_code = Config.load()
+if return_code != 0:
+    print(f"Error #{return_code}")
+RandomManager(7)    # initialize RandomManager
+Logger(7)
+Logger.instance().set_popup(ignore, ignore)
+Popup.update_popup_functions(ignore)
+ConfirmationPopup.update_popup_function(ignore)
+cbp = CallbackPack(ignore, ignore, ignore, ignore, ignore)
+generator = RandomDungeonGenerator(7, ignore, AchievementManager())
+map, success = generator.generate(cbp, TestBot(3, gates=[HGate(), XGate(), YGate(), ZGate()]))
+assert success
+map.reveal()
+
+viewport = Viewport(23, 9)
+rm = random.Random(7)
+directions = [Direction.North, Direction.East, Direction.South, Direction.West]
+assert map.full_width > viewport.width and map.full_height > viewport.height
+scrolled_to = set()
+for step in range(2000):
+    map.move(rm.choice(directions))
+    rows = viewport.render(map)
+    pos = map.controllable_pos
+    scrolled_to.add((viewport.x, viewport.y))
+    assert 0 <= viewport.x <= map.full_width - viewport.width, step
+    assert 0 <= viewport.y <= map.full_height - viewport.height, step
+    assert viewport.x <= pos.x < viewport.x + viewport.width, step
+    assert viewport.y <= pos.y < viewport.y + viewport.height, step
+
+    full_rows = map.row_strings()
+    expected = [row[viewport.x:viewport.x + viewport.width]
+                for row in full_rows[viewport.y:viewport.y + viewport.height]]
+    x, y = pos.x - viewport.x, pos.y - viewport.y
+    expected[y] = expected[y][:x] + map.controllable_tile.get_img() + expected[y][x + 1:]
+    assert rows == expected, step
+assert len(scrolled_to) > 1     # the walk actually scrolled the Viewport
+print("the viewport follows the controllable and stays within the map")
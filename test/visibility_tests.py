@@ -0,0 +1,76 @@
+from game.map.rooms import SpawnRoom
+from game.map.visibility import VisibilityMap
+
+
+def visible_rooms(visibility: VisibilityMap) -> set:
+    return {(x, y) for y in range(visibility.height) for x in range(visibility.width)
+            if visibility.is_visible(visibility.slot(x, y))}
+
+
+def rect(x: int, y: int, width: int, height: int) -> set:
+    return {(rx, ry) for ry in range(y, y + height) for rx in range(x, x + width)}
+
+
+visibility = VisibilityMap(5, 4)
+visibility.reveal(1, 1, 2, 2)
+assert visible_rooms(visibility) == rect(1, 1, 2, 2)
+# the Hallways of a Room are revealed together with it
+for part in [VisibilityMap.ROOM, VisibilityMap.EAST_HALLWAY, VisibilityMap.SOUTH_HALLWAY]:
+    assert visibility.is_in_sight(visibility.slot(2, 2, part))
+    assert not visibility.is_visible(visibility.slot(3, 2, part))
+
+visibility.hide(2, 1, 1, 1)
+assert visible_rooms(visibility) == rect(1, 1, 2, 2) - {(2, 1)}
+visibility.hide()
+assert visible_rooms(visibility) == set()
+visibility.reveal()
+assert visible_rooms(visibility) == rect(0, 0, 5, 4)
+
+# rectangles reaching over the edges of the Map are clipped
+visibility = VisibilityMap(5, 4)
+visibility.reveal(-2, 0, 3, 1)
+assert visible_rooms(visibility) == {(0, 0)}
+visibility.reveal(0, -3, 1, 4)
+assert visible_rooms(visibility) == {(0, 0)}
+visibility.reveal(3, 2, 10, 10)
+assert visible_rooms(visibility) == {(0, 0)} | rect(3, 2, 2, 2)
+visibility.reveal(-1, -1, 2, 2)
+visibility.reveal(-10, 0, 3, 4)     # completely outside
+visibility.reveal(5, 0, 1, 1)
+assert visible_rooms(visibility) == {(0, 0)} | rect(3, 2, 2, 2)
+
+visibility.hide(-1, 1, 5, 10)
+assert visible_rooms(visibility) == {(0, 0), (4, 2), (4, 3)}
+visibility.hide(4, -2, 3, 5)
+assert visible_rooms(visibility) == {(0, 0), (4, 3)}
+
+# hiding keeps the visited state
+visibility.add(visibility.slot(4, 3), VisibilityMap.VISITED)
+visibility.hide()
+assert visible_rooms(visibility) == set()
+assert visibility.get(visibility.slot(4, 3)) == VisibilityMap.VISITED
+
+# per Room queries
+visibility = VisibilityMap(5, 4)
+visibility.reveal(1, 0, 2, 1)
+visibility.add(visibility.slot(4, 3), VisibilityMap.IN_SIGHT)
+assert visibility.is_room_visible(1, 0) and visibility.is_room_in_sight(2, 0)
+assert visibility.is_room_in_sight(4, 3) and not visibility.is_room_visible(4, 3)
+assert not visibility.is_room_in_sight(0, 0)
+assert visibility.count_visible_rooms() == 2
+visibility.add(visibility.slot(1, 0), VisibilityMap.VISITED)
+assert visibility.was_visited(visibility.slot(1, 0)) and not visibility.was_visited(visibility.slot(2, 0))
+
+# Areas only store a state of their own once it changes and move it into the Map's when they are attached
+untouched, revealed = SpawnRoom(lambda name, room: None), SpawnRoom(lambda name, room: None)
+assert untouched._Area__visibility is None
+revealed.make_visible()
+assert revealed._is_visible
+visibility = VisibilityMap(2, 1)
+untouched.attach_visibility(visibility, visibility.slot(0, 0, VisibilityMap.ROOM))
+revealed.attach_visibility(visibility, visibility.slot(1, 0, VisibilityMap.ROOM))
+assert not untouched._is_in_sight and revealed._is_visible
+assert visibility.is_room_visible(1, 0) and visibility.count_visible_rooms() == 1
+untouched.in_sight()
+assert visibility.is_room_in_sight(0, 0)
+print("visibility rectangles are clipped correctly")
@@ -0,0 +1,92 @@
+import atexit
+import queue
+import threading
+
+from util.config import PathConfig
+
+
+class BackgroundWriter:
+    """
+    Appends text to files on a separate thread, so the game loop never has to wait for the file system (e.g. when
+    the buffer of a logger is full). Consecutive writes to the same file that were queued in the meantime are combined
+    into a single one. The queue is bounded, hence if the disk cannot keep up the game waits instead of its memory
+    growing without limit.
+
+    Everything queued is written before the interpreter exits, flush() waits for it earlier (e.g. before an error is
+    raised). Without a running thread (after stop() or in a forked process) writes are done immediately.
+    """
+    __QUEUE_SIZE = 64
+    __instance = None
+
+    @staticmethod
+    def instance() -> "BackgroundWriter":
+        if BackgroundWriter.__instance is None:
+            BackgroundWriter()
+        return BackgroundWriter.__instance
+
+    def __init__(self):
+        if BackgroundWriter.__instance is not None:
+            raise Exception("This class is a singleton!")
+        self.__queue = queue.Queue(maxsize=BackgroundWriter.__QUEUE_SIZE)
+        self.__thread = threading.Thread(target=self.__run, name="Qrogue-Writer", daemon=True)
+        self.__thread.start()
+        # daemon threads are not waited for, so we have to stop it ourselves
+        atexit.register(self.stop)
+        BackgroundWriter.__instance = self
+
+    def write(self, file_name: str, text: str, newline: str = None):
+        """
+        Appends text to the file (which is created if it doesn't exist yet).
+
+        :param file_name: path of the file relative to the base path
+        :param text: the text to append
+        :param newline: how line endings are translated, see PathConfig.write()
+        """
+        if self.__thread.is_alive():
+            self.__queue.put((file_name, text, newline))
+        else:
+            PathConfig.write(file_name, text, may_exist=True, append=True, newline=newline)
+
+    def flush(self):
+        """
+        Waits until everything queued so far is written.
+        """
+        if self.__thread.is_alive():
+            self.__queue.join()
+
+    def stop(self):
+        """
+        Writes everything queued so far and stops the thread.
+        """
+        if self.__thread.is_alive():
+            self.__queue.put(None)
+            self.__thread.join()
+
+    def __run(self):
+        running = True
+        while running:
+            items = [self.__queue.get()]
+            while True:
+                try:
+                    items.append(self.__queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            writes = []     # [file_name, newline, texts]
+            for item in items:
+                if item is None:
+                    running = False
+                    continue
+                file_name, text, newline = item
+                if len(writes) > 0 and writes[-1][0] == file_name and writes[-1][1] == newline:
+                    writes[-1][2].append(text)
+                else:
+                    writes.append([file_name, newline, [text]])
+            for file_name, newline, texts in writes:
+                try:
+                    PathConfig.write(file_name, "".join(texts), may_exist=True, append=True, newline=newline)
+                except OSError as error:
+                    # the thread has to keep running, otherwise everyone flushing would wait forever
+                    print(f"[Qrogue] Failed to write to {file_name}: {error}")
+            for _ in items:
+                self.__queue.task_done()
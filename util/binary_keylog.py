@@ -0,0 +1,214 @@
+import itertools
+import struct
+from typing import Iterator
+
+from util.config import Config, FileTypes, PathConfig
+
+
+class BinaryKeyLog:
+    """
+    Compact, versioned binary representation of a keylog (.qrkb). Consecutive identical keys (e.g. walking along a
+    corridor) are stored as a single run and every KEYS_PER_BLOCK keys a new block starts, so replaying from an
+    arbitrary key index doesn't have to decode all the keys before it.
+
+    Layout (little endian):
+        header: magic, format version (H), seed (q), number of keys (I), number of blocks (I), size of the keys (I),
+                followed by the keylog format of the keys (H, see Config.KEYLOG_FORMAT, format version 1 files don't
+                have it and always contain keylog format 1) as well as the game version, the recording time and the
+                gameplay config as UTF-8 strings which are prefixed by their length (H)
+        index:  per block the offset of its first key relative to the first key and the index of its first key (I, I)
+        keys:   the key codes, except for runs of at least MIN_RUN_LENGTH identical codes which are stored as RUN_MARKER
+                followed by the length of the run and the code (B, B, B)
+
+    The key codes are the UTF-8 encoded characters of the .qrkl-file, so converting it back results in the very same
+    text. Since RUN_MARKER never occurs in UTF-8, a binary keylog is never bigger than the keys of the .qrkl-file. The
+    data is only accessed through a memoryview, hence decoding doesn't copy it.
+    """
+    MAGIC = b"QRKB"
+    FORMAT_VERSION = 2
+    KEYS_PER_BLOCK = 1024
+    RUN_MARKER = 0xFF
+    MIN_RUN_LENGTH = 4     # shorter runs would not be smaller than their codes
+
+    __ENCODING = "utf-8"
+    __MAX_RUN_LENGTH = 255
+    __HEADER = struct.Struct("<4sHqIII")
+    __LOG_FORMAT = struct.Struct("<H")
+    __STRING_LENGTH = struct.Struct("<H")
+    __BLOCK = struct.Struct("<II")
+
+    @staticmethod
+    def from_text(text: str) -> bytes:
+        """
+        :param text: content of a .qrkl-file
+        :return: the binary representation of text
+        """
+        head = Config.parse_log_head(text)
+        if head is None:
+            raise ValueError("The keylog has no header!")
+        version, seed, time, config, log_format, keys_start = head
+        if Config.format_log_head(version, seed, time, config, log_format) != text[:keys_start]:
+            raise ValueError("The header of the keylog cannot be converted losslessly!")
+
+        index = bytearray()
+        keys = bytearray()
+        num_of_keys = 0
+        next_block = 0
+        for code, group in itertools.groupby(text[keys_start:].encode(BinaryKeyLog.__ENCODING)):
+            count = sum(1 for _ in group)
+            while count > 0:
+                if num_of_keys >= next_block:
+                    # blocks start at the next run or code after every KEYS_PER_BLOCK keys
+                    index += BinaryKeyLog.__BLOCK.pack(len(keys), num_of_keys)
+                    next_block = num_of_keys + BinaryKeyLog.KEYS_PER_BLOCK
+                run_length = min(count, BinaryKeyLog.__MAX_RUN_LENGTH)
+                if run_length >= BinaryKeyLog.MIN_RUN_LENGTH:
+                    keys += bytes((BinaryKeyLog.RUN_MARKER, run_length, code))
+                else:
+                    run_length = 1
+                    keys.append(code)
+                num_of_keys += run_length
+                count -= run_length
+
+        data = bytearray(BinaryKeyLog.__HEADER.pack(BinaryKeyLog.MAGIC, BinaryKeyLog.FORMAT_VERSION, seed,
+                                                    num_of_keys, len(index) // BinaryKeyLog.__BLOCK.size, len(keys)))
+        data += BinaryKeyLog.__LOG_FORMAT.pack(log_format)
+        for string in [version, time, config]:
+            encoded = string.encode(BinaryKeyLog.__ENCODING)
+            data += BinaryKeyLog.__STRING_LENGTH.pack(len(encoded))
+            data += encoded
+        data += index
+        data += keys
+        return bytes(data)
+
+    @staticmethod
+    def convert(path: str, in_keylog_folder: bool = True) -> str:
+        """
+        Converts a .qrkl-file into a .qrkb-file with the same name next to it. The conversion is checked to be
+        lossless.
+
+        :param path: path of the .qrkl-file
+        :param in_keylog_folder: whether path is relative to the keylog folder or not
+        :return: path of the created .qrkb-file
+        """
+        text = str(PathConfig.map_keylog(path, in_keylog_folder), BinaryKeyLog.__ENCODING)
+        data = BinaryKeyLog.from_text(text)
+        if BinaryKeyLog(data).to_text() != text:
+            raise ValueError(f"\"{path}\" cannot be converted losslessly!")
+
+        if path.endswith(FileTypes.KeyLog.value):
+            path = path[:-len(FileTypes.KeyLog.value)]
+        path += FileTypes.BinaryKeyLog.value
+        PathConfig.write_binary_keylog(path, data, in_keylog_folder)
+        return path
+
+    @staticmethod
+    def read(path: str, in_keylog_folder: bool = True) -> "BinaryKeyLog":
+        """
+        :param path: path of the .qrkb-file
+        :param in_keylog_folder: whether path is relative to the keylog folder or not
+        """
+        return BinaryKeyLog(PathConfig.map_keylog(path, in_keylog_folder, FileTypes.BinaryKeyLog))
+
+    def __init__(self, data):
+        """
+
+        :param data: a bytes-like object containing a binary keylog
+        """
+        self.__data = memoryview(data)
+        if len(self.__data) < BinaryKeyLog.__HEADER.size:
+            raise ValueError("Binary keylog is too short!")
+        magic, format_version, self.__seed, self.__num_of_keys, self.__num_of_blocks, keys_size = \
+            BinaryKeyLog.__HEADER.unpack_from(self.__data)
+        if magic != BinaryKeyLog.MAGIC:
+            raise ValueError("Not a binary keylog!")
+        if format_version > BinaryKeyLog.FORMAT_VERSION:
+            raise ValueError(f"Unsupported binary keylog format: {format_version}")
+
+        offset = BinaryKeyLog.__HEADER.size
+        self.__log_format = 1
+        if format_version >= 2:
+            self.__log_format, = BinaryKeyLog.__LOG_FORMAT.unpack_from(self.__data, offset)
+            offset += BinaryKeyLog.__LOG_FORMAT.size
+        self.__version, offset = self.__read_string(offset)
+        self.__time, offset = self.__read_string(offset)
+        self.__config, offset = self.__read_string(offset)
+        self.__index_start = offset
+        self.__keys_start = offset + self.__num_of_blocks * BinaryKeyLog.__BLOCK.size
+        if self.__keys_start + keys_size != len(self.__data):
+            raise ValueError("Binary keylog is truncated!")
+
+    def __read_string(self, offset: int) -> (str, int):
+        length, = BinaryKeyLog.__STRING_LENGTH.unpack_from(self.__data, offset)
+        offset += BinaryKeyLog.__STRING_LENGTH.size
+        return str(self.__data[offset:offset + length], BinaryKeyLog.__ENCODING), offset + length
+
+    def __block(self, index: int) -> (int, int):
+        return BinaryKeyLog.__BLOCK.unpack_from(self.__data, self.__index_start + index * BinaryKeyLog.__BLOCK.size)
+
+    @property
+    def version(self) -> str:
+        return self.__version
+
+    @property
+    def seed(self) -> int:
+        return self.__seed
+
+    @property
+    def time(self) -> str:
+        return self.__time
+
+    @property
+    def config(self) -> str:
+        return self.__config
+
+    @property
+    def log_format(self) -> int:
+        return self.__log_format
+
+    @property
+    def num_of_keys(self) -> int:
+        """
+        :return: number of logged key codes (including the ones that don't decode to a valid key)
+        """
+        return self.__num_of_keys
+
+    def codes(self, start: int = 0) -> Iterator[int]:
+        """
+        :param start: index of the first key to return
+        :return: the codes of the logged keys beginning at start
+        """
+        if start >= self.__num_of_keys or self.__num_of_blocks <= 0:
+            return
+        # binary search for the last block starting at or before start
+        low, high = 0, self.__num_of_blocks - 1
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.__block(mid)[1] <= start:
+                low = mid
+            else:
+                high = mid - 1
+        offset, key_index = self.__block(low)
+
+        keys = self.__data[self.__keys_start + offset:]
+        offset = 0
+        while offset < len(keys):
+            code = keys[offset]
+            if code == BinaryKeyLog.RUN_MARKER:
+                count, code = keys[offset + 1], keys[offset + 2]
+                offset += 3
+                if key_index + count > start:
+                    yield from itertools.repeat(code, min(count, key_index + count - start))
+                key_index += count
+            else:
+                offset += 1
+                if key_index >= start:
+                    yield code
+                key_index += 1
+
+    def to_text(self) -> str:
+        """
+        :return: the content of the .qrkl-file this binary keylog represents
+        """
+        head = Config.format_log_head(self.__version, self.__seed, self.__time, self.__config, self.__log_format)
+        return head + str(bytes(self.codes()), BinaryKeyLog.__ENCODING)
@@ -1,4 +1,5 @@
 import enum
+import mmap
 import os
 from datetime import datetime
 
@@ -7,7 +8,10 @@ import py_cui
 
 class FileTypes(enum.Enum):
     Log = ".qrlog"
+    FrameTrace = ".qrft"
     KeyLog = ".qrkl"
+    BinaryKeyLog = ".qrkb"
+    ReplaySnapshots = ".qrsnap"
     ScreenPrint = ".qrsc"
     Save = ".qrsave"
     Dungeon = ".qrdg"
@@ -70,6 +74,11 @@ class PathConfig:
         now_str = PathConfig.__now_str()
         return os.path.join(PathConfig.__LOG_FOLDER, f"{now_str}_seed{seed}{FileTypes.Log.value}")
 
+    @staticmethod
+    def new_frame_trace_file(seed: int) -> str:
+        now_str = PathConfig.__now_str()
+        return os.path.join(PathConfig.__LOG_FOLDER, f"{now_str}_seed{seed}{FileTypes.FrameTrace.value}")
+
     @staticmethod
     def new_key_log_file(seed) -> (str, str):
         now_str = PathConfig.__now_str()
@@ -103,7 +112,15 @@ class PathConfig:
         return f"qrogue-save{PathConfig.__SAVE_FILE_NUMERATION_SEPARATOR}{num}{FileTypes.Save.value}"
 
     @staticmethod
-    def write(file_name: str, text: str, may_exist: bool = True, append: bool = False):
+    def write(file_name: str, text: str, may_exist: bool = True, append: bool = False, newline: str = None):
+        """
+
+        :param file_name: path of the file relative to the base path
+        :param text: the text to write
+        :param may_exist: whether an existing file may be overwritten or not
+        :param append: whether the text should be appended to an existing file or not
+        :param newline: how line endings are translated, see open() (e.g. "" to keep them as they are)
+        """
         path = PathConfig.base_path(file_name)
         mode = "x"
         if may_exist:
@@ -111,25 +128,63 @@ class PathConfig:
                 mode = "w"
                 if append:
                     mode = "a"
-        with open(path, mode) as file:
+        with open(path, mode, newline=newline) as file:
             file.write(text)
 
     @staticmethod
-    def read_keylog_buffered(file_name: str, in_keylog_folder: bool = True, buffer_size: int = 1024) -> str:
-        if not file_name.endswith(FileTypes.KeyLog.value):
-            file_name += FileTypes.KeyLog.value
+    def keylog_path(file_name: str, in_keylog_folder: bool = True, file_type: FileTypes = FileTypes.KeyLog) -> str:
+        """
+
+        :param file_name: name of the keylog, file_type's extension is added if it is missing
+        :param in_keylog_folder: whether file_name is relative to the keylog folder or not
+        :param file_type: either KeyLog or BinaryKeyLog
+        :return: the path of the keylog file
+        """
+        if not file_name.endswith(file_type.value):
+            file_name += file_type.value
         if in_keylog_folder:
-            path = PathConfig.base_path(os.path.join(PathConfig.__KEY_LOG_FOLDER, file_name))
-        else:
-            path = file_name
-        if os.path.exists(path):
-            with open(path, "r") as file:
-                data = file.read(buffer_size)
-                while data:
-                    yield data
-                    data = file.read(buffer_size)
-        else:
+            return PathConfig.base_path(os.path.join(PathConfig.__KEY_LOG_FOLDER, file_name))
+        return file_name
+
+    @staticmethod
+    def replay_snapshots_path(keylog_file: str, in_keylog_folder: bool = True) -> str:
+        """
+
+        :param keylog_file: name of a keylog (.qrkl- or .qrkb-file)
+        :param in_keylog_folder: whether keylog_file is relative to the keylog folder or not
+        :return: the path of the file next to the keylog containing the snapshots of its replay
+        """
+        for file_type in [FileTypes.KeyLog, FileTypes.BinaryKeyLog]:
+            if keylog_file.endswith(file_type.value):
+                keylog_file = keylog_file[:-len(file_type.value)]
+        return PathConfig.keylog_path(keylog_file, in_keylog_folder, FileTypes.ReplaySnapshots)
+
+    @staticmethod
+    def map_keylog(file_name: str, in_keylog_folder: bool = True, file_type: FileTypes = FileTypes.KeyLog):
+        """
+        Maps the whole keylog read-only into memory. Hence, it can be accessed like a single bytes object (e.g. through
+        a memoryview) without reading or copying it first and the operating system only loads the parts that are
+        actually accessed.
+
+        :param file_name: name of the keylog, file_type's extension is added if it is missing
+        :param in_keylog_folder: whether file_name is relative to the keylog folder or not
+        :param file_type: either KeyLog or BinaryKeyLog
+        :return: the mmap of the keylog (or empty bytes if the file is empty since these cannot be mapped)
+        """
+        path = PathConfig.keylog_path(file_name, in_keylog_folder, file_type)
+        if not os.path.exists(path):
             raise FileNotFoundError(f"There is no such key log file: {path}")
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size <= 0:
+                return b""
+            # the mapping stays valid after the file is closed
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def write_binary_keylog(file_name: str, data: bytes, in_keylog_folder: bool = True, may_exist: bool = False):
+        path = PathConfig.keylog_path(file_name, in_keylog_folder, FileTypes.BinaryKeyLog)
+        with open(path, "wb" if may_exist else "xb") as file:
+            file.write(data)
 
     @staticmethod
     def read_world(file_name: str, in_dungeon_folder: bool = True):
@@ -425,6 +480,9 @@ class GameplayConfig:
     __LOG_KEYS = "Log Keys"
     __SIMULATION_KEY_PAUSE = "Simulation key pause"
     __GAMEPLAY_KEY_PAUSE = "Gameplay key pause"
+    __SIMULATION_SPEED = "Simulation speed"
+    __STATE_HASH_INTERVAL = "State hash interval"
+    __LARGE_DUNGEON_SIZE = "Large dungeon size"
     __CONFIG = {
         __AUTO_RESET_CIRCUIT: ("True", "Automatically reset your Circuit to a clean state at the beginning of a Fight, "
                                      "Riddle, etc."),
@@ -432,6 +490,13 @@ class GameplayConfig:
                            "bug)"),
         __SIMULATION_KEY_PAUSE: ("0.2", "How long to wait before we process the next input during simulation."),
         __GAMEPLAY_KEY_PAUSE: ("0.1", "How long to wait before we process the next input during gameplay."),
+        __SIMULATION_SPEED: ("500", "How many keys per second are simulated while fast-forwarding a simulation (toggled "
+                                    "with P). Only a few frames per second and the screens of new states are drawn."),
+        __STATE_HASH_INTERVAL: ("100", "After how many keys a hash of the game's state is stored in the .qrkl-file so "
+                                       "replays can detect where they differ from the recorded run (0 to disable)."),
+        __LARGE_DUNGEON_SIZE: ("0", "If bigger than 0, levels are replaced by random dungeons with that many Rooms "
+                                    "per row and column that are only created while you explore them (0 to play the "
+                                    "normal levels)."),
     }
 
     @staticmethod
@@ -476,6 +541,33 @@ class GameplayConfig:
         except:
             return 0.4
 
+    @staticmethod
+    def simulation_speed() -> int:
+        try:
+            return int(GameplayConfig.__CONFIG[GameplayConfig.__SIMULATION_SPEED][0])
+        except:
+            return 500
+
+    @staticmethod
+    def state_hash_interval() -> int:
+        try:
+            return int(GameplayConfig.__CONFIG[GameplayConfig.__STATE_HASH_INTERVAL][0])
+        except:
+            return 0
+
+    @staticmethod
+    def large_dungeon_size() -> int:
+        try:
+            return int(GameplayConfig.__CONFIG[GameplayConfig.__LARGE_DUNGEON_SIZE][0])
+        except:
+            return 0
+
+    @staticmethod
+    def set_large_dungeon_size(size: int):
+        # stored like the other options, so keylogs record it in their header and replays use it too
+        entry = GameplayConfig.__CONFIG[GameplayConfig.__LARGE_DUNGEON_SIZE]
+        GameplayConfig.__CONFIG[GameplayConfig.__LARGE_DUNGEON_SIZE] = [str(size)] + list(entry[1:])
+
 
 class Config:   # todo make singleton and handle access to other configs?
     MAX_SEED = 1000000
@@ -484,10 +576,16 @@ class Config:   # todo make singleton and handle access to other configs?
     __GAMEPLAY_HEAD = "[Gameplay]\n"
     __DEBUG = False
 
-    __HEADER = "Qrogue "
-    __SEED_HEAD = "Seed="
-    __TIME_HEAD = "Time="
-    __CONFIG_HEAD = "[Config]"
+    HEADER = "Qrogue "
+    SEED_HEAD = "Seed="
+    TIME_HEAD = "Time="
+    FORMAT_HEAD = "Format="
+    CONFIG_HEAD = "[Config]"
+    # version of how keys are logged, logs without a FORMAT_HEAD line are of format 1:
+    # 1 - logging starts with the first level, whose state cannot be reconstructed from the seed in the head
+    # 2 - logging starts when PLAY is pressed with the game's seed and every key is logged as the action it triggers
+    #     (format 1 logged nearly all keys as Invalid)
+    KEYLOG_FORMAT = 2
 
     @staticmethod
     def scientist_name() -> str:
@@ -508,12 +606,65 @@ class Config:   # todo make singleton and handle access to other configs?
     @staticmethod
     def get_log_head(seed: int) -> str:
         now_str = datetime.now().strftime("%d%m%Y_%H%M%S")
-        head = f"{Config.__HEADER}{Config.version()}\n"
-        head += f"{Config.__SEED_HEAD}{seed}\n"
-        head += f"{Config.__TIME_HEAD}{now_str}\n\n"
-        head += f"{Config.__CONFIG_HEAD}\n{GameplayConfig.to_file_text()}\n"
+        # to_file_text() ends with a newline, so the head ends with an empty line
+        return Config.format_log_head(Config.version(), seed, now_str, GameplayConfig.to_file_text()[:-1])
+
+    @staticmethod
+    def format_log_head(version: str, seed: int, time: str, config: str, log_format: int = KEYLOG_FORMAT) -> str:
+        head = f"{Config.HEADER}{version}\n"
+        head += f"{Config.SEED_HEAD}{seed}\n"
+        head += f"{Config.TIME_HEAD}{time}\n"
+        if log_format > 1:
+            head += f"{Config.FORMAT_HEAD}{log_format}\n"
+        head += "\n"
+        head += f"{Config.CONFIG_HEAD}\n{config}\n\n"
         return head
 
+    @staticmethod
+    def parse_log_head(text: str) -> (str, int, str, str, int, int):
+        """
+        Counterpart of format_log_head().
+
+        :param text: the beginning of a log, has to contain the whole head
+        :return: version, seed, time and config text of the head, the keylog format as well as the index in text where
+        the head ends or None if text doesn't start with a head
+        """
+        if not text.startswith(Config.HEADER):
+            return None
+        version_start = len(Config.HEADER)
+        version_end = text.index("\n", version_start)
+        seed_start = text.index(Config.SEED_HEAD, version_end) + len(Config.SEED_HEAD)
+        seed_end = text.index("\n", seed_start)
+        time_start = text.index(Config.TIME_HEAD, seed_end) + len(Config.TIME_HEAD)
+        time_end = text.index("\n", time_start)
+        config_start = text.index(Config.CONFIG_HEAD, time_end) + len(Config.CONFIG_HEAD) + 1  # skip its line break
+        config_end = text.index("\n\n", config_start)
+        log_format = 1
+        if text.startswith(Config.FORMAT_HEAD, time_end + 1):
+            format_start = time_end + 1 + len(Config.FORMAT_HEAD)
+            log_format = int(text[format_start:text.index("\n", format_start)])
+        return text[version_start:version_end], int(text[seed_start:seed_end]), text[time_start:time_end], \
+            text[config_start:config_end], log_format, config_end + 2
+
+    @staticmethod
+    def find_log_head_end(data) -> int:
+        """
+        Like parse_log_head() but for the undecoded content of a log, e.g. so only the head has to be decoded.
+
+        :param data: a bytes-like object (e.g. a mmap) containing the UTF-8 encoded log
+        :return: the index of the first byte after the head or 0 if there is no head
+        """
+        header = Config.HEADER.encode("utf-8")
+        if data[:len(header)] != header:
+            return 0
+        config_start = data.find(Config.CONFIG_HEAD.encode("utf-8"))
+        if config_start < 0:
+            return 0
+        config_end = data.find(b"\n\n", config_start)
+        if config_end < 0:
+            return 0
+        return config_end + 2
+
     @staticmethod
     def config_file() -> str:
         return Config.__GAME_CONFIG
@@ -0,0 +1,137 @@
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from util.background_writer import BackgroundWriter
+from util.config import PathConfig
+from util.logger import Logger
+
+
+class FrameProfiler:
+    """
+    Measures how long the phases of every frame of the CUI take (e.g. handling the input or drawing). The durations
+    of the last frames are kept for rolling statistics (shown in the HUD in debug mode) and every frame is written to
+    a timing trace in the logs folder.
+
+    Phases can be nested, e.g. rendering the map happens while handling the input. A phase's duration only contains
+    the time not spent in the phases nested inside of it.
+
+    Usage:
+        profiler.begin_frame()
+        profiler.begin(FrameProfiler.INPUT)
+        ...
+        profiler.end(FrameProfiler.INPUT)
+        profiler.end_frame()
+
+    If no FrameProfiler was created, instance() returns a disabled one that doesn't even query the clock.
+    """
+    INPUT = "input"
+    SIMULATION = "simulation"
+    MAP = "map"
+    DRAW = "draw"
+    PHASES = [INPUT, SIMULATION, MAP, DRAW]
+
+    WINDOW_SIZE = 120
+    __BUFFER_SIZE = 64     # number of frames that are buffered before the trace is written
+    __instance = None
+    __disabled = None
+
+    @staticmethod
+    def instance() -> "FrameProfiler":
+        if FrameProfiler.__instance is None:
+            if FrameProfiler.__disabled is None:
+                FrameProfiler.__disabled = FrameProfiler(0, enabled=False)
+            return FrameProfiler.__disabled
+        return FrameProfiler.__instance
+
+    def __init__(self, seed: int, enabled: bool = True):
+        """
+
+        :param seed: seed of the game, used for the name of the trace file
+        :param enabled: disabled profilers ignore everything and don't become the instance
+        """
+        self.__enabled = enabled
+        self.__windows: Dict[str, deque] = {phase: deque(maxlen=FrameProfiler.WINDOW_SIZE)
+                                            for phase in FrameProfiler.PHASES}
+        self.__cur_frame: Optional[Dict[str, float]] = None
+        self.__stack = []   # [phase, start, duration of the nested phases]
+        self.__frames = 0
+        self.__buffer = []
+        if enabled:
+            if FrameProfiler.__instance is not None:
+                Logger.instance().throw(Exception("This class is a singleton!"))
+            self.__trace_file = PathConfig.new_frame_trace_file(seed)
+            self.__buffer.append(",".join(["frame"] + FrameProfiler.PHASES) + "\n")
+            FrameProfiler.__instance = self
+
+    @property
+    def enabled(self) -> bool:
+        return self.__enabled
+
+    @property
+    def frames(self) -> int:
+        return self.__frames
+
+    def begin_frame(self):
+        if not self.__enabled:
+            return
+        self.__cur_frame = {phase: 0.0 for phase in FrameProfiler.PHASES}
+        self.__stack = []
+
+    def begin(self, phase: str):
+        if not self.__enabled or self.__cur_frame is None:
+            return
+        self.__stack.append([phase, time.perf_counter(), 0.0])
+
+    def end(self, phase: str):
+        if not self.__enabled or self.__cur_frame is None or len(self.__stack) <= 0:
+            return
+        cur_phase, start, nested = self.__stack.pop()
+        if cur_phase != phase:
+            # begin() and end() don't match (e.g. due to an exception), so we cannot trust the measurement
+            self.__stack = []
+            return
+        duration = time.perf_counter() - start
+        self.__cur_frame[phase] += duration - nested
+        if len(self.__stack) > 0:
+            self.__stack[-1][2] += duration
+
+    def end_frame(self):
+        if not self.__enabled or self.__cur_frame is None:
+            return
+        for phase in FrameProfiler.PHASES:
+            self.__windows[phase].append(self.__cur_frame[phase])
+        self.__buffer.append(",".join([str(self.__frames)] +
+                                      [f"{self.__cur_frame[phase] * 1000:.4f}" for phase in FrameProfiler.PHASES])
+                             + "\n")
+        self.__frames += 1
+        self.__cur_frame = None
+        if len(self.__buffer) >= FrameProfiler.__BUFFER_SIZE:
+            self.flush()
+
+    def stats(self, phase: str) -> (float, float, float):
+        """
+        :param phase: the phase we want to know the statistics of
+        :return: p50, p95 and maximum duration of the phase in milliseconds over the last WINDOW_SIZE frames
+        """
+        values = sorted(self.__windows[phase])
+        if len(values) <= 0:
+            return 0, 0, 0
+        p50 = values[int(0.5 * (len(values) - 1))]
+        p95 = values[int(0.95 * (len(values) - 1))]
+        return p50 * 1000, p95 * 1000, values[-1] * 1000
+
+    def summary(self) -> str:
+        """
+        :return: one line with p50/p95/max of every phase in milliseconds
+        """
+        parts = []
+        for phase in FrameProfiler.PHASES:
+            p50, p95, max_ = self.stats(phase)
+            parts.append(f"{phase} {p50:.2f}/{p95:.2f}/{max_:.2f}")
+        return "  ".join(parts) + " ms"
+
+    def flush(self):
+        if self.__enabled and len(self.__buffer) > 0:
+            BackgroundWriter.instance().write(self.__trace_file, "".join(self.__buffer))
+            self.__buffer = []
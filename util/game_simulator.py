@@ -1,48 +1,68 @@
+import itertools
+import string
+from typing import Optional, Tuple
+
 from game.controls import Controls, Keys
-from util.config import PathConfig, GameplayConfig, Config
+from util.binary_keylog import BinaryKeyLog
+from util.config import PathConfig, GameplayConfig, Config, FileTypes
 from util.key_logger import KeyLogger
 from util.logger import Logger
 
 
 class GameSimulator:
     __ENCODING = "utf-8"
-    __BUFFER_SIZE = 1024
+    __STATE_HASH_CODE = ord(KeyLogger.STATE_HASH_HEAD)
 
-    def __init__(self, controls: Controls, path: str, in_keylog_folder: bool = True, debug_print: bool = False):
-        self.__controls = controls
+    def __init__(self, controls: Controls, path: str, in_keylog_folder: bool = True, debug_print: bool = False,
+                 notification_popup: bool = True):
+        """
 
-        self.__reader = PathConfig.read_keylog_buffered(path, in_keylog_folder, buffer_size=GameSimulator.__BUFFER_SIZE)
-        self.__cur_chunk = self.__next_chunk()
-        # due to yield we don't immediately return None so self.__reader will not be None but self.__cur_chunk instead
-        if self.__cur_chunk is None:
-            Logger.instance().error("invalid path!")
-            return
-        self.__cur_index = -1
-        self.__notification_popup = True
+        :param controls: used to decode the logged keys
+        :param path: path of the .qrkl- or .qrkb-file to simulate
+        :param in_keylog_folder: whether path is relative to the keylog folder or not
+        :param debug_print: whether the header and keys should be printed (only in debug mode)
+        :param notification_popup: whether a popup informing about the simulation is shown before the first key and
+        therefore needs to be closed first
+        """
+        self.__controls = controls
+        self.__version = None
+        self.__seed = None
+        self.__time = None
+        self.__log_format = Config.KEYLOG_FORMAT
+        self.__num_of_keys = 0
+        self.__position = 0
+        self.__notification_popup = notification_popup
+        self.__binary_keylog = None
+        self.__state_hash = None
+
+        config = None
+        if path.endswith(FileTypes.BinaryKeyLog.value):
+            self.__binary_keylog = BinaryKeyLog.read(path, in_keylog_folder)
+            keylog = self.__binary_keylog
+            self.__version, self.__seed, self.__time, config = keylog.version, keylog.seed, keylog.time, \
+                keylog.config
+            self.__log_format = keylog.log_format
+            self.__codes = keylog.codes()
+        else:
+            data = PathConfig.map_keylog(path, in_keylog_folder)
+            if len(data) <= 0:
+                Logger.instance().error("invalid path!")
+                self.__keys = memoryview(b"")
+                self.__codes = iter(self.__keys)
+                return
+            head_end = Config.find_log_head_end(data)
+            if head_end > 0:
+                # only the head is decoded, the keys are used as they are
+                head_text = str(data[:head_end], GameSimulator.__ENCODING)
+                self.__version, self.__seed, self.__time, config, self.__log_format, _ = \
+                    Config.parse_log_head(head_text)
+            self.__keys = memoryview(data)[head_end:]
+            self.__codes = iter(self.__keys)
 
         # change the config so we can reproduce the run (e.g. different auto reset would destroy the simulation)
-        if self.__cur_chunk.startswith(bytes(KeyLogger.HEADER, GameSimulator.__ENCODING)):
-            version_start = len(KeyLogger.HEADER)
-            version_end = self.__cur_chunk.index(bytes("\n", GameSimulator.__ENCODING), version_start)
-            self.__version = str(self.__cur_chunk[version_start:version_end], GameSimulator.__ENCODING)
-            seed_start = self.__cur_chunk.index(bytes(KeyLogger.SEED_HEAD, GameSimulator.__ENCODING), version_end) \
-                         + len(KeyLogger.SEED_HEAD)
-            seed_end = self.__cur_chunk.index(bytes("\n", GameSimulator.__ENCODING), seed_start)
-            self.__seed = int(self.__cur_chunk[seed_start:seed_end])
-            time_start = self.__cur_chunk.index(bytes(KeyLogger.TIME_HEAD, GameSimulator.__ENCODING), seed_end) \
-                         + len(KeyLogger.TIME_HEAD)
-            time_end = self.__cur_chunk.index(bytes("\n", GameSimulator.__ENCODING), time_start)
-            self.__time = str(self.__cur_chunk[time_start:time_end], GameSimulator.__ENCODING)
-
-            start = self.__cur_chunk.index(bytes(KeyLogger.CONFIG_HEAD, GameSimulator.__ENCODING), seed_end) \
-                    + len(KeyLogger.CONFIG_HEAD) + 1  # start at the first line after CONFIG_HEAD
-            end = self.__cur_chunk.index(bytes("\n\n", GameSimulator.__ENCODING), start)
-            config = str(self.__cur_chunk[start:end], GameSimulator.__ENCODING)
+        if config is not None:
             GameplayConfig.from_log_text(config)
 
-            # continue at the second \n because for next key we start with going to the next position
-            self.__cur_index = end + 1
-
         if Config.debugging() and debug_print:
             print(self.__version)
             print(self.__seed)
@@ -68,28 +88,65 @@ class GameSimulator:
     def time(self) -> str:
         return self.__time
 
-    def __next_chunk(self) -> bytes:
-        try:
-            chunk = next(self.__reader)
-            self.__cur_index = -1
-            return bytes(chunk, GameSimulator.__ENCODING)
-        except StopIteration:
-            return None
+    @property
+    def log_format(self) -> int:
+        """
+        :return: the format the keys were logged in (see Config.KEYLOG_FORMAT)
+        """
+        return self.__log_format
+
+    @property
+    def num_of_keys(self) -> int:
+        """
+        :return: number of keys simulated so far
+        """
+        return self.__num_of_keys
+
+    @property
+    def position(self) -> int:
+        """
+        :return: number of logged key codes read so far (including the ones that are no valid key)
+        """
+        return self.__position
 
-    def __next_key(self) -> int:
+    def skip_to(self, position: int, num_of_keys: int):
         """
+        Continues the simulation at a later point without pressing the keys in between, e.g. after the game was
+        restored from a snapshot taken at this point.
 
-        :return: the next key or -1 if we should retry (self.__cur_chunk is None if we reached the end)
+        :param position: the position to continue at
+        :param num_of_keys: number of keys simulated until this position
         """
-        self.__cur_index += 1
-        if 0 <= self.__cur_index < len(self.__cur_chunk):
-            code = self.__cur_chunk[self.__cur_index]
-            key = self.__controls.decode(code)
-            if key:
-                return key
+        if position < self.__position:
+            Logger.instance().throw(ValueError(f"Cannot skip back from {self.__position} to {position}!"))
+        if self.__binary_keylog is not None:
+            self.__codes = self.__binary_keylog.codes(position)
         else:
-            self.__cur_chunk = self.__next_chunk()
-        return -1
+            self.__codes = iter(self.__keys[position:])
+        self.__position = position
+        self.__num_of_keys = num_of_keys
+
+    def pop_state_hash(self) -> Optional[Tuple[int, str]]:
+        """
+        :return: the number of keys and the hash of the recorded game's state after them if a state hash was read by
+        the last call of next() (only returned once), None otherwise
+        """
+        state_hash = self.__state_hash
+        self.__state_hash = None
+        return state_hash
+
+    def __read_state_hash(self):
+        digits = []
+        for code in self.__codes:
+            if chr(code) not in string.hexdigits:
+                # not a state hash after all, so the code has to be simulated as usual
+                self.__codes = itertools.chain((code,), self.__codes)
+                return
+            self.__position += 1
+            digits.append(chr(code))
+            if len(digits) >= KeyLogger.STATE_HASH_LENGTH:
+                self.__state_hash = self.__num_of_keys, "".join(digits)
+                return
 
     def next(self) -> int:
         """
@@ -99,8 +156,16 @@ class GameSimulator:
         if self.__notification_popup:
             self.__notification_popup = False
             return self.__controls.get_key(Keys.PopupClose)
-        while self.__cur_chunk is not None:
-            key = self.__next_key()
-            if key > -1:
+        # __read_state_hash() can replace the iterator to push back a code, so we must not hold on to the old one
+        while True:
+            code = next(self.__codes, None)
+            if code is None:
+                return None
+            self.__position += 1
+            if code == GameSimulator.__STATE_HASH_CODE:
+                self.__read_state_hash()
+                continue
+            key = self.__controls.decode(code)
+            if key:
+                self.__num_of_keys += 1
                 return key
-        return None
@@ -1,12 +1,15 @@
-import os.path
-
 from game.controls import Controls, Keys
+from util.background_writer import BackgroundWriter
 from util.config import PathConfig, Config
 
 
 class KeyLogger:
+    # a state hash is logged as STATE_HASH_HEAD followed by STATE_HASH_LENGTH hex digits, none of these characters can
+    # be the code of a key
+    STATE_HASH_HEAD = "#"
+    STATE_HASH_LENGTH = 16
     __BUFFER_SIZE = 1024
-    __MIN_CONTENT_FOR_FLUSH = 167 + 20  # ~header size + minimum number of keystrokes to log
+    __MIN_CONTENT_FOR_FLUSH = 176 + 20  # ~header size + minimum number of keystrokes to log
 
     @staticmethod
     def get_error_marker() -> str:
@@ -15,27 +18,57 @@ class KeyLogger:
     def __init__(self, seed: int):
         self.__save_file = PathConfig.new_key_log_file(seed)
         self.__buffer = Config.get_log_head(seed)
+        self.__flushed = False
+        self.__num_of_keys = 0
+
+    @property
+    def num_of_keys(self) -> int:
+        """
+        :return: number of keys logged so far
+        """
+        return self.__num_of_keys
 
     def log(self, controls: Controls, key_pressed: int):
         key = controls.encode(key_pressed)
         self.__buffer += key.to_char()
+        self.__num_of_keys += 1
+
+        self.flush(force=False)
 
+    def log_state_hash(self, state_hash: str):
+        """
+        Logs the hash of the game's state after the last logged key, so a replay can check whether it still matches
+        the recorded run.
+
+        :param state_hash: STATE_HASH_LENGTH hex digits
+        """
+        self.__buffer += f"{KeyLogger.STATE_HASH_HEAD}{state_hash}"
         self.flush(force=False)
 
     def log_error(self, message):
         self.__buffer += f"{KeyLogger.get_error_marker()}{message}{KeyLogger.get_error_marker()}"
-        self.flush(force=True)  # errors are immediately flushed so we do not lose their information
+        # errors are immediately written so we do not lose their information
+        self.flush(force=True, wait=True)
 
     def flush_if_useful(self):
         """
-        Flushes only if the .qrkl-file was already created (meaning we already flushed before) or if the buffer has a
-        minimum length so we don't produce useless files (e.g. immediately quiting a run doesn't provide useful
-        information).
+        Flushes only if we already flushed before (meaning the .qrkl-file was created) or if the buffer has a minimum
+        length so we don't produce useless files (e.g. immediately quiting a run doesn't provide useful information).
+        Since this is done when the game stops, it waits until everything is written.
         """
-        if os.path.exists(self.__save_file) or len(self.__buffer) >= KeyLogger.__MIN_CONTENT_FOR_FLUSH:
-            self.flush(force=True)
+        if self.__flushed or len(self.__buffer) >= KeyLogger.__MIN_CONTENT_FOR_FLUSH:
+            self.flush(force=True, wait=True)
 
-    def flush(self, force: bool):
+    def flush(self, force: bool, wait: bool = False):
+        """
+
+        :param force: whether to flush even if the buffer isn't full yet
+        :param wait: whether to wait until the keys are actually written or to leave it to the BackgroundWriter
+        """
         if force or len(self.__buffer) >= KeyLogger.__BUFFER_SIZE:
-            PathConfig.write(self.__save_file, self.__buffer, may_exist=True, append=True)
+            # keys are logged as characters, so e.g. a \r must not be translated to a \n
+            BackgroundWriter.instance().write(self.__save_file, self.__buffer, newline="")
             self.__buffer = ""
+            self.__flushed = True
+        if wait:
+            BackgroundWriter.instance().flush()
@@ -0,0 +1,348 @@
+import collections
+import csv
+import multiprocessing
+import os
+import re
+import string
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from game.controls import Keys
+from util.binary_keylog import BinaryKeyLog
+from util.config import Config, FileTypes, PathConfig
+from util.key_logger import KeyLogger
+from util.logger import Logger
+
+
+class ArchiveStatistics:
+    """
+    Statistics aggregated over keylogs and logs. Every row is identified by a category and a name (e.g. "fight" and
+    the type of the enemy) and sums up how often it occurred as well as how many keys and seconds it took. Since
+    statistics can be merged in any order, the files can be analyzed independently of each other.
+    """
+    FILE = "file"               # name: file type, count: number of files
+    KEY = "key"                 # name: Keys element, count: how often it was pressed
+    STATE_HASH = "state hash"   # count: number of state hashes in keylogs
+    STATE = "state"             # name: State, count: how often it was entered, keys and seconds spent in it
+    STATE_KEY = "state key"     # name: State/Keys element, count: how often the key was pressed in the state (only
+                                # for runs whose log and keylog were both found)
+    LEVEL = "level"             # name: level, count: how often it was completed, keys and seconds it took
+    ABORTED_LEVEL = "aborted level"     # like LEVEL but for levels that were left without completing them
+    FIGHT = "fight"             # name: type of the enemy, count: number of fights started
+    ERROR = "error"             # name: first line of the message, count: how often it occurred
+
+    COLUMNS = ["category", "name", "count", "keys", "seconds"]
+
+    def __init__(self):
+        self.__rows = {}    # (category, name) -> [count, keys, seconds]
+
+    def add(self, category: str, name: str, count: int = 1, keys: int = 0, seconds: int = 0):
+        row = self.__rows.get((category, name))
+        if row is None:
+            self.__rows[(category, name)] = [count, keys, seconds]
+        else:
+            row[0] += count
+            row[1] += keys
+            row[2] += seconds
+
+    def merge(self, other: "ArchiveStatistics"):
+        for (category, name), (count, keys, seconds) in other.__rows.items():
+            self.add(category, name, count, keys, seconds)
+
+    def get(self, category: str, name: str) -> (int, int, int):
+        """
+        :return: count, keys and seconds of the row or zeros if there is no such row
+        """
+        return tuple(self.__rows.get((category, name), (0, 0, 0)))
+
+    def write_csv(self, path: str):
+        """
+        Writes the statistics as a table with one row per category and name and the columns COLUMNS.
+
+        :param path: path of the .csv-file, an existing one is overwritten
+        """
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(ArchiveStatistics.COLUMNS)
+            for (category, name), values in sorted(self.__rows.items()):
+                writer.writerow([category, name] + values)
+
+
+# the keys are read in chunks so that even huge files need only little memory
+__CHUNK_SIZE = 1 << 20
+__TIMESTAMP = re.compile(r"(\d\d)-(\d\d)-(\d\d): ")
+__MAX_ERROR_LENGTH = 100
+__SECONDS_PER_DAY = 24 * 60 * 60
+__HEAD_SIZE = 4096     # more than enough for the head of a log or keylog
+__TIME_FORMAT = "%d%m%Y_%H%M%S"     # see Config.get_log_head()
+
+
+def __add_key_counts(statistics: ArchiveStatistics, counts: collections.Counter):
+    for code, count in counts.items():
+        if code == ord(KeyLogger.STATE_HASH_HEAD):
+            statistics.add(ArchiveStatistics.STATE_HASH, "", count)
+        else:
+            key = Keys.from_code(code)
+            if key is not Keys.Invalid:     # e.g. the digits of a state hash
+                statistics.add(ArchiveStatistics.KEY, key.name, count)
+
+
+def analyze_keylog(path: str) -> ArchiveStatistics:
+    """
+    :param path: path of a .qrkl- or .qrkb-file
+    :return: how often each key was pressed
+    """
+    statistics = ArchiveStatistics()
+    counts = collections.Counter()
+    if path.endswith(FileTypes.BinaryKeyLog.value):
+        statistics.add(ArchiveStatistics.FILE, FileTypes.BinaryKeyLog.value)
+        counts.update(BinaryKeyLog.read(path, in_keylog_folder=False).codes())
+    else:
+        statistics.add(ArchiveStatistics.FILE, FileTypes.KeyLog.value)
+        data = PathConfig.map_keylog(path, in_keylog_folder=False)
+        for start in range(Config.find_log_head_end(data), len(data), __CHUNK_SIZE):
+            counts.update(data[start:start + __CHUNK_SIZE])
+    __add_key_counts(statistics, counts)
+    return statistics
+
+
+def __key_codes(path: str):
+    """
+    :param path: path of a .qrkl- or .qrkb-file
+    :return: the codes of the logged keys without the state hashes in between
+    """
+    if path.endswith(FileTypes.BinaryKeyLog.value):
+        codes = BinaryKeyLog.read(path, in_keylog_folder=False).codes()
+    else:
+        data = PathConfig.map_keylog(path, in_keylog_folder=False)
+        codes = (code for start in range(Config.find_log_head_end(data), len(data), __CHUNK_SIZE)
+                 for code in data[start:start + __CHUNK_SIZE])
+    hash_digits = 0     # digits of the current state hash that are still to come (it may have been cut off)
+    for code in codes:
+        if hash_digits > 0 and chr(code) in string.hexdigits:
+            hash_digits -= 1
+        elif code == ord(KeyLogger.STATE_HASH_HEAD):
+            hash_digits = KeyLogger.STATE_HASH_LENGTH
+        else:
+            hash_digits = 0
+            yield code
+
+
+def __read_head(path: str) -> Optional[Tuple[int, datetime, int]]:
+    """
+    :param path: path of a .qrlog-, .qrkl- or .qrkb-file
+    :return: the seed, the time and the keylog format from the head of the file or None if it has no valid head
+    """
+    try:
+        if path.endswith(FileTypes.BinaryKeyLog.value):
+            keylog = BinaryKeyLog.read(path, in_keylog_folder=False)
+            seed, time_text, log_format = keylog.seed, keylog.time, keylog.log_format
+        else:
+            with open(path, encoding="utf-8", errors="replace", newline="") as file:
+                head = Config.parse_log_head(file.read(__HEAD_SIZE))
+            if head is None:
+                return None
+            _, seed, time_text, _, log_format, _ = head
+        return seed, datetime.strptime(time_text, __TIME_FORMAT), log_format
+    except (OSError, ValueError):
+        return None
+
+
+def __analyze_log(path: str) -> (ArchiveStatistics, List[Tuple[str, int, Optional[int]]]):
+    """
+    :return: the statistics of analyze_log() and per visited state its name, the number of keys pressed before it was
+    entered and before it was left (None if the run ended without an End-event)
+    """
+    statistics = ArchiveStatistics()
+    states = []
+    statistics.add(ArchiveStatistics.FILE, FileTypes.Log.value)
+    seconds, keys = 0, 0
+    day = 0             # logs only contain the time of day
+    state = None        # (name, keys, seconds) of the current state
+    level = None        # (name, keys, seconds) of the current level
+
+    def end_state(completed: bool = True):
+        if state is not None:
+            statistics.add(ArchiveStatistics.STATE, state[0], 1, keys - state[1], seconds - state[2])
+            states.append((state[0], state[1], keys if completed else None))
+
+    def end_level(completed: bool):
+        if level is not None:
+            category = ArchiveStatistics.LEVEL if completed else ArchiveStatistics.ABORTED_LEVEL
+            statistics.add(category, level[0], 1, keys - level[1], seconds - level[2])
+
+    with open(path, encoding="utf-8", errors="replace") as file:
+        for line in file:
+            line = line.rstrip("\n")
+            match = __TIMESTAMP.match(line)
+            if match is not None:
+                hours, minutes, secs = map(int, match.groups())
+                time_of_day = (hours * 60 + minutes) * 60 + secs
+                if day + time_of_day < seconds:
+                    day += __SECONDS_PER_DAY    # the run continued after midnight
+                seconds = day + time_of_day
+                line = line[match.end():]
+
+            if line.startswith(Logger.EVENT_HEAD):
+                name, *fields = line[len(Logger.EVENT_HEAD):].split("|")
+                fields = dict(field.split("=", 1) for field in fields if "=" in field)
+                keys = int(fields.get("keys", keys))
+                if name == "State":
+                    end_state()
+                    state = fields["state"], keys, seconds
+                    if fields["state"] == "Spaceship":
+                        end_level(completed=True)
+                        level = None
+                    elif fields["state"] == "Menu":
+                        end_level(completed=False)
+                        level = None
+                elif name == "World":
+                    end_level(completed=True)
+                    level = None
+                elif name == "Level":
+                    end_level(completed=False)
+                    level = fields["level"], keys, seconds
+                elif name == "Fight":
+                    statistics.add(ArchiveStatistics.FIGHT, fields["enemy"])
+                elif name == "End":
+                    end_state()
+                    end_level(completed=False)
+                    state, level = None, None
+            elif line.startswith(Logger.ERROR_HEAD):
+                statistics.add(ArchiveStatistics.ERROR, line[len(Logger.ERROR_HEAD):][:__MAX_ERROR_LENGTH])
+            elif line.startswith(Logger.THROW_HEAD):
+                statistics.add(ArchiveStatistics.ERROR, line[len(Logger.THROW_HEAD):][:__MAX_ERROR_LENGTH])
+    # the log of a crashed run has no End-event
+    end_state(completed=False)
+    end_level(completed=False)
+    return statistics, states
+
+
+def analyze_log(path: str) -> ArchiveStatistics:
+    """
+    Evaluates the events and errors of a .qrlog-file line by line.
+
+    :param path: path of the .qrlog-file
+    :return: the time and keys spent per state and level, the fights per enemy type and the errors
+    """
+    return __analyze_log(path)[0]
+
+
+def analyze_run(log_path: str, keylog_path: str) -> ArchiveStatistics:
+    """
+    Analyzes the log and the keylog of the same run. Since the events of the log contain the number of keys pressed
+    so far, the keys of the keylog can be attributed to the state they were pressed in.
+
+    :param log_path: path of the .qrlog-file
+    :param keylog_path: path of the .qrkl- or .qrkb-file
+    :return: the statistics of analyze_log() and analyze_keylog() as well as how often every key was pressed per state
+    """
+    statistics, states = __analyze_log(log_path)
+    statistics.merge(analyze_keylog(keylog_path))
+    head = __read_head(keylog_path)
+    if head is None or head[2] != Config.KEYLOG_FORMAT:
+        return statistics   # older keylogs don't start with the first key counted by the log
+
+    counts = collections.Counter()
+    state_index = 0
+    for key_index, code in enumerate(__key_codes(keylog_path)):
+        while state_index < len(states) and states[state_index][2] is not None and \
+                key_index >= states[state_index][2]:
+            state_index += 1
+        if state_index >= len(states):
+            break
+        name, first_key, _ = states[state_index]
+        if key_index >= first_key:
+            counts[(name, code)] += 1
+    for (name, code), count in counts.items():
+        key = Keys.from_code(code)
+        statistics.add(ArchiveStatistics.STATE_KEY, f"{name}/{key.name}", count)
+    return statistics
+
+
+def pair_runs(paths: List[str]) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Pairs every log with the keylog of the same run, i.e. the first keylog with the same seed that was created after
+    it (the keylog is only created once the player presses PLAY).
+
+    :param paths: paths of logs and keylogs
+    :return: (log, keylog) per run, one of them is None if it couldn't be paired
+    """
+    logs = []
+    keylogs = {}    # seed -> [(time, path)]
+    runs = []
+    for path in paths:
+        head = __read_head(path)
+        if path.endswith(FileTypes.Log.value):
+            if head is None:
+                runs.append((path, None))
+            else:
+                logs.append((head[1], head[0], path))
+        elif head is None:
+            runs.append((None, path))
+        else:
+            keylogs.setdefault(head[0], []).append((head[1], path))
+    for candidates in keylogs.values():
+        candidates.sort()
+    for log_time, seed, log_path in sorted(logs):
+        candidates = keylogs.get(seed, [])
+        keylog_path = None
+        for i, (keylog_time, path) in enumerate(candidates):
+            if keylog_time >= log_time:
+                keylog_path = candidates.pop(i)[1]
+                break
+        runs.append((log_path, keylog_path))
+    for candidates in keylogs.values():
+        runs += [(None, path) for _, path in candidates]
+    return runs
+
+
+def analyze_files(run: Tuple[Optional[str], Optional[str]]) -> ArchiveStatistics:
+    """
+    :param run: (log, keylog) of a run as returned by pair_runs()
+    """
+    log_path, keylog_path = run
+    if keylog_path is None:
+        return analyze_log(log_path)
+    if log_path is None:
+        return analyze_keylog(keylog_path)
+    return analyze_run(log_path, keylog_path)
+
+
+def find_files(folder: str) -> List[str]:
+    """
+    :param folder: the folder to search through (including its sub-folders)
+    :return: paths of all keylogs (.qrkl and .qrkb) and logs (.qrlog) in the folder
+    """
+    extensions = (FileTypes.KeyLog.value, FileTypes.BinaryKeyLog.value, FileTypes.Log.value)
+    paths = []
+    for dir_path, _, file_names in os.walk(folder):
+        for file_name in file_names:
+            if file_name.endswith(extensions):
+                paths.append(os.path.join(dir_path, file_name))
+    return paths
+
+
+def analyze_archive(folder: str, output: str, processes: int = None) -> ArchiveStatistics:
+    """
+    Analyzes all keylogs and logs in the given folder in parallel and writes the merged statistics into a .csv-file.
+    Every file is streamed, and only the statistics are kept in memory, so archives of any size can be analyzed. A log
+    and a keylog of the same run are analyzed together (see pair_runs()).
+
+    :param folder: the folder containing the keylogs and logs
+    :param output: path of the .csv-file to write
+    :param processes: number of worker processes, by default the number of CPUs
+    :return: the merged statistics
+    """
+    paths = find_files(folder)
+    print(f"[Qrogue] Analyzing {len(paths)} files from {folder}")
+    start_time = time.time()
+    statistics = ArchiveStatistics()
+    with multiprocessing.Pool(processes) as pool:
+        for file_statistics in pool.imap_unordered(analyze_files, pair_runs(paths), chunksize=4):
+            statistics.merge(file_statistics)
+    statistics.write_csv(output)
+    wall_time = time.time() - start_time
+    print(f"[Qrogue] Wrote the statistics to {output} after {wall_time:.2f} seconds")
+    return statistics
@@ -2,11 +2,16 @@ from datetime import datetime
 
 import py_cui.debug
 
+from util.background_writer import BackgroundWriter
 from util.config import PathConfig, Config
 from util.key_logger import KeyLogger
 
 
 class Logger(py_cui.debug.PyCUILogger):
+    # prefixes of the lines that are evaluated by the log analysis (see util/log_analysis.py)
+    EVENT_HEAD = "{EVENT} |"
+    ERROR_HEAD = "ERROR |"
+    THROW_HEAD = "[ERROR] "
     __BUFFER_SIZE = 2048
     __instance = None
 
@@ -47,6 +52,16 @@ class Logger(py_cui.debug.PyCUILogger):
         if Config.debugging():
             self.info(f"{{DEBUG}} |{msg}")
 
+    def event(self, name: str, **fields) -> None:
+        """
+        Logs something that happened in the game in a machine-readable way, e.g. for the log analysis.
+
+        :param name: name of the event
+        :param fields: values describing the event, they must not contain "|" or line breaks
+        """
+        text = "|".join([name] + [f"{key}={value}" for key, value in fields.items()])
+        self.info(f"{Logger.EVENT_HEAD}{text}")
+
     def show_error(self, message) -> None:
         self.__error_popup("ERROR", str(message))
 
@@ -54,12 +69,12 @@ class Logger(py_cui.debug.PyCUILogger):
         if show:
             self.__error_popup("ERROR", str(message))
         highlighting = "\n----------------------------------\n"
-        self.info(f"{highlighting}ERROR |{message}{highlighting}")
+        self.info(f"{highlighting}{Logger.ERROR_HEAD}{message}{highlighting}")
 
     def throw(self, error) -> None:
         print(error)
-        self.__write(f"[ERROR] {error}")
-        self.flush()
+        self.__write(f"{Logger.THROW_HEAD}{error}")
+        self.flush(wait=True)
         raise error
 
     def print(self, message: str, clear: bool = False) -> None:
@@ -85,11 +100,17 @@ class Logger(py_cui.debug.PyCUILogger):
     def clear(self) -> None:
         self.__text = ""
 
-    def flush(self) -> None:
+    def flush(self, wait: bool = False) -> None:
+        """
+
+        :param wait: whether to wait until the logs are actually written or to leave it to the BackgroundWriter
+        """
         if self.__buffer_size > 0:
             text = ""
             for log in self.__buffer:
                 text += log + "\n"
-            PathConfig.write(self.__save_file, text, may_exist=True, append=True)
+            BackgroundWriter.instance().write(self.__save_file, text)
             self.__buffer = []
             self.__buffer_size = 0
+        if wait:
+            BackgroundWriter.instance().flush()
@@ -1,4 +1,6 @@
+import hashlib
 import random
+from typing import Tuple
 
 from util.config import Config
 from util.logger import Logger
@@ -11,6 +13,15 @@ class MyRandom:
         seed = seed % Config.MAX_SEED
         self.__random = random.Random(seed)
 
+    def get_state(self) -> object:
+        """
+        :return: the internal state, e.g. to continue a replay from a snapshot
+        """
+        return self.__random.getstate()
+
+    def set_state(self, state: object) -> None:
+        self.__random.setstate(state)
+
     def get(self, min: float = 0.0, max: float = 1.0):
         return min + self.__random.random() * (max - min)
 
@@ -95,3 +106,52 @@ class RandomManager(MyRandom):
         else:
             super().__init__(seed)
             RandomManager.__instance = self
+
+
+class SeedSequence:
+    """
+    Hierarchical and deterministic source of randomness (similar to numpy's SeedSequence). Every SeedSequence is
+    identified by its root entropy (e.g. the seed of a level) and a path of keys (e.g. a room's coordinate and a tile
+    index). Its seed only depends on this identification and not on how many other streams were created before, so
+    rooms and tiles can be built in any order, concurrently or on demand and still be bit-identical.
+    """
+    __KEY_SEPARATOR = "/"
+
+    def __init__(self, entropy: int, path: Tuple = ()):
+        self.__entropy = entropy
+        self.__path = path
+        key = SeedSequence.__KEY_SEPARATOR.join([str(entropy)] + [str(key) for key in path])
+        # hashlib instead of hash() because the latter is randomized between interpreter runs for strings
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+        self.__seed = int.from_bytes(digest, byteorder="little") % Config.MAX_SEED
+
+    @property
+    def entropy(self) -> int:
+        return self.__entropy
+
+    @property
+    def path(self) -> Tuple:
+        return self.__path
+
+    @property
+    def seed(self) -> int:
+        return self.__seed
+
+    def spawn(self, *keys) -> "SeedSequence":
+        """
+        Derives an independent child stream.
+
+        :param keys: identify the child relative to this SeedSequence (e.g. x and y of a room), their str() is used
+        :return: the child SeedSequence
+        """
+        return SeedSequence(self.__entropy, self.__path + keys)
+
+    def random(self) -> MyRandom:
+        """
+
+        :return: a new MyRandom seeded with this SeedSequence's seed
+        """
+        return MyRandom(self.__seed)
+
+    def __str__(self) -> str:
+        return f"SeedSequence({self.__entropy}{''.join(f'/{key}' for key in self.__path)})"
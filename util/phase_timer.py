@@ -0,0 +1,130 @@
+import json
+import time
+from typing import Dict, List
+
+
+class _Histogram:
+    def __init__(self, bounds: List[float]):
+        self.__bounds = bounds
+        self.__counts = [0] * (len(bounds) + 1)     # the last bucket holds everything above the highest bound
+        self.__count = 0
+        self.__sum = 0.0
+        self.__min = None
+        self.__max = None
+
+    @property
+    def count(self) -> int:
+        return self.__count
+
+    @property
+    def sum(self) -> float:
+        return self.__sum
+
+    def add(self, value: float):
+        index = 0
+        while index < len(self.__bounds) and value > self.__bounds[index]:
+            index += 1
+        self.__counts[index] += 1
+        self.__count += 1
+        self.__sum += value
+        if self.__min is None or value < self.__min:
+            self.__min = value
+        if self.__max is None or value > self.__max:
+            self.__max = value
+
+    def to_dict(self) -> Dict:
+        buckets = []
+        for i, count in enumerate(self.__counts):
+            upper_bound = self.__bounds[i] if i < len(self.__bounds) else None
+            buckets.append({"le": upper_bound, "count": count})
+        return {
+            "count": self.__count,
+            "sum": self.__sum,
+            "mean": self.__sum / self.__count if self.__count > 0 else 0,
+            "min": self.__min,
+            "max": self.__max,
+            "buckets": buckets,
+        }
+
+
+class PhaseTimer:
+    """
+    Measures how long the individual phases of a process (e.g. the generation of a dungeon) take and aggregates the
+    durations of every phase over many runs into a histogram.
+
+    Usage:
+        checkpoint = timer.now()
+        ...   # first phase
+        checkpoint = timer.lap("first phase", checkpoint)
+        ...   # second phase
+        timer.lap("second phase", checkpoint)
+
+    A disabled PhaseTimer doesn't even query the clock so it can be passed around by default.
+    """
+    # upper bounds of the histogram buckets in seconds
+    DEFAULT_BOUNDS = [1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 1e-1, 5e-1, 1.0]
+    __DISABLED = None
+
+    @staticmethod
+    def disabled() -> "PhaseTimer":
+        if PhaseTimer.__DISABLED is None:
+            PhaseTimer.__DISABLED = PhaseTimer(enabled=False)
+        return PhaseTimer.__DISABLED
+
+    def __init__(self, bounds: List[float] = None, enabled: bool = True):
+        if bounds is None:
+            bounds = PhaseTimer.DEFAULT_BOUNDS
+        self.__bounds = sorted(bounds)
+        self.__enabled = enabled
+        self.__histograms: Dict[str, _Histogram] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.__enabled
+
+    @property
+    def phases(self) -> List[str]:
+        return list(self.__histograms.keys())
+
+    def now(self) -> float:
+        if self.__enabled:
+            return time.perf_counter()
+        return 0
+
+    def lap(self, phase: str, checkpoint: float) -> float:
+        """
+        Records the time that passed since checkpoint as duration of the given phase.
+
+        :param phase: name of the phase that just ended
+        :param checkpoint: the value returned by now() or lap() at the start of the phase
+        :return: new checkpoint for the next phase
+        """
+        if not self.__enabled:
+            return 0
+        now = time.perf_counter()
+        self.record(phase, now - checkpoint)
+        return now
+
+    def record(self, phase: str, duration: float):
+        if not self.__enabled:
+            return
+        if phase not in self.__histograms:
+            self.__histograms[phase] = _Histogram(self.__bounds)
+        self.__histograms[phase].add(duration)
+
+    def to_dict(self) -> Dict:
+        return {phase: histogram.to_dict() for phase, histogram in self.__histograms.items()}
+
+    def to_json(self, indent: int = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def save(self, path: str):
+        with open(path, "w") as file:
+            file.write(self.to_json())
+
+    def __str__(self) -> str:
+        rows = [f"{'phase'.ljust(30)}{'count'.rjust(8)}{'mean [ms]'.rjust(12)}{'total [s]'.rjust(12)}"]
+        for phase, histogram in self.__histograms.items():
+            mean = histogram.sum / histogram.count * 1000 if histogram.count > 0 else 0
+            rows.append(f"{phase.ljust(30)}{str(histogram.count).rjust(8)}{mean:12.4f}{histogram.sum:12.4f}")
+        return "\n".join(rows)
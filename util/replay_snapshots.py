@@ -0,0 +1,216 @@
+import io
+import os
+import pickle
+import struct
+import types
+import zlib
+from typing import Dict, List, Optional
+
+
+class _StatePickler(pickle.Pickler):
+    def __init__(self, file, environment: Dict[str, object]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.__names = {id(obj): name for name, obj in environment.items() if obj is not None}
+
+    def persistent_id(self, obj):
+        return self.__names.get(id(obj))
+
+    def reducer_override(self, obj):
+        if isinstance(obj, types.MethodType):
+            # pickle looks up bound methods by their name which doesn't work for name-mangled (private) methods
+            name = obj.__func__.__name__
+            if name.startswith("__") and not name.endswith("__"):
+                owner = obj.__func__.__qualname__.split(".")[-2].lstrip("_")
+                name = f"_{owner}{name}"
+            return getattr, (obj.__self__, name)
+        return NotImplemented
+
+
+class _StateUnpickler(pickle.Unpickler):
+    def __init__(self, file, environment: Dict[str, object]):
+        super().__init__(file)
+        self.__environment = environment
+
+    def persistent_load(self, pid):
+        if pid not in self.__environment:
+            raise pickle.UnpicklingError(f"\"{pid}\" is missing in the environment!")
+        return self.__environment[pid]
+
+
+def dump_state(state: object, environment: Dict[str, object]) -> bytes:
+    """
+    Serializes the state of the game. Objects belonging to the running process rather than to the game (e.g. the
+    screen, loggers or singletons) are not serialized but only stored by their name in environment, so load_state()
+    can replace them with the corresponding objects of the restoring process.
+
+    :param state: the state to serialize
+    :param environment: name -> object of the running process
+    :return: the compressed serialized state
+    """
+    file = io.BytesIO()
+    _StatePickler(file, environment).dump(state)
+    return zlib.compress(file.getvalue(), 1)
+
+
+def load_state(data: bytes, environment: Dict[str, object]) -> object:
+    """
+    Counterpart of dump_state().
+
+    :param data: the compressed serialized state
+    :param environment: name -> object of the restoring process, has to contain all names used in dump_state()
+    :return: the deserialized state
+    """
+    return _StateUnpickler(io.BytesIO(zlib.decompress(data)), environment).load()
+
+
+class ReplaySnapshot:
+    def __init__(self, num_of_keys: int, position: int, data: bytes):
+        """
+
+        :param num_of_keys: number of keys that were replayed before the snapshot was taken
+        :param position: position in the keylog where the replay continues (see GameSimulator.position)
+        :param data: the serialized state of the game (see dump_state())
+        """
+        self.__num_of_keys = num_of_keys
+        self.__position = position
+        self.__data = data
+
+    @property
+    def num_of_keys(self) -> int:
+        return self.__num_of_keys
+
+    @property
+    def position(self) -> int:
+        return self.__position
+
+    @property
+    def data(self) -> bytes:
+        return self.__data
+
+
+class ReplaySnapshots:
+    """
+    File next to a keylog (.qrsnap) containing snapshots of the game taken during its replay. A snapshot is taken as
+    soon as possible after every interval keys (the game cannot be snapshot at any time, e.g. not during a fight).
+    Hence, a replay can seek to any key by restoring the last snapshot before it and replaying the keys since then.
+    Files of another format version are rejected since the snapshots of an older version would restore an
+    incompatible state.
+
+    A newly created file is open until close() is called, which is done automatically if it is used in a with
+    statement.
+
+    Layout (little endian):
+        header:    magic, format version (H), seed of the keylog (q), interval (I)
+        snapshots: number of replayed keys (I), position in the keylog (I), size of the data (I), data
+    """
+    MAGIC = b"QRSS"
+    FORMAT_VERSION = 2
+
+    __HEADER = struct.Struct("<4sHqI")
+    __SNAPSHOT = struct.Struct("<III")
+
+    @staticmethod
+    def create(path: str, seed: int, interval: int) -> "ReplaySnapshots":
+        """
+        Creates a new (empty) snapshot file, an existing one is overwritten.
+
+        :param path: path of the .qrsnap-file
+        :param seed: seed of the replayed keylog
+        :param interval: number of keys between two snapshots
+        """
+        file = open(path, "wb")
+        try:
+            file.write(ReplaySnapshots.__HEADER.pack(ReplaySnapshots.MAGIC, ReplaySnapshots.FORMAT_VERSION, seed,
+                                                     interval))
+        except BaseException:
+            file.close()
+            raise
+        return ReplaySnapshots(path, seed, interval, [], file)
+
+    @staticmethod
+    def read(path: str) -> "ReplaySnapshots":
+        """
+        Reads the index of a snapshot file. The data of a snapshot is only read if it is needed (see nearest()).
+
+        :param path: path of the .qrsnap-file
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"There is no such snapshot file: {path}")
+        index = []
+        with open(path, "rb") as file:
+            header = file.read(ReplaySnapshots.__HEADER.size)
+            if len(header) < ReplaySnapshots.__HEADER.size:
+                raise ValueError("Snapshot file is too short!")
+            magic, format_version, seed, interval = ReplaySnapshots.__HEADER.unpack(header)
+            if magic != ReplaySnapshots.MAGIC:
+                raise ValueError("Not a snapshot file!")
+            if format_version != ReplaySnapshots.FORMAT_VERSION:
+                raise ValueError(f"Unsupported snapshot file format: {format_version}")
+
+            entry = file.read(ReplaySnapshots.__SNAPSHOT.size)
+            while len(entry) == ReplaySnapshots.__SNAPSHOT.size:
+                num_of_keys, position, size = ReplaySnapshots.__SNAPSHOT.unpack(entry)
+                index.append((num_of_keys, position, file.tell(), size))
+                file.seek(size, os.SEEK_CUR)
+                entry = file.read(ReplaySnapshots.__SNAPSHOT.size)
+        # a snapshot whose data was cut off (e.g. because the replay crashed while writing it) cannot be used
+        if len(index) > 0 and index[-1][2] + index[-1][3] > os.path.getsize(path):
+            index.pop()
+        return ReplaySnapshots(path, seed, interval, index)
+
+    def __init__(self, path: str, seed: int, interval: int, index: List, file=None):
+        self.__path = path
+        self.__seed = seed
+        self.__interval = interval
+        self.__index = index    # (num_of_keys, position, offset of the data, size of the data) per snapshot
+        self.__file = file
+
+    @property
+    def seed(self) -> int:
+        return self.__seed
+
+    @property
+    def interval(self) -> int:
+        return self.__interval
+
+    @property
+    def num_of_snapshots(self) -> int:
+        return len(self.__index)
+
+    def add(self, snapshot: ReplaySnapshot):
+        if self.__file is None:
+            raise ValueError("Snapshots can only be added to a newly created snapshot file!")
+        self.__file.write(ReplaySnapshots.__SNAPSHOT.pack(snapshot.num_of_keys, snapshot.position,
+                                                          len(snapshot.data)))
+        offset = self.__file.tell()
+        self.__file.write(snapshot.data)
+        self.__index.append((snapshot.num_of_keys, snapshot.position, offset, len(snapshot.data)))
+
+    def close(self):
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def __enter__(self) -> "ReplaySnapshots":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def nearest(self, num_of_keys: int) -> Optional[ReplaySnapshot]:
+        """
+        :param num_of_keys: the number of keys the replay should seek to
+        :return: the last snapshot taken after at most num_of_keys keys or None if there is no such snapshot
+        """
+        best = None
+        for entry in self.__index:
+            if entry[0] <= num_of_keys:
+                best = entry
+            else:
+                break
+        if best is None:
+            return None
+        snapshot_keys, position, offset, size = best
+        with open(self.__path, "rb") as file:
+            file.seek(offset)
+            return ReplaySnapshot(snapshot_keys, position, file.read(size))
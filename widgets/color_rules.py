@@ -1,3 +1,6 @@
+import re
+from typing import List, Dict, Tuple
+
 import py_cui.colors
 
 from game.actors.controllable import ControllableType
@@ -109,9 +112,73 @@ class FragmentStorage:
         return iter(self.__fragments)
 
 
+class CompiledColorRules:
+    """
+    The color rules of a widget compiled into a single regex so a line only has to be scanned once instead of once per
+    rule. The resulting fragments are cached per rendered line, so unchanged lines skip the regex work entirely.
+
+    Only rules of type 'contains' with match type 'regex' (the only ones we use) can be combined. For other rules
+    can_combine() returns False and the rules have to be applied one after another as py_cui does.
+    """
+    __MAX_CACHE_SIZE = 4096
+
+    @staticmethod
+    def can_combine(color_rules: List[py_cui.colors.ColorRule]) -> bool:
+        for rule in color_rules:
+            if rule._rule_type != 'contains' or rule._match_type != 'regex':
+                return False
+        return True
+
+    def __init__(self, color_rules: List[py_cui.colors.ColorRule]):
+        self.__colors = [(rule._color, rule._selected_color) for rule in color_rules]
+        # every rule becomes a named alternative so we know which rule matched
+        self.__regex = re.compile("|".join([f"(?P<r{i}>{rule._regex})" for i, rule in enumerate(color_rules)]))
+        self.__cache: Dict[Tuple[str, bool, int], "list of [str, int]"] = {}
+
+    def generate_fragments(self, render_text: str, selected: bool, og_color: int) -> "list of [str, int]":
+        """
+        :param render_text: the text to colorize
+        :param selected: whether the widget is selected or not
+        :param og_color: the color of the text that doesn't match any rule
+        :return: list of text - color code combinations to write
+        """
+        key = render_text, selected, og_color
+        fragments = self.__cache.get(key)
+        if fragments is None:
+            meta_fragments = FragmentStorage(render_text, og_color)
+            for match in self.__regex.finditer(render_text):
+                if match.start() == match.end():
+                    continue
+                color, selected_color = self.__colors[int(match.lastgroup[1:])]
+                meta_fragments.append(Fragment(match.start(), match.group(), selected_color if selected else color))
+            fragments = meta_fragments.fill_blanks()
+            if len(self.__cache) >= CompiledColorRules.__MAX_CACHE_SIZE:
+                self.__cache.clear()
+            self.__cache[key] = fragments
+        return fragments
+
+
 class MultiColorRenderer(py_cui.renderer.Renderer):
     def __init__(self, root, stdscr, logger):
         super().__init__(root, stdscr, logger)
+        # compiled version of every list of color rules we were asked to apply, identified by the rules themselves
+        self.__compiled_rules: Dict[tuple, CompiledColorRules] = {}
+        self.__cur_compiled_rules = None
+
+    def set_color_rules(self, color_rules) -> None:
+        super(MultiColorRenderer, self).set_color_rules(color_rules)
+        # widgets set their rules before every draw, so this is the place to look up the compiled version only once
+        key = tuple([(rule._regex, rule._color, rule._selected_color, rule._rule_type, rule._match_type)
+                     for rule in color_rules])
+        if key not in self.__compiled_rules:
+            compiled = None
+            if len(color_rules) > 0 and CompiledColorRules.can_combine(color_rules):
+                try:
+                    compiled = CompiledColorRules(color_rules)
+                except re.error:
+                    pass    # e.g. back references cannot be combined, so we stick to the rule by rule approach
+            self.__compiled_rules[key] = compiled
+        self.__cur_compiled_rules = self.__compiled_rules[key]
 
     def _get_render_text(self, ui_element, line, centered, bordered, selected, start_pos):
         """Internal function that computes the scope of the text that should be drawn
@@ -176,9 +243,15 @@ class MultiColorRenderer(py_cui.renderer.Renderer):
             list of text - color code combinations to write
         """
         if selected:
-            meta_fragments = FragmentStorage(render_text, ui_element.get_selected_color())
+            og_color = ui_element.get_selected_color()
         else:
-            meta_fragments = FragmentStorage(render_text, ui_element.get_color())
+            og_color = ui_element.get_color()
+        if len(self._color_rules) <= 0:
+            return [[render_text, og_color]]
+        if self.__cur_compiled_rules is not None:
+            return self.__cur_compiled_rules.generate_fragments(render_text, selected, og_color)
+
+        meta_fragments = FragmentStorage(render_text, og_color)
 
         for color_rule in self._color_rules:
             fragments, match = color_rule.generate_fragments(ui_element, line, render_text, selected)
@@ -191,12 +264,7 @@ class MultiColorRenderer(py_cui.renderer.Renderer):
                     cur_pos += len(text)
                     meta_fragments.append(Fragment(start, text, color))
         meta_fragments.sort()
-        full = meta_fragments.fill_blanks()
-        text = ""
-        for frag in full:
-            text += str(frag)
-        text += "\n"
-        return full
+        return meta_fragments.fill_blanks()
 
 
 class ColorRules:
@@ -0,0 +1,135 @@
+import curses
+from typing import Callable, Iterable, List
+
+from widgets.color_rules import MultiColorRenderer
+
+
+class HeadlessScreen:
+    """
+    In-memory replacement for the curses screen so the CUI can run without a terminal (e.g. for benchmarks, replays
+    or bots). Drawn text is written into a character buffer and the input is taken from a given sequence of keys
+    instead of the keyboard.
+
+    Supports the subset of the curses window interface that py_cui and QrogueCUI use.
+    """
+    NO_KEY = -1     # what curses' getch() returns if no key was pressed before the timeout
+
+    def __init__(self, height: int, width: int, keys: Iterable[int] = (),
+                 on_frame: Callable[["HeadlessScreen"], None] = None, on_exhausted: Callable[[], None] = None):
+        """
+
+        :param height: number of rows of the simulated terminal
+        :param width: number of columns of the simulated terminal
+        :param keys: the keys that are "pressed" one after another
+        :param on_frame: called with the screen after every finished frame (i.e. refresh())
+        :param on_exhausted: called once all keys were pressed
+        """
+        self.__height = height
+        self.__width = width
+        self.__keys = iter(keys)
+        self.__on_frame = on_frame
+        self.__on_exhausted = on_exhausted
+        self.__rows = [[" "] * width for _ in range(height)]
+        self.__cursor = (0, 0)
+        self.__frames = 0
+        self.__pressed_keys = 0
+        self.__exhausted = False
+
+    @property
+    def frames(self) -> int:
+        """
+        :return: number of finished frames so far
+        """
+        return self.__frames
+
+    @property
+    def pressed_keys(self) -> int:
+        return self.__pressed_keys
+
+    @property
+    def exhausted(self) -> bool:
+        """
+        :return: whether all keys were pressed or not
+        """
+        return self.__exhausted
+
+    def rows(self) -> List[str]:
+        """
+        :return: the current content of the screen row by row
+        """
+        return ["".join(row) for row in self.__rows]
+
+    def getmaxyx(self) -> (int, int):
+        return self.__height, self.__width
+
+    def attron(self, attr: int):
+        pass    # only the text is stored
+
+    def attroff(self, attr: int):
+        pass
+
+    def addstr(self, y: int, x: int, text: str, attr: int = None):
+        if not (0 <= y < self.__height and 0 <= x < self.__width):
+            raise curses.error(f"addstr() outside of the screen: {x}|{y}")
+        row = self.__rows[y]
+        for i, char in enumerate(text[:self.__width - x]):
+            row[x + i] = char
+        self.__cursor = y, min(x + len(text), self.__width - 1)
+
+    def move(self, y: int, x: int):
+        self.__cursor = y, x
+
+    def clrtoeol(self):
+        y, x = self.__cursor
+        row = self.__rows[y]
+        for i in range(x, self.__width):
+            row[i] = " "
+
+    def erase(self):
+        for row in self.__rows:
+            for i in range(self.__width):
+                row[i] = " "
+
+    def clear(self):
+        self.erase()
+
+    def refresh(self):
+        self.__frames += 1
+        if self.__on_frame is not None:
+            self.__on_frame(self)
+
+    def getch(self) -> int:
+        key = next(self.__keys, None)
+        if key is None:
+            if not self.__exhausted:
+                self.__exhausted = True
+                if self.__on_exhausted is not None:
+                    self.__on_exhausted()
+            return HeadlessScreen.NO_KEY
+        self.__pressed_keys += 1
+        return key
+
+    def timeout(self, delay: int):
+        pass
+
+    def keypad(self, flag: bool):
+        pass
+
+    def nodelay(self, flag: bool):
+        pass
+
+    def __str__(self) -> str:
+        return "\n".join(self.rows())
+
+
+class HeadlessRenderer(MultiColorRenderer):
+    """
+    MultiColorRenderer for a HeadlessScreen. Curses' color pairs are only available after curses was initialized, so
+    the color codes are passed on to the screen directly.
+    """
+
+    def set_color_mode(self, color_mode: int) -> None:
+        self._stdscr.attron(color_mode)
+
+    def unset_color_mode(self, color_mode: int) -> None:
+        self._stdscr.attroff(color_mode)
@@ -1,3 +1,4 @@
+import functools
 from abc import ABC, abstractmethod
 from typing import List, Any, Callable, Tuple
 
@@ -9,8 +10,10 @@ from game.logic.instruction import Instruction
 from game.logic.qubit import StateVector
 from game.map.map import Map
 from game.map.navigation import Direction
+from game.map.viewport import Viewport
 from game.map.rooms import Area, Placeholder
 from util.config import ColorConfig
+from util.frame_profiler import FrameProfiler
 from util.logger import Logger
 from util import util_functions as uf
 from widgets.renderable import Renderable
@@ -92,7 +95,11 @@ class HudWidget(Widget):
         if self.__robot is not None:
             text = f"{self.__robot.cur_hp} / {self.__robot.max_hp} HP   \t" \
                    f"{self.__robot.backpack.coin_count}$, {self.__robot.key_count()} keys"
-            if self.__render_duration is not None:
+            profiler = FrameProfiler.instance()
+            if profiler.enabled:
+                # p50/p95/max of the last frames instead of only the last duration
+                text += f"\t\t{profiler.summary()}"
+            elif self.__render_duration is not None:
                 text += f"\t\t{self.__render_duration:.2f} ms"
             self.widget.set_title(text)
 
@@ -101,45 +108,56 @@ class HudWidget(Widget):
 
 
 class CircuitWidget(Widget):
+    __GATE_ENTRIES = {}     # abbreviation -> padded entry of the gate in the circuit
+
     def __init__(self, widget: MyBaseWidget):
         super().__init__(widget)
         self.__robot = None
+        self.__key = None   # what the cached circuit string was rendered from
+        self.__circ_str = ""
         # highlight everything between {} (gates), |> (start) or <| (end)
         widget.add_text_color_rule("(\{.*?\}|\|.*?\>|\<.*?\|)", ColorConfig.CIRCUIT_COLOR, 'contains',
                                    match_type='regex')
 
+    @staticmethod
+    def __gate_entry(abbreviation: str) -> str:
+        inst_str = CircuitWidget.__GATE_ENTRIES.get(abbreviation)
+        if inst_str is None:
+            diff_len = Instruction.MAX_ABBREVIATION_LEN - len(abbreviation)
+            inst_str = f"--{{{abbreviation}}}--"
+            if diff_len > 0:
+                half_diff = int(diff_len / 2)
+                inst_str = inst_str.ljust(len(inst_str) + half_diff, "-")
+                if diff_len % 2 == 0:
+                    inst_str = inst_str.rjust(len(inst_str) + half_diff, "-")
+                else:
+                    inst_str = inst_str.rjust(len(inst_str) + half_diff + 1, "-")
+            CircuitWidget.__GATE_ENTRIES[abbreviation] = inst_str
+        return inst_str
+
     def set_data(self, robot: Robot) -> None:
         self.__robot = robot
 
     def render(self) -> None:
         if self.__robot is not None:
-            entry = "-" * (3 + Instruction.MAX_ABBREVIATION_LEN + 3)
-            rows = [[entry] * self.__robot.circuit_space for _ in range(self.__robot.num_of_qubits)]
-
-            for i, inst in self.__robot.circuit_enumerator():
-                for q in inst.qargs_iter():
-                    inst_str = inst.abbreviation(q)
-                    diff_len = Instruction.MAX_ABBREVIATION_LEN - len(inst_str)
-                    inst_str = f"--{{{inst_str}}}--"
-                    if diff_len > 0:
-                        half_diff = int(diff_len / 2)
-                        inst_str = inst_str.ljust(len(inst_str) + half_diff, "-")
-                        if diff_len % 2 == 0:
-                            inst_str = inst_str.rjust(len(inst_str) + half_diff, "-")
-                        else:
-                            inst_str = inst_str.rjust(len(inst_str) + half_diff + 1, "-")
-                    rows[q][i] = inst_str
-            circ_str = ""
-            # place qubits from top to bottom, high to low index
-            for q in range(len(rows) - 1, -1, -1):
-                circ_str += f"| q{q} >---"
-                row = rows[q]
-                for i in range(len(row)):
-                    circ_str += row[i]
-                    if i < len(row) - 1:
-                         circ_str += "+"
-                circ_str += "< out |\n"
-            self.widget.set_title(circ_str)
+            gates = tuple((i, q, inst.abbreviation(q)) for i, inst in self.__robot.circuit_enumerator()
+                          for q in inst.qargs_iter())
+            key = self.__robot.num_of_qubits, self.__robot.circuit_space, gates
+            if key != self.__key:
+                # the circuit changed since the last time it was rendered
+                entry = "-" * (3 + Instruction.MAX_ABBREVIATION_LEN + 3)
+                rows = [[entry] * self.__robot.circuit_space for _ in range(self.__robot.num_of_qubits)]
+                for i, q, abbreviation in gates:
+                    rows[q][i] = CircuitWidget.__gate_entry(abbreviation)
+                circ_str = ""
+                # place qubits from top to bottom, high to low index
+                for q in range(len(rows) - 1, -1, -1):
+                    circ_str += f"| q{q} >---"
+                    circ_str += "+".join(rows[q])
+                    circ_str += "< out |\n"
+                self.__key = key
+                self.__circ_str = circ_str
+            self.widget.set_title(self.__circ_str)
 
     def render_reset(self) -> None:
         self.widget.set_title("")
@@ -150,18 +168,25 @@ class MapWidget(Widget):
         super().__init__(widget)
         self.__map = None
         self.__backup = None
+        self.__viewport = Viewport()
+
+    @property
+    def map(self) -> Map:
+        return self.__map
 
     def set_data(self, map: Map) -> None:
         self.__map = map
+        self.__viewport.reset()
 
     def render(self) -> None:
         if self.__map is not None:
-            rows = self.__map.row_strings()
-            # add robot
-            x = self.__map.controllable_pos.x
-            y = self.__map.controllable_pos.y
-            rows[y] = rows[y][0:x] + self.__map.controllable_tile.get_img() + rows[y][x + 1:]
-
+            # only render the part of the Map that fits into the widget
+            height, width = self.widget.get_absolute_dimensions()
+            padx, pady = self.widget.get_padding()
+            self.__viewport.resize(width - 2 * padx, height - 2 * pady)
+            FrameProfiler.instance().begin(FrameProfiler.MAP)
+            rows = self.__viewport.render(self.__map)
+            FrameProfiler.instance().end(FrameProfiler.MAP)
             self.widget.set_title("\n".join(rows))
 
     def render_reset(self) -> None:
@@ -196,32 +221,42 @@ class CurrentStateVectorWidget(Widget):
         super().__init__(widget)
         self.__headline = headline
         self.__state_vector = None
+        self.__target = None
         self.__diff_vector = None
+        self.__key = None   # the StateVectors the cached text was rendered from
+        self.__text = ""
         widget.add_text_color_rule("~.*~", ColorConfig.STV_HEADING_COLOR, 'contains', match_type='regex')
         widget.add_text_color_rule("\(0\)", ColorConfig.CORRECT_AMPLITUDE_COLOR, "contains", match_type="regex")
         #widget.add_text_color_rule("\(\d\)", ColorConfig.CORRECT_AMPLITUDE_COLOR, "contains", match_type="regex")
         widget.add_text_color_rule("\([^0].*\)", ColorConfig.WRONG_AMPLITUDE_COLOR, "contains", match_type="regex")
 
     def set_data(self, state_vectors: Tuple[StateVector, StateVector]) -> None:
-        self.__state_vector, target = state_vectors
-        self.__diff_vector = target.get_diff(self.__state_vector)
+        self.__state_vector, self.__target = state_vectors
 
     def render(self) -> None:
         if self.__state_vector is not None:
-            str_rep = f"~{self.__headline}~\n"
-            stv_rows = self.__state_vector.to_string().split('\n')
-            diff_rows = ["(" + val + ")" for val in self.__diff_vector.to_string().split('\n')]
-
-            max_stv_width = max([len(val) for val in stv_rows])
-            max_diff_width = max([len(val) for val in diff_rows])
-
-            # last row is empty due to the trailing \n and therefore uninteresting to us
-            for i in range(len(stv_rows) - 1):
-                str_rep += uf.center_string(stv_rows[i], max_stv_width, uneven_left=True)
-                str_rep += "  "
-                str_rep += uf.center_string(diff_rows[i], max_diff_width, uneven_left=False)
-                str_rep += "\n"
-            self.widget.set_title(str_rep)
+            # StateVectors are never changed after their creation so the same objects always result in the same text
+            if self.__key is None or self.__key[0] is not self.__state_vector or self.__key[1] is not self.__target:
+                self.__key = self.__state_vector, self.__target
+                self.__diff_vector = self.__target.get_diff(self.__state_vector)
+                self.__text = self.__render_text()
+            self.widget.set_title(self.__text)
+
+    def __render_text(self) -> str:
+        str_rep = f"~{self.__headline}~\n"
+        stv_rows = self.__state_vector.to_string().split('\n')
+        diff_rows = ["(" + val + ")" for val in self.__diff_vector.to_string().split('\n')]
+
+        max_stv_width = max([len(val) for val in stv_rows])
+        max_diff_width = max([len(val) for val in diff_rows])
+
+        # last row is empty due to the trailing \n and therefore uninteresting to us
+        for i in range(len(stv_rows) - 1):
+            str_rep += uf.center_string(stv_rows[i], max_stv_width, uneven_left=True)
+            str_rep += "  "
+            str_rep += uf.center_string(diff_rows[i], max_diff_width, uneven_left=False)
+            str_rep += "\n"
+        return str_rep
 
     def render_reset(self) -> None:
         self.widget.set_title("")
@@ -281,17 +316,11 @@ class SelectionWidget(Widget):
         self.__callbacks = []
         self.widget.add_text_color_rule(f"->", ColorConfig.SELECTION_COLOR, 'contains', match_type='regex')
 
-        # sadly cannot use a loop here because how lambda expressions work the index would be the same for all calls
-        self.widget.add_key_command(controls.get_keys(Keys.HotKey1), lambda: self.__jump_to_index(0))
-        self.widget.add_key_command(controls.get_keys(Keys.HotKey2), lambda: self.__jump_to_index(1))
-        self.widget.add_key_command(controls.get_keys(Keys.HotKey3), lambda: self.__jump_to_index(2))
-        self.widget.add_key_command(controls.get_keys(Keys.HotKey4), lambda: self.__jump_to_index(3))
-        self.widget.add_key_command(controls.get_keys(Keys.HotKey5), lambda: self.__jump_to_index(4))
-        self.widget.add_key_command(controls.get_keys(Keys.HotKey6), lambda: self.__jump_to_index(5))
-        self.widget.add_key_command(controls.get_keys(Keys.HotKey7), lambda: self.__jump_to_index(6))
-        self.widget.add_key_command(controls.get_keys(Keys.HotKey8), lambda: self.__jump_to_index(7))
-        self.widget.add_key_command(controls.get_keys(Keys.HotKey9), lambda: self.__jump_to_index(8))
-        self.widget.add_key_command(controls.get_keys(Keys.HotKey0), lambda: self.__jump_to_index(9))
+        # partial instead of a lambda since the latter would use the last index for all calls (and is not picklable)
+        hot_keys = [Keys.HotKey1, Keys.HotKey2, Keys.HotKey3, Keys.HotKey4, Keys.HotKey5, Keys.HotKey6, Keys.HotKey7,
+                    Keys.HotKey8, Keys.HotKey9, Keys.HotKey0]
+        for index, hot_key in enumerate(hot_keys):
+            self.widget.add_key_command(controls.get_keys(hot_key), functools.partial(self.__jump_to_index, index))
 
     @property
     def num_of_choices(self) -> int:
@@ -1,7 +1,8 @@
 import curses
+import hashlib
 import time
 from enum import Enum
-from typing import List, Callable
+from typing import List, Callable, Iterable, Tuple, Dict, Optional
 
 import py_cui
 
@@ -19,28 +20,57 @@ from game.map.tutorial import Tutorial
 from game.map.world_map import WorldMap
 from game.save_data import SaveData
 from util.config import PathConfig, ColorConfig, CheatConfig, GameplayConfig, Config
+from util.frame_profiler import FrameProfiler
 from util.game_simulator import GameSimulator
 from util.key_logger import KeyLogger
 from util.logger import Logger
+from util.my_random import RandomManager
+from util.replay_snapshots import ReplaySnapshot, ReplaySnapshots, dump_state, load_state
 from widgets.color_rules import MultiColorRenderer
+from widgets.headless import HeadlessScreen, HeadlessRenderer
 from widgets.my_popups import Popup, MultilinePopup, ConfirmationPopup
 from widgets.renderable import Renderable
+from widgets.screen_buffer import ScreenBuffer
 from widgets.spaceship import SpaceshipWidgetSet
 from widgets.widget_sets import ExploreWidgetSet, FightWidgetSet, MyWidgetSet, ShopWidgetSet, \
     RiddleWidgetSet, BossFightWidgetSet, PauseMenuWidgetSet, MenuWidgetSet, WorkbenchWidgetSet
 
 
 class QrogueCUI(py_cui.PyCUI):
-    def __init__(self, seed: int, controls: Controls, width: int = 8, height: int = 9):
-        super().__init__(width, height)
+    __FAST_PLAYBACK_FRAME_TIME = 50     # milliseconds between two frames while fast-forwarding a simulation
+    __SNAPSHOT_VERSION = 1      # has to be increased whenever the content of __create_snapshot() changes
+
+    def __init__(self, seed: int, controls: Controls, width: int = 8, height: int = 9,
+                 headless_size: Tuple[int, int] = None):
+        """
+
+        :param seed: seed of the game
+        :param controls: the keys to control the game
+        :param width: number of columns of the grid
+        :param height: number of rows of the grid
+        :param headless_size: (rows, columns) of the simulated terminal if we want to run without a terminal (see
+        start_headless()), None if we run in a real terminal
+        """
+        if headless_size is None:
+            super().__init__(width, height)
+        else:
+            super().__init__(width, height, simulated_terminal=list(headless_size))
+        self.__headless = headless_size is not None
+        if Config.debugging():
+            FrameProfiler(seed)     # shows frame timings in the HUD and writes them to the logs folder
+        self.__profiler = FrameProfiler.instance()
         self.set_title(f"Qrogue {Config.version()}")
         Logger.instance().set_popup(self.show_message_popup, self.show_error_popup)
         Popup.update_popup_functions(self.__show_message_popup)
         ConfirmationPopup.update_popup_function(self.__show_confirmation_popup)
         CheatConfig.init(self.__show_message_popup, self.__show_input_popup)
 
-        self.__key_logger = None  #KeyLogger(seed)
+        self.__key_logger = None    # created when the player starts playing
         self.__simulator = None
+        self.__diverged_after = None    # number of keys after which the replay first differed from the recording
+        self.__verified_until = 0       # number of keys after which the replay last matched the recording
+        self.__fast_forward = False     # only the last frame is drawn (see replay_headless())
+        self.__fast_playback = False    # simulated keys are applied in batches (see __simulate_batch())
         self.__state_machine = StateMachine(self)
         self.__seed = seed
         self.__controls = controls
@@ -55,7 +85,7 @@ class QrogueCUI(py_cui.PyCUI):
         self.__menu = MenuWidgetSet(controls, self.__render, Logger.instance(), self, self.__start_playing, self.stop,
                                     self.__choose_simulation)
         self.__pause = PauseMenuWidgetSet(controls, self.__render, Logger.instance(), self, self.__general_continue,
-                                          self.switch_to_menu)
+                                          self.__return_to_menu)
 
         self.__spaceship = SpaceshipWidgetSet(self.__seed, controls, Logger.instance(), self, self.__render,
                                               self.__show_world, cbp, self.__save_data)
@@ -80,10 +110,187 @@ class QrogueCUI(py_cui.PyCUI):
     def simulating(self) -> bool:
         return self.__simulator is not None
 
+    @property
+    def headless(self) -> bool:
+        return self.__headless
+
+    @property
+    def num_of_keys(self) -> int:
+        """
+        :return: number of keys pressed since the run started (logged or simulated ones)
+        """
+        if self.__simulator is not None:
+            return self.__simulator.num_of_keys
+        if self.__key_logger is not None:
+            return self.__key_logger.num_of_keys
+        return 0
+
+    def log_event(self, name: str, **fields):
+        """
+        Logs an event of the run (see Logger.event()) together with the number of keys pressed so far.
+        """
+        Logger.instance().event(name, keys=self.num_of_keys, **fields)
+
     def start(self):
         self.render()
         super(QrogueCUI, self).start()
 
+    def start_headless(self, keys: Iterable[int], on_frame: Callable[[HeadlessScreen], None] = None) \
+            -> HeadlessScreen:
+        """
+        Runs the whole game loop without a terminal as fast as possible. The frames are drawn into an in-memory
+        HeadlessScreen and the given keys are used as input. The loop stops once all keys were pressed.
+
+        :param keys: the keys to press one after another
+        :param on_frame: called with the screen after every frame (e.g. to record or check the frames)
+        :return: the screen containing the last frame
+        """
+        if not self.__headless:
+            Logger.instance().throw(RuntimeError("QrogueCUI was not created with a headless_size!"))
+        height, width = self._simulated_terminal
+        screen = HeadlessScreen(height, width, keys, on_frame, self.stop)
+        self.render()
+        self._logger.info(f'Starting {self._title} CUI headless')
+        self._stopped = False
+        self._draw(screen)
+        return screen
+
+    def replay_headless(self, simulator: GameSimulator, snapshot: ReplaySnapshot = None,
+                        snapshots: ReplaySnapshots = None, stop_at: int = None) -> "ReplayResult":
+        """
+        Replays a recorded run without a terminal as fast as possible, i.e. without any pauses between the keys and
+        without drawing any frame but the last one. Like the recording, the replay starts by pressing PLAY in the
+        menu. Hence, the QrogueCUI has to be freshly created with the seed of the recorded run.
+
+        :param simulator: provides the keys of the recorded run (without a notification popup)
+        :param snapshot: if given, the game is restored from it and the replay continues from there
+        :param snapshots: if given, a snapshot is added to it every snapshots.interval keys
+        :param stop_at: if given, the replay stops after this many keys (e.g. to seek to a certain point of a run)
+        :return: the outcome of the replay
+        """
+        state_timings = {}  # state name -> [number of keys, seconds] it took to replay the keys pressed in this state
+
+        def keys():
+            if snapshot is not None:
+                # the first frame already simulated a key but the restored state overwrites its effects anyway
+                self.__restore_snapshot(snapshot.data)
+                self.__simulator.skip_to(snapshot.position, snapshot.num_of_keys)
+            last_snapshot = self.__simulator.num_of_keys
+            step_key = self.__controls.get_key(Keys.Action)     # any key except StopSimulator triggers the next one
+            while self.__simulator is not None:
+                num_of_keys = self.__simulator.num_of_keys
+                if stop_at is not None and num_of_keys >= stop_at:
+                    break
+                if snapshots is not None and num_of_keys >= last_snapshot + snapshots.interval:
+                    data = self.__create_snapshot()
+                    if data is not None:
+                        snapshots.add(ReplaySnapshot(num_of_keys, self.__simulator.position, data))
+                        last_snapshot = num_of_keys
+                timing = state_timings.setdefault(self.__state_machine.cur_state.name, [0, 0.0])
+                key_start = time.perf_counter()
+                yield step_key
+                # the frame processing the key ends when the next key is requested
+                timing[0] += 1
+                timing[1] += time.perf_counter() - key_start
+
+        self.__fast_forward = True
+        start_time = time.time()
+        self.__simulator = simulator
+        super(QrogueCUI, self)._handle_key_presses(self.__controls.get_key(Keys.Action))    # PLAY
+        screen = self.start_headless(keys())
+        wall_time = time.time() - start_time
+        return ReplayResult(simulator, self.__simulator is None, self.__state_machine.cur_state, wall_time, screen,
+                            self.__diverged_after, self.__verified_until,
+                            {state: (keys, seconds) for state, (keys, seconds) in state_timings.items()})
+
+    def __snapshot_environment(self) -> Dict[str, object]:
+        # objects that belong to this process instead of the game's state
+        return {
+            "cui": self,
+            "screen": self._stdscr,
+            "renderer": self._renderer,
+            "cui_logger": self._logger,
+            "logger": Logger.instance(),
+            "simulator": self.__simulator,
+            "profiler": self.__profiler,
+            "random": RandomManager.instance(),
+            "spaceship": self.__spaceship.spaceship,
+        }
+
+    def __create_snapshot(self) -> Optional[bytes]:
+        """
+        Can only be called between two frames of a headless replay. Only the game's state is stored, i.e. the state of
+        the random generators, the StateMachine, the SaveData, the progress on the spaceship and the explored Map with
+        its Robot. Hence, snapshots can only be taken while exploring or on the spaceship without an open popup.
+
+        :return: the serialized state of the game or None if no snapshot can be taken right now
+        """
+        # the other states would need the details of their widget sets (e.g. the circuit of a fight)
+        if self._popup is not None or self.__state_machine.cur_state not in [State.Explore, State.Spaceship]:
+            return None
+        map = self.__explore.map
+        state = {
+            "version": QrogueCUI.__SNAPSHOT_VERSION,
+            "random": RandomManager.instance().get_state(),
+            "states": (self.__state_machine.cur_state, self.__state_machine.prev_state),
+            "spaceship": self.__spaceship.spaceship.get_state(),     # contains the SaveData
+            "map": map,
+            "robot": None if map is None else map.controllable_tile.controllable,
+        }
+        return dump_state(state, self.__snapshot_environment())
+
+    def __restore_snapshot(self, data: bytes):
+        state = load_state(data, self.__snapshot_environment())
+        if state["version"] != QrogueCUI.__SNAPSHOT_VERSION:
+            Logger.instance().throw(ValueError(f"Unsupported snapshot version: {state['version']} (expected "
+                                               f"{QrogueCUI.__SNAPSHOT_VERSION})"))
+        RandomManager.instance().set_state(state["random"])
+        self.__spaceship.spaceship.set_state(state["spaceship"])
+        self.__save_data = state["spaceship"][0]
+        cur_state, prev_state = state["states"]
+        self.__state_machine.restore(cur_state, prev_state)
+        if cur_state == State.Explore:
+            if isinstance(state["robot"], Robot):
+                self.__pause.set_data(state["robot"])   # needed for the HUD
+            self.switch_to_explore(state["map"])
+        else:
+            if state["map"] is not None:
+                self.__explore.set_data(state["map"], state["robot"])
+            self.switch_to_spaceship()
+
+    def __state_hash(self) -> str:
+        """
+        :return: a hash of the parts of the game's state that show whether a replay still matches the recorded run
+        """
+        state = [self.__state_machine.cur_state.name]
+        pos = self.__spaceship.player_pos
+        if pos is not None:
+            state.append((pos.x, pos.y))
+        map = self.__explore.map
+        if map is not None:
+            pos = map.controllable_pos
+            state.append((pos.x, pos.y))
+            robot = map.controllable_tile.controllable
+            if isinstance(robot, Robot):
+                backpack = robot.backpack
+                state.append((robot.cur_hp, robot.max_hp, backpack.coin_count, backpack.key_count))
+                state.append([instruction.short_name() for instruction in backpack])
+                state.append([consumable.name() for consumable in backpack.pouch_iterator()])
+        state.append(RandomManager.instance().get_state())
+        return hashlib.blake2b(repr(state).encode(), digest_size=KeyLogger.STATE_HASH_LENGTH // 2).hexdigest()
+
+    def __verify_state_hash(self):
+        recorded = self.__simulator.pop_state_hash()
+        if recorded is None or self.__diverged_after is not None:
+            return
+        num_of_keys, state_hash = recorded
+        if state_hash == self.__state_hash():
+            self.__verified_until = num_of_keys
+        else:
+            self.__diverged_after = num_of_keys
+            Logger.instance().error(f"Simulation differs from the recorded run after key {num_of_keys} (last match "
+                                    f"after key {self.__verified_until})", show=False)
+
     def __choose_simulation(self):
         title = "Enter the path to the .qrkl-file to simulate:"
         self.__show_input_popup(title, py_cui.WHITE_ON_CYAN, self.__start_simulation)
@@ -93,19 +300,32 @@ class QrogueCUI(py_cui.PyCUI):
             path += ".qrkl"
         try:
             self.__simulator = GameSimulator(self.__controls, path, in_keylog_folder=True)
+            self.__diverged_after = None
+            self.__verified_until = 0
             self.__menu.simulate_with_seed(self.__simulator.seed)
             # go back to the original position of the cursor and start the game
             super(QrogueCUI, self)._handle_key_presses(self.__controls.get_key(Keys.SelectionUp))
             super(QrogueCUI, self)._handle_key_presses(self.__controls.get_key(Keys.SelectionUp))
             super(QrogueCUI, self)._handle_key_presses(self.__controls.get_key(Keys.Action))
-            if self.__simulator.version == Config.version():
+            if self.__simulator.log_format != Config.KEYLOG_FORMAT:
+                Popup.message("Simulating old keylog", "The run was recorded in an older keylog format "
+                                                       f"({self.__simulator.log_format} instead of "
+                                                       f"{Config.KEYLOG_FORMAT}) whose keys cannot be simulated "
+                                                       "correctly. Close this popup and press ESC to abort the "
+                                                       "simulation.")
+            elif self.__simulator.version == Config.version():
                 __space = "Space"
+                fast_forward = ""
+                if GameplayConfig.simulation_speed() > 0:
+                    pause_keys = [ColorConfig.highlight_key(name)
+                                  for name in self.__controls.get_key_names(Keys.Pause)]
+                    fast_forward = f" Press {' or '.join(pause_keys)} to fast-forward."
                 Popup.message("Starting Simulation", f"You started a run with \nseed = {self.__simulator.seed}\n"
                                                      f"recorded at {self.__simulator.time}.\n"
                                                      f"Press {ColorConfig.highlight_key(__space)} to execute the "
                                                      "simulation step by step. Alternatively, if you keep it pressed "
                                                      "the simulation will be executed automatically with short delays "
-                                                     "after each step until you let go of Space again.")
+                                                     f"after each step until you let go of Space again.{fast_forward}")
             else:
                 Popup.message("Simulating other version", "You try to simulate the run of a different game version.\n"
                                                           f"Your version: {Config.version()}\n"
@@ -117,6 +337,8 @@ class QrogueCUI(py_cui.PyCUI):
             Logger.instance().show_error(f"File \"{path}\" could not be found!")
 
     def _ready_for_input(self, key_pressed: int, gameplay: bool = True) -> bool:
+        if self.__headless:
+            return True     # the keys don't come from a human holding them down, so we don't need pauses
         if self.__last_key != key_pressed:
             self.__last_key = key_pressed
             return True
@@ -141,18 +363,63 @@ class QrogueCUI(py_cui.PyCUI):
                 else:
                     if GameplayConfig.log_keys() and self.__game_started and not self.simulating:
                         self.__key_logger.log(self.__controls, key_pressed)
-                    super(QrogueCUI, self)._handle_key_presses(key_pressed)
+                        super(QrogueCUI, self)._handle_key_presses(key_pressed)
+                        interval = GameplayConfig.state_hash_interval()
+                        if interval > 0 and self.__key_logger.num_of_keys % interval == 0:
+                            self.__key_logger.log_state_hash(self.__state_hash())
+                    else:
+                        super(QrogueCUI, self)._handle_key_presses(key_pressed)
         elif key_pressed in self.__controls.get_keys(Keys.StopSimulator):
             Popup.message("Simulator", "stopped Simulator")
             self.__simulator = None
+            self.__fast_playback = False
+        elif key_pressed in self.__controls.get_keys(Keys.Pause) and GameplayConfig.simulation_speed() > 0:
+            self.__fast_playback = not self.__fast_playback
+            self.__last_input = time.time()
+        elif self.__fast_playback:
+            self.__simulate_batch()
         else:
             if self._ready_for_input(key_pressed, gameplay=False):
-                key = self.__simulator.next()
-                if key:
-                    super(QrogueCUI, self)._handle_key_presses(key)
-                else:
-                    Popup.message("Simulator", "finished")
-                    self.__simulator = None
+                self.__simulate_key()
+
+    def __simulate_key(self) -> bool:
+        """
+        Presses the next key of the simulation.
+
+        :return: False if the simulation finished, True otherwise
+        """
+        self.__profiler.begin(FrameProfiler.SIMULATION)
+        key = self.__simulator.next()
+        self.__profiler.end(FrameProfiler.SIMULATION)
+        self.__verify_state_hash()
+        if key:
+            super(QrogueCUI, self)._handle_key_presses(key)
+            return True
+
+        if not self.__headless:
+            if self.__diverged_after is None:
+                Popup.message("Simulator", "finished")
+            else:
+                Popup.message("Simulator", f"finished but the game differed from the recorded run after key "
+                                           f"{self.__diverged_after}")
+        self.__simulator = None
+        self.__fast_playback = False
+        return False
+
+    def __simulate_batch(self):
+        """
+        Presses as many keys of the simulation as the configured speed allows since the last batch, so fast-forwarding
+        only draws a frame per batch. A batch ends early if the state of the game changes, hence every screen that was
+        visited in the recorded run is still drawn.
+        """
+        now = time.time()
+        speed = GameplayConfig.simulation_speed()
+        num_of_keys = min(max(int((now - self.__last_input) * speed), 1), speed)
+        self.__last_input = now
+        state = self.__state_machine.cur_state
+        for _ in range(num_of_keys):
+            if not self.__simulate_key() or self.__state_machine.cur_state != state:
+                break
 
     def _draw(self, stdscr) -> None:    # overridden because we want to ignore mouse events
         """Main CUI draw loop called by start()
@@ -163,6 +430,9 @@ class QrogueCUI(py_cui.PyCUI):
             The screen buffer used for drawing CUI elements
         """
 
+        if not self.__headless:
+            # only the rows that changed since the last frame are written to the terminal
+            stdscr = ScreenBuffer(stdscr)
         self._stdscr = stdscr
         key_pressed = 0
 
@@ -192,9 +462,11 @@ class QrogueCUI(py_cui.PyCUI):
                 # If we call stop, we want to break out of the main draw loop
                 if self._stopped:
                     break
+                self.__profiler.begin_frame()
 
-                # Initialization and size adjustment
-                stdscr.erase()
+                # Initialization and size adjustment (starts a new frame of the ScreenBuffer)
+                if not self.__fast_forward:
+                    stdscr.erase()
 
                 # If the user defined an update function to fire on each draw call,
                 # Run it here. This can of course be also handled user-side
@@ -205,6 +477,7 @@ class QrogueCUI(py_cui.PyCUI):
                 # This is what allows the CUI to be responsive. Adjust grid size based on current terminal size
                 # Resize the grid and the widgets if there was a resize operation
                 if key_pressed == curses.KEY_RESIZE:
+                    stdscr.clear()  # the terminal's content is lost so every row has to be written anew
                     try:
                         self._refresh_height_width()
                     except py_cui.errors.PyCUIOutOfBoundsError as e:
@@ -248,29 +521,15 @@ class QrogueCUI(py_cui.PyCUI):
                     self._cycle_widgets(reverse=True)
 
                 # Handle keypresses
+                self.__profiler.begin(FrameProfiler.INPUT)
                 self._handle_key_presses(key_pressed)
+                self.__profiler.end(FrameProfiler.INPUT)
 
-                try:
-                    # Draw status/title bar, and all widgets. Selected widget will be bolded.
-                    self._draw_status_bars(stdscr, self._height, self._width)
-                    self._draw_widgets()
-                    # draw the popup if required
-                    if self._popup is not None:
-                        self._popup._draw()
-
-                    # If we are in live debug mode, we draw our debug messages
-                    if self._logger.is_live_debug_enabled():
-                        self._logger.draw_live_debug()
-
-                except curses.error as e:
-                    self._logger.error('Curses error while drawing TUI')
-                    self._display_window_warning(stdscr, str(e))
-                except py_cui.errors.PyCUIOutOfBoundsError as e:
-                    self._logger.error('Resized terminal too small')
-                    self._display_window_warning(stdscr, str(e))
-
-                # Refresh the screen
-                stdscr.refresh()
+                self.__profiler.begin(FrameProfiler.DRAW)
+                if not self.__fast_forward:
+                    self.__draw_frame(stdscr)
+                self.__profiler.end(FrameProfiler.DRAW)
+                self.__profiler.end_frame()
 
                 # Wait for next input
                 if self._loading or self._post_loading_callback is not None:
@@ -282,6 +541,11 @@ class QrogueCUI(py_cui.PyCUI):
                     key_pressed = self._exit_key
                 else:
                     self._logger.info('Waiting for next keypress')
+                    # while fast-forwarding we don't wait for a key but continue with the next batch after a frame
+                    if self.__fast_playback:
+                        stdscr.timeout(QrogueCUI.__FAST_PLAYBACK_FRAME_TIME)
+                    else:
+                        stdscr.timeout(self._refresh_timeout if self._refresh_timeout > 0 else -1)
                     key_pressed = stdscr.getch()
 
             except KeyboardInterrupt:
@@ -289,20 +553,74 @@ class QrogueCUI(py_cui.PyCUI):
                 self._stopped = True
 
 
-        stdscr.erase()
-        stdscr.refresh()
-        curses.endwin()
+        self.log_event("End")
+        self.__profiler.flush()
+        if self.__key_logger is not None:
+            self.__key_logger.flush_if_useful()
+        if self.__fast_forward:
+            stdscr.erase()
+            self.__draw_frame(stdscr)
+        if not self.__headless:     # a HeadlessScreen keeps the last frame for inspection
+            stdscr.erase()
+            stdscr.refresh()
+            curses.endwin()
         if self._on_stop is not None:
             self._logger.debug(f'Firing onstop function {self._on_stop.__name__}')
             self._on_stop()
 
+    def __draw_frame(self, stdscr) -> None:
+        try:
+            # Draw status/title bar, and all widgets. Selected widget will be bolded.
+            self._draw_status_bars(stdscr, self._height, self._width)
+            self._draw_widgets()
+            # draw the popup if required
+            if self._popup is not None:
+                self._popup._draw()
+
+            # If we are in live debug mode, we draw our debug messages
+            if self._logger.is_live_debug_enabled():
+                self._logger.draw_live_debug()
+
+        except curses.error as e:
+            self._logger.error('Curses error while drawing TUI')
+            self._display_window_warning(stdscr, str(e))
+        except py_cui.errors.PyCUIOutOfBoundsError as e:
+            self._logger.error('Resized terminal too small')
+            self._display_window_warning(stdscr, str(e))
+
+        # Refresh the screen
+        stdscr.refresh()
+
+    def _initialize_colors(self) -> None:
+        if not self.__headless:     # there are no colors without a terminal
+            super(QrogueCUI, self)._initialize_colors()
+
     def _initialize_widget_renderer(self):
         """Function that creates the renderer object that will draw each widget
         """
         if self._renderer is None:
-            self._renderer = MultiColorRenderer(self, self._stdscr, self._logger)
+            if self.__headless:
+                self._renderer = HeadlessRenderer(self, self._stdscr, self._logger)
+            else:
+                self._renderer = MultiColorRenderer(self, self._stdscr, self._logger)
         super(QrogueCUI, self)._initialize_widget_renderer()
 
+    def _draw_status_bars(self, stdscr, height: int, width: int) -> None:
+        if not self.__headless:
+            super(QrogueCUI, self)._draw_status_bars(stdscr, height, width)
+            return
+        # same as py_cui's version but without curses' color pairs
+        if self.status_bar is not None and self.status_bar.get_height() > 0:
+            stdscr.addstr(height + 3, 0, py_cui.fit_text(width, self.status_bar.get_text()))
+        if self.title_bar is not None and self.title_bar.get_height() > 0:
+            stdscr.addstr(0, 0, py_cui.fit_text(width, self._title, center=True))
+
+    def _display_window_warning(self, stdscr, error_info: str) -> None:
+        if self.__headless:
+            self._logger.error(f'Error displaying CUI: {error_info}')
+        else:
+            super(QrogueCUI, self)._display_window_warning(stdscr, error_info)
+
     def __init_keys(self) -> None:
         # debugging stuff
         self.add_key_command(self.__controls.get_key(Keys.PrintScreen), self.print_screen)
@@ -420,6 +738,10 @@ class QrogueCUI(py_cui.PyCUI):
 
     def __start_playing(self):
         Pausing(self.__pause_game)
+        if self.__key_logger is None and not self.simulating:
+            # log the keys from the start of the game so the run can be replayed with the same seed
+            self.__key_logger = KeyLogger(self.__seed)
+            self.__game_started = True
         self.__state_machine.change_state(State.Spaceship, self.__save_data)
 
     def switch_to_spaceship(self, data=None):
@@ -444,35 +766,41 @@ class QrogueCUI(py_cui.PyCUI):
         self.__menu.new_seed()
         self.apply_widget_set(self.__menu)
 
+    def __return_to_menu(self) -> None:
+        # bypasses the StateMachine, so we have to log the change ourselves
+        self.log_event("State", state=State.Menu.name)
+        self.switch_to_menu(None)
+
     def __show_world(self, save_data: SaveData, world: WorldMap) -> None:
         if world is None:
             self.__state_machine.change_state(State.Spaceship, None)
         else:
+            self.log_event("World", world=world.name)
             self.__state_machine.change_state(State.Explore, world)
 
     def __start_level(self, seed: int, level: LevelMap) -> None:
         robot = level.controllable_tile.controllable
         if isinstance(robot, Robot):
             self.__pause.set_data(robot)   # needed for the HUD
+            self.log_event("Level", level=level.name)
             self.__state_machine.change_state(State.Explore, level)
-
-            self.__key_logger = KeyLogger(seed)     # the seed used to build the Map
-            self.__game_started = True
         else:
             Logger.instance().throw(ValueError(f"Tried to start a level with a non-Robot: {robot}"))
 
     def __end_of_gameplay(self) -> None:
-        self.switch_to_menu(None)
+        self.__return_to_menu()
 
     def __won_tutorial(self) -> None:
-        self.switch_to_menu(None)
+        self.__return_to_menu()
         bell = ColorConfig.highlight_word("Bell")
         Popup.message("You won!", f"Congratulations, you defeated {bell} and successfully played the Tutorial!")
 
     def __start_fight(self, robot: Robot, enemy: Enemy, direction: Direction) -> None:
+        self.log_event("Fight", enemy=type(enemy).__name__)
         self.__state_machine.change_state(State.Fight, (enemy, robot))
 
     def __start_boss_fight(self, robot: Robot, boss: Boss, direction: Direction):
+        self.log_event("Fight", enemy=type(boss).__name__)
         self.__state_machine.change_state(State.BossFight, (robot, boss))
 
     def switch_to_pause(self, data=None) -> None:
@@ -489,6 +817,9 @@ class QrogueCUI(py_cui.PyCUI):
         self.apply_widget_set(self.__explore)
 
     def __continue_explore(self) -> None:
+        if self.__explore.map is not None:
+            # the fight, Riddle or Shop we return from decides how the Tile that started it looks from now on
+            self.__explore.map.resolve_trigger()
         self.__state_machine.change_state(State.Explore, None)
 
     def switch_to_fight(self, data) -> None:
@@ -651,9 +982,17 @@ class StateMachine:
     def prev_state(self) -> State:
         return self.__prev_state
 
+    def restore(self, cur_state: State, prev_state: State) -> None:
+        """
+        Sets the current and previous state without switching to the current one (e.g. when restoring a snapshot).
+        """
+        self.__cur_state = cur_state
+        self.__prev_state = prev_state
+
     def change_state(self, state: State, data) -> None:
         self.__prev_state = self.__cur_state
         self.__cur_state = state
+        self.__renderer.log_event("State", state=state.name)
 
         if self.__cur_state == State.Menu:
             self.__renderer.switch_to_menu(data)
@@ -675,3 +1014,92 @@ class StateMachine:
         elif self.__cur_state == State.Workbench:
             self.__renderer.switch_to_workbench(data)
             Logger.instance().debug("changing to Workbench")
+
+
+class ReplayResult:
+    """
+    Outcome of replaying a recorded run with QrogueCUI.replay_headless().
+    """
+
+    def __init__(self, simulator: GameSimulator, finished: bool, state: State, wall_time: float,
+                 screen: HeadlessScreen, diverged_after: int = None, verified_until: int = 0,
+                 state_timings: Dict[str, Tuple[int, float]] = None):
+        """
+
+        :param simulator: the simulator that provided the keys
+        :param finished: whether all keys were replayed or the game stopped before
+        :param state: the state the game was in after the last key
+        :param wall_time: how long the replay took in seconds
+        :param screen: the screen containing the last frame
+        :param diverged_after: number of keys after which the state of the game first differed from the recorded
+        state hash, None if it never did
+        :param verified_until: number of keys after which the state of the game last matched a recorded state hash
+        :param state_timings: name of a State -> number of keys pressed in it and how many seconds it took to replay them
+        """
+        self.__version = simulator.version
+        self.__log_format = simulator.log_format
+        self.__seed = simulator.seed
+        self.__num_of_keys = simulator.num_of_keys
+        self.__finished = finished
+        self.__state = state
+        self.__wall_time = wall_time
+        self.__screen = screen
+        self.__diverged_after = diverged_after
+        self.__verified_until = verified_until
+        self.__state_timings = state_timings if state_timings is not None else {}
+
+    @property
+    def version(self) -> str:
+        return self.__version
+
+    @property
+    def log_format(self) -> int:
+        return self.__log_format
+
+    @property
+    def seed(self) -> int:
+        return self.__seed
+
+    @property
+    def num_of_keys(self) -> int:
+        return self.__num_of_keys
+
+    @property
+    def finished(self) -> bool:
+        return self.__finished
+
+    @property
+    def state(self) -> State:
+        return self.__state
+
+    @property
+    def wall_time(self) -> float:
+        return self.__wall_time
+
+    @property
+    def screen(self) -> HeadlessScreen:
+        return self.__screen
+
+    @property
+    def diverged_after(self) -> int:
+        return self.__diverged_after
+
+    @property
+    def verified_until(self) -> int:
+        return self.__verified_until
+
+    @property
+    def state_timings(self) -> Dict[str, Tuple[int, float]]:
+        return self.__state_timings
+
+    def __str__(self) -> str:
+        if self.__finished:
+            outcome = "finished"
+        else:
+            outcome = "stopped early"
+        text = f"Replay of seed {self.__seed} ({self.__version}) {outcome} after {self.__num_of_keys} keys in " \
+               f"{self.__wall_time:.3f} seconds with the game in state {self.__state.name}\n"
+        if self.__diverged_after is not None:
+            text += f"The game differed from the recorded run after key {self.__diverged_after} (last match after " \
+                    f"key {self.__verified_until})\n"
+        return text + str(self.__screen)
@@ -0,0 +1,106 @@
+import curses
+from typing import Dict, List, Tuple
+
+
+class ScreenBuffer:
+    """
+    Double-buffered stand-in for the curses screen. Everything drawn during a frame is only recorded (back buffer). On
+    refresh() the recorded rows are compared with the ones of the previous frame (front buffer) and only the rows that
+    changed are written to the real screen. Hence, a frame in which e.g. only the robot moved by one cell results in
+    two rewritten rows instead of the whole screen.
+
+    Supports the subset of the curses window interface that py_cui uses for drawing, everything else is passed on to
+    the real screen.
+    """
+
+    def __init__(self, screen):
+        """
+
+        :param screen: the real (curses) screen to draw on
+        """
+        self.__screen = screen
+        self.__back: Dict[int, List[Tuple[int, str, int]]] = {}
+        self.__front: Dict[int, List[Tuple[int, str, int]]] = {}
+        self.__attr = 0
+        self.__cursor = None
+        self.__written_rows = 0
+
+    @property
+    def screen(self):
+        return self.__screen
+
+    @property
+    def written_rows(self) -> int:
+        """
+        :return: number of rows that were written to the real screen by the last refresh()
+        """
+        return self.__written_rows
+
+    def __getattr__(self, name: str):
+        # e.g. getch(), timeout() or getmaxyx()
+        return getattr(self.__screen, name)
+
+    def attron(self, attr: int):
+        self.__attr |= attr
+
+    def attroff(self, attr: int):
+        self.__attr &= ~attr
+
+    def addstr(self, y: int, x: int, text: str, attr: int = None):
+        height, width = self.__screen.getmaxyx()
+        if not (0 <= y < height and 0 <= x < width):
+            # the real screen would refuse to draw there too
+            raise curses.error(f"addstr() outside of the screen: {x}|{y}")
+        if attr is None:
+            attr = self.__attr
+        if y not in self.__back:
+            self.__back[y] = []
+        self.__back[y].append((x, text, attr))
+
+    def move(self, y: int, x: int):
+        self.__cursor = y, x
+
+    def erase(self):
+        """
+        Starts a new frame. Unlike the real erase() the screen itself is left untouched until the next refresh().
+        """
+        self.__back = {}
+        self.__cursor = None
+
+    def clear(self):
+        """
+        Starts a new frame and forces every row to be written anew with the next refresh() (e.g. after a resize).
+        """
+        self.erase()
+        self.__front = {}
+        self.__screen.clear()
+
+    def refresh(self):
+        written_rows = 0
+        for y in self.__front:
+            if y not in self.__back:
+                # the row is empty now
+                self.__screen.move(y, 0)
+                self.__screen.clrtoeol()
+                written_rows += 1
+        for y, segments in self.__back.items():
+            if self.__front.get(y) != segments:
+                self.__screen.move(y, 0)
+                self.__screen.clrtoeol()
+                for x, text, attr in segments:
+                    try:
+                        self.__screen.addstr(y, x, text, attr)
+                    except curses.error:
+                        # writing the bottom right cell moves the cursor out of the screen, the text is still drawn
+                        pass
+                written_rows += 1
+        # copy the rows since drawing can continue until the next erase()
+        self.__front = {y: list(segments) for y, segments in self.__back.items()}
+        self.__written_rows = written_rows
+
+        if self.__cursor is not None:
+            try:
+                self.__screen.move(*self.__cursor)
+            except curses.error:
+                self.__screen.move(0, 0)
+        self.__screen.refresh()
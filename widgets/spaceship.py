@@ -7,15 +7,16 @@ from dungeon_editor.dungeon_parser.QrogueGrammarListener import TextBasedDungeon
 from dungeon_editor.world_parser.QrogueWorldGenerator import QrogueWorldGenerator
 from game.actors.controllable import Controllable
 from game.actors.player import Player
-from game.actors.robot import Robot
+from game.actors.robot import Robot, LukeBot
 from game.callbacks import CallbackPack
 from game.controls import Controls
 from game.map import tiles
+from game.map.generator import LargeDungeonGenerator
 from game.map.navigation import Direction, Coordinate
 from game.map.tiles import WalkTriggerTile, TileCode
 from game.map.world_map import WorldMap
 from game.save_data import SaveData
-from util.config import ColorCode, ColorConfig, Config
+from util.config import ColorCode, ColorConfig, Config, GameplayConfig
 from util.logger import Logger
 from util.my_random import MyRandom
 from widgets.my_widgets import Widget, MyBaseWidget
@@ -64,6 +65,7 @@ def spaceship_random() -> float:
 
 
 class SpaceshipWallTile(tiles.Tile):
+    __slots__ = ("__img",)
     MAP_INVISIBLE_PRESENTATION = "X"
 
     def __init__(self, character):
@@ -81,6 +83,7 @@ class SpaceshipWallTile(tiles.Tile):
 
 
 class SpaceshipFreeWalkTile(tiles.Tile):
+    __slots__ = ()
     MAP_REPRESENTATION = "ö"
 
     def __init__(self):
@@ -98,6 +101,7 @@ class SpaceshipFreeWalkTile(tiles.Tile):
 
 
 class SpaceshipTriggerTile(WalkTriggerTile):
+    __slots__ = ("__img", "__callback")
     MAP_START_REPRESENTATION = "S"
     MAP_WORKBENCH_REPRESENTATION = "W"
     MAP_GATE_LIBRARY_REPRESENTATION = "G"
@@ -115,6 +119,7 @@ class SpaceshipTriggerTile(WalkTriggerTile):
 
 
 class OuterSpaceTile(tiles.Tile):
+    __slots__ = ("__is_star",)
     MAP_REPRESENTATION = " "
     __STAR_BIRTH_CHANCE = 0.0001
     __STAR_DIE_CHANCE = 0.01
@@ -180,6 +185,27 @@ class SpaceshipWidget(Widget):
 
         #self.widget.activate_custom_draw()
 
+    @property
+    def player_pos(self) -> Coordinate:
+        """
+        :return: position of the player on the spaceship or None if they are not on it yet
+        """
+        return self.__player_pos
+
+    def get_state(self) -> tuple:
+        """
+        :return: the progress of the player on the spaceship and in the worlds (e.g. for a snapshot of a replay)
+        """
+        return self.__save_data, self.__rm.get_state(), self.__player_pos, self.__worlds, self.__cur_world, \
+            self.__in_level
+
+    def set_state(self, state: tuple):
+        """
+        Counterpart of get_state().
+        """
+        self.__save_data, rm_state, self.__player_pos, self.__worlds, self.__cur_world, self.__in_level = state
+        self.__rm.set_state(rm_state)
+
     def __ascii_to_tile(self, character: str) -> tiles.Tile:
         if character == SpaceshipFreeWalkTile.MAP_REPRESENTATION:
             tile = SpaceshipFreeWalkTile()
@@ -216,11 +242,7 @@ class SpaceshipWidget(Widget):
 
     def render(self) -> None:
         #str_rep = ascii_spaceship
-        str_rep = ""
-        for row in self.__tiles:
-            for tile in row:
-                str_rep += tile.get_img()
-            str_rep += "\n"
+        str_rep = "".join(["".join([tile.get_img() for tile in row]) + "\n" for row in self.__tiles])
         if self.__player_pos is not None:
             # add player on top
             player_index = self.__player_pos.x + self.__player_pos.y * (SpaceshipWidget.WIDTH + 1)  # +1 because of the \n at the end
@@ -268,10 +290,18 @@ class SpaceshipWidget(Widget):
                 Logger.instance().error(f"Failed to open the specified world-file: {map_name}")
         elif map_name[0].lower() == "l":
             # todo maybe levels should be able to have arbitrary names aside from "w..." or "back"?
-            generator = TextBasedDungeonGenerator(self.__rm.get_seed(), self.__load_map,
-                                                  self.__save_data.achievement_manager)
+            level_seed = self.__rm.get_seed()
+            size = GameplayConfig.large_dungeon_size()
             try:
-                level, success = generator.generate(self.__cbp, map_name)
+                if size > 0:
+                    generator = LargeDungeonGenerator(level_seed, self.__load_map,
+                                                      self.__save_data.achievement_manager, size, size)
+                    # the Robots of the levels don't necessarily have the gates needed for random Riddles and Bosses
+                    level, success = generator.generate(self.__cbp, LukeBot())
+                else:
+                    generator = TextBasedDungeonGenerator(level_seed, self.__load_map,
+                                                          self.__save_data.achievement_manager)
+                    level, success = generator.generate(self.__cbp, map_name)
                 if success:
                     self.__in_level = True
                     self.__cbp.start_level(self.__rm.get_seed(), level)
@@ -319,6 +349,14 @@ class SpaceshipWidgetSet(MyWidgetSet):
             self.__spaceship,
         ]
 
+    @property
+    def player_pos(self) -> Coordinate:
+        return self.__spaceship.player_pos
+
+    @property
+    def spaceship(self) -> SpaceshipWidget:
+        return self.__spaceship
+
     def get_main_widget(self) -> MyBaseWidget:
         return self.__spaceship.widget
 
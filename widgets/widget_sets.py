@@ -376,6 +376,10 @@ class ExploreWidgetSet(MyWidgetSet):
         self.__map_widget = MapWidget(map_widget)
         ColorRules.apply_map_rules(self.__map_widget)
 
+    @property
+    def map(self) -> Map:
+        return self.__map_widget.map
+
     def get_main_widget(self) -> MyBaseWidget:
         return self.__map_widget.widget
 